@@ -0,0 +1,386 @@
+"""
+Benchmark harness for the ingest -> preprocess -> encode -> feature store path.
+
+Generates synthetic HDB-resale-shaped data at the requested scales, runs each
+benchmark in a fresh process, and records wall time, rows/sec and peak RSS to
+JSON. Peak memory is reported twice: 'stage_peak_rss_mb' is the highest
+RSS reached while the timed section ran (setup excluded) and
+'process_peak_rss_mb' is the process-wide high-water mark, setup included.
+With --baseline, results are compared against a previous run and the
+exit code is 1 when any benchmark regressed beyond --tolerance.
+
+Usage:
+    python -m benchmarks.run --rows 10000 100000
+    python -m benchmarks.run --rows 100000 --baseline benchmarks/baseline.json
+    python -m benchmarks.run --rows 100000 --baseline benchmarks/baseline.json --update-baseline
+"""
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import write_resale_zip
+
+
+def _rss_bytes():
+    """Current resident set size of this process, or None when it cannot be read."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def _peak_rss_bytes():
+    """
+    Process-wide peak resident set size, or None when it cannot be read.
+    ru_maxrss is KB on Linux and bytes on macOS; the resource module does not
+    exist on Windows, where psutil's peak working set is used if installed.
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return getattr(psutil.Process().memory_info(), 'peak_wset', None)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StagePeak:
+    """
+    Track the peak RSS of one timed section, excluding whatever setup ran before it.
+    On Linux the kernel high-water mark (VmHWM) is reset on entry and read on exit,
+    which is exact; the reset also clears ru_maxrss, so read _peak_rss_bytes()
+    before entering if the process-wide peak is needed. Elsewhere RSS is sampled from a background thread every
+    `interval` seconds, which can miss very short spikes.
+    """
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = None
+        self._hwm = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _read_hwm():
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+        raise OSError("VmHWM not reported")
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            current = _rss_bytes()
+            if current is not None:
+                self.peak = max(self.peak or 0, current)
+
+    def __enter__(self):
+        self.peak = _rss_bytes()
+        try:
+            with open('/proc/self/clear_refs', 'w') as f:
+                f.write('5')
+            self._read_hwm()
+            self._hwm = True
+        except OSError:
+            if self.peak is not None:
+                self._thread = threading.Thread(target=self._sample, daemon=True)
+                self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._hwm:
+            self.peak = self._read_hwm()
+        elif self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        current = _rss_bytes()
+        if current is not None:
+            self.peak = max(self.peak or 0, current)
+        return False
+
+
+def _max_known(*values):
+    """Largest of the readings that are not None, or None when none are known."""
+    known = [value for value in values if value is not None]
+    return max(known) if known else None
+
+
+def _mb(value):
+    return round(value / 2**20, 1) if value is not None else None
+
+
+# --- setup helpers (run in the child, outside the timed section) ---
+
+def _raw_frame(ctx):
+    from eda.data_ingestor import DataIngestor
+    return DataIngestor(ctx['data_dir']).load_cached()
+
+
+def _preprocessed_frame(ctx):
+    from eda.data_preprocessor import DataPreprocessor
+    return DataPreprocessor(_raw_frame(ctx)).preprocess_all()
+
+
+def _feast_store(ctx):
+    from feature_store.feature_store import FeastFeatureStore
+    return FeastFeatureStore(path=ctx['feast_dir'])
+
+
+# --- benchmarks: setup(ctx) -> state, run(state) -> rows processed ---
+
+def _run_load_data_file(ingestor):
+    return len(ingestor.load_data_file())
+
+
+def _run_iter_data_chunks(ingestor):
+    return sum(len(chunk) for chunk in ingestor.iter_data_chunks())
+
+
+def _setup_ingestor(ctx):
+    from eda.data_ingestor import DataIngestor
+    return DataIngestor(ctx['data_dir'])
+
+
+def _run_step(method):
+    def run(df):
+        from eda.data_preprocessor import DataPreprocessor
+        rows = len(df)
+        getattr(DataPreprocessor(df), method)()
+        return rows
+    return run
+
+
+def _run_encoder(method):
+    def run(df):
+        from eda.data_encoder import DataEncoder
+        rows = len(df)
+        getattr(DataEncoder(df), method)()
+        return rows
+    return run
+
+
+def _run_inspect_all(df):
+    from eda.data_inspector import DataInspector
+    DataInspector(df).inspect_all()
+    return len(df)
+
+
+def _run_online(state):
+    store, entity_rows, features = state
+    store.get_online_features(entity_rows, features)
+    return len(entity_rows)
+
+
+def _setup_online(ctx):
+    rows = min(ctx['rows'], 1000)
+    return _feast_store(ctx), [{'house_id': i} for i in range(1, rows + 1)], ctx['features']
+
+
+def _run_historical(state):
+    store, entity_df, features = state
+    return len(store.get_historical_features(entity_df, features))
+
+
+def _setup_historical(ctx):
+    import pandas as pd
+    rows = min(ctx['rows'], 100_000)
+    entity_df = pd.DataFrame({
+        'house_id': range(1, rows + 1),
+        'event_timestamp': pd.Timestamp(ctx['feast_end'], tz='UTC'),
+    })
+    return _feast_store(ctx), entity_df, ctx['features']
+
+
+BENCHMARKS = {
+    'ingest.load_data_file': (_setup_ingestor, _run_load_data_file),
+    'ingest.iter_data_chunks': (_setup_ingestor, _run_iter_data_chunks),
+    'preprocess.get_year_and_month_to_datetime': (_raw_frame, _run_step('get_year_and_month_to_datetime')),
+    'preprocess.extract_storey_range_features': (_raw_frame, _run_step('extract_storey_range_features')),
+    'preprocess.process_remaining_lease': (_raw_frame, _run_step('process_remaining_lease')),
+    'preprocess.preprocess_all': (_raw_frame, _run_step('preprocess_all')),
+    'encode.encode_categorical': (_preprocessed_frame, _run_encoder('encode_categorical')),
+    'encode.frequency_encode': (_preprocessed_frame, _run_encoder('frequency_encode')),
+    'inspect.inspect_all': (_raw_frame, _run_inspect_all),
+    'feast.get_online_features': (_setup_online, _run_online),
+    'feast.get_historical_features': (_setup_historical, _run_historical),
+}
+
+
+def measure(name, ctx) -> dict:
+    """Run one benchmark in the current process and return its measurements."""
+    setup, run = BENCHMARKS[name]
+    state = setup(ctx)
+    rss_before = _rss_bytes()
+    # Entering StagePeak resets the kernel high-water mark, so keep the setup peak first.
+    setup_peak = _peak_rss_bytes()
+    with StagePeak() as stage_peak:
+        start = time.perf_counter()
+        rows = run(state)
+        seconds = time.perf_counter() - start
+    return {
+        'seconds': round(seconds, 4),
+        'rows': rows,
+        'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else None,
+        'rss_before_mb': _mb(rss_before),
+        'stage_peak_rss_mb': _mb(stage_peak.peak),
+        'process_peak_rss_mb': _mb(_max_known(setup_peak, _peak_rss_bytes(), stage_peak.peak)),
+    }
+
+
+def measure_isolated(name, ctx) -> dict:
+    """Run one benchmark in a fresh spawned process so other benchmarks do not affect its memory."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(measure, name, ctx).result()
+
+
+def build_feast_repo(ctx) -> bool:
+    """
+    Create a local Feast repo (SQLite registry and online store, file offline
+    store) over the synthetic features and materialize it. Returns False when
+    Feast is not installed.
+    """
+    try:
+        from feast import Entity, FeatureStore, FeatureView, Field, FileSource, ValueType
+        from feast.types import Float32, Int64
+    except ImportError:
+        return False
+    from eda.data_encoder import DataEncoder
+    import pandas as pd
+
+    repo = ctx['feast_dir']
+    os.makedirs(repo, exist_ok=True)
+    df = DataEncoder(_preprocessed_frame(ctx)).frequency_encode()
+    end = pd.Timestamp(ctx['feast_end'], tz='UTC')
+    df['event_timestamp'] = pd.date_range(end=end - pd.Timedelta(hours=1), periods=len(df), freq='s')
+    df['house_id'] = range(1, len(df) + 1)
+    features_path = os.path.join(repo, 'house_features.parquet')
+    df.to_parquet(features_path, index=False)
+
+    with open(os.path.join(repo, 'feature_store.yaml'), 'w') as f:
+        f.write(
+            "project: benchmark\n"
+            "provider: local\n"
+            f"registry: {os.path.join(repo, 'registry.db')}\n"
+            "online_store:\n"
+            "    type: sqlite\n"
+            f"    path: {os.path.join(repo, 'online.db')}\n"
+            "offline_store:\n"
+            "    type: file\n"
+            "entity_key_serialization_version: 3\n"
+        )
+    house = Entity(name="house_id", join_keys=["house_id"], value_type=ValueType.INT64)
+    schema = [Field(name=col, dtype=Int64 if str(df[col].dtype).startswith('int') else Float32)
+              for col in ctx['features_columns']]
+    view = FeatureView(
+        name="house_features", entities=[house], ttl=timedelta(days=365), schema=schema, online=True,
+        source=FileSource(path=features_path, timestamp_field="event_timestamp"),
+    )
+    store = FeatureStore(repo_path=repo)
+    store.apply([house, view])
+    store.materialize(start_date=(end - pd.Timedelta(days=30)).to_pydatetime(), end_date=end.to_pydatetime())
+    return True
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return regression descriptions for results slower or larger than baseline."""
+    regressions = []
+    for scale, benches in results.items():
+        for name, current in benches.items():
+            previous = baseline.get(scale, {}).get(name)
+            if not previous or 'seconds' not in current or 'seconds' not in previous:
+                continue
+            for metric in ('seconds', 'stage_peak_rss_mb'):
+                if previous.get(metric) and current.get(metric) and current[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{scale} rows {name}: {metric} {previous[metric]} -> {current[metric]}"
+                        f" (+{(current[metric] / previous[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000], help="Dataset sizes to benchmark.")
+    parser.add_argument('--only', default='*', help="Glob over benchmark names, e.g. 'preprocess.*'.")
+    parser.add_argument('--output', default=None, help="Write results JSON here.")
+    parser.add_argument('--baseline', default=None, help="Baseline JSON to compare against.")
+    parser.add_argument('--update-baseline', action='store_true', help="Overwrite the baseline with these results.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown/growth fraction.")
+    parser.add_argument('--workdir', default=None, help="Folder for generated data (default: temp dir).")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if fnmatch.fnmatch(name, args.only)]
+    workdir = args.workdir or tempfile.mkdtemp(prefix='mljourney-bench-')
+    features_columns = ['storey_min', 'storey_max', 'storey_mean', 'floor_area_sqm', 'lease_commence_date',
+                        'remaining_lease_years', 'town_freq', 'flat_type_freq', 'block_freq',
+                        'street_name_freq', 'flat_model_freq']
+    results = {}
+    for rows in args.rows:
+        data_dir = os.path.join(workdir, f"rows_{rows}")
+        ctx = {
+            'rows': rows,
+            'data_dir': data_dir,
+            'feast_dir': os.path.join(data_dir, 'feast_repo'),
+            'feast_end': datetime(2024, 1, 1).isoformat(),
+            'features_columns': features_columns,
+            'features': [f"house_features:{col}" for col in features_columns],
+        }
+        print(f"Generating {rows} synthetic rows in {data_dir}")
+        write_resale_zip(data_dir, rows)
+        has_feast = any(n.startswith('feast.') for n in names) and build_feast_repo(ctx)
+        results[str(rows)] = {}
+        for name in names:
+            if name.startswith('feast.') and not has_feast:
+                results[str(rows)][name] = {'skipped': 'feast not installed'}
+                print(f"  {name:<45} skipped (feast not installed)")
+                continue
+            result = measure_isolated(name, ctx)
+            results[str(rows)][name] = result
+            print(f"  {name:<45} {result['seconds']:>9.3f}s {result['rows_per_sec'] or 0:>14,.0f} rows/s"
+                  f" {result['stage_peak_rss_mb'] or 0:>9.1f} MB stage peak"
+                  f" {result['process_peak_rss_mb'] or 0:>9.1f} MB process peak")
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    if args.baseline and os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        status = 1 if regressions else 0
+        if not regressions:
+            print("No regressions against baseline.")
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Cold-start import benchmark.
+
+Imports each entry point in a fresh interpreter, records the median wall time
+and checks that the heavy optional dependencies (plotting, Feast, sparse
+matrices) were not loaded as a side effect. The exit code is 1 when an entry
+point with a budget is over it or pulls in a forbidden module, so this can
+guard the preprocessing-only path used by serving workers.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 10 --budget 1.0 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('matplotlib', 'seaborn', 'feast', 'scipy', 'psycopg')
+
+# name: (import statement, modules it must not load, has a budget)
+ENTRY_POINTS = {
+    'preprocess': ("from eda.data_preprocessor import DataPreprocessor", HEAVY_MODULES, True),
+    'package': ("from eda import DataPreprocessor", HEAVY_MODULES, True),
+    'analyser': ("from eda.data_analyser import DataAnalyser", ('matplotlib', 'seaborn', 'feast'), False),
+    'feature_store': ("from feature_store.feature_store import FeastFeatureStore", ('feast', 'matplotlib'), False),
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': seconds,
+    'loaded': sorted(m for m in {forbidden!r} if m in sys.modules),
+}}))
+"""
+
+
+def probe(statement: str, forbidden, env: dict) -> dict:
+    """Run one import in a fresh interpreter and return its timing and side effects."""
+    code = _PROBE.format(statement=statement, forbidden=tuple(forbidden))
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(name: str, repeat: int) -> dict:
+    """Median import time of an entry point over `repeat` fresh interpreters."""
+    statement, forbidden, _ = ENTRY_POINTS[name]
+    env = dict(os.environ)
+    # Warm the OS file cache and bytecode so only interpreter-side work is timed.
+    probe(statement, forbidden, env)
+    runs = [probe(statement, forbidden, env) for _ in range(repeat)]
+    return {
+        'median_seconds': round(statistics.median(r['seconds'] for r in runs), 4),
+        'max_seconds': round(max(r['seconds'] for r in runs), 4),
+        'heavy_modules_loaded': runs[-1]['loaded'],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per entry point.")
+    parser.add_argument('--budget', type=float, default=1.5,
+                        help="Median import budget in seconds for the preprocessing entry points.")
+    parser.add_argument('--output', default=None, help="Write results JSON here.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    failures = []
+    for name, (statement, _, budgeted) in ENTRY_POINTS.items():
+        result = measure(name, args.repeat)
+        results[name] = result
+        print(f"  {name:<15} {result['median_seconds']:>7.3f}s median  {result['max_seconds']:>7.3f}s max"
+              f"  heavy: {', '.join(result['heavy_modules_loaded']) or '-'}")
+        if result['heavy_modules_loaded']:
+            failures.append(f"{name}: '{statement}' loaded {result['heavy_modules_loaded']}")
+        if budgeted and result['median_seconds'] > args.budget:
+            failures.append(f"{name}: {result['median_seconds']}s exceeds the {args.budget}s budget")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'budget_seconds': args.budget, 'results': results}, f, indent=2)
+    for line in failures:
+        print(f"STARTUP BUDGET {line}")
+    if not failures:
+        print("All entry points within the startup budget.")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import os
+import zipfile
+import numpy as np
+import pandas as pd
+
+TOWNS = ['ANG MO KIO', 'BEDOK', 'BISHAN', 'BUKIT BATOK', 'BUKIT MERAH', 'CHOA CHU KANG', 'CLEMENTI',
+         'GEYLANG', 'HOUGANG', 'JURONG EAST', 'JURONG WEST', 'PASIR RIS', 'PUNGGOL', 'QUEENSTOWN',
+         'SEMBAWANG', 'SENGKANG', 'SERANGOON', 'TAMPINES', 'TOA PAYOH', 'WOODLANDS', 'YISHUN']
+FLAT_TYPES = ['1 ROOM', '2 ROOM', '3 ROOM', '4 ROOM', '5 ROOM', 'EXECUTIVE', 'MULTI-GENERATION']
+FLAT_MODELS = ['Improved', 'New Generation', 'Model A', 'Standard', 'Simplified', 'Premium Apartment',
+               'Maisonette', 'Apartment', 'Model A2', 'DBSS', 'Type S1', 'Adjoined flat', 'Terrace']
+STOREY_RANGES = [f"{low:02d} TO {low + 2:02d}" for low in range(1, 50, 3)]
+
+
+def make_resale_frame(rows: int, start_year: int, end_year: int, with_lease=True, lease_format='text',
+                      seed=0) -> pd.DataFrame:
+    """
+    Generate rows shaped like the HDB resale dataset (same columns and formats).
+    Args:
+        lease_format (str): 'text' for "61 years 04 months" strings (2017 onwards) or
+            'years' for whole years as integers, like the 2015-2016 file.
+    """
+    rng = np.random.default_rng(seed)
+    years = rng.integers(start_year, end_year + 1, rows)
+    months = rng.integers(1, 13, rows)
+    lease_start = rng.integers(1966, 2020, rows)
+    df = pd.DataFrame({
+        'month': [f"{y}-{m:02d}" for y, m in zip(years, months)],
+        'town': rng.choice(TOWNS, rows),
+        'flat_type': rng.choice(FLAT_TYPES, rows, p=[0.01, 0.03, 0.3, 0.36, 0.22, 0.07, 0.01]),
+        'block': rng.integers(1, 999, rows).astype(str),
+        'street_name': rng.choice([f"STREET {i}" for i in range(600)], rows),
+        'storey_range': rng.choice(STOREY_RANGES, rows),
+        'floor_area_sqm': rng.uniform(30, 180, rows).round(0),
+        'flat_model': rng.choice(FLAT_MODELS, rows),
+        'lease_commence_date': lease_start,
+        'resale_price': rng.uniform(1.5e5, 1.2e6, rows).round(-3),
+    })
+    if with_lease:
+        remaining = np.clip(99 - (years - lease_start), 1, 98) * 12 - rng.integers(0, 12, rows)
+        if lease_format == 'years':
+            df.insert(9, 'remaining_lease', remaining // 12)
+        else:
+            df.insert(9, 'remaining_lease', [
+                f"{m // 12:02d} years {m % 12:02d} months" if m % 12 else f"{m // 12:02d} years"
+                for m in remaining
+            ])
+    return df
+
+
+def write_resale_zip(data_dir: str, rows: int, files=4, seed=0) -> str:
+    """
+    Write a zip of `files` yearly-style CSV members with `rows` rows in total.
+    The older half of the members has no 'remaining_lease' column and the first
+    member with it stores whole years as integers, like the real data.
+    Returns:
+        str: Path of the zip file.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    zip_path = os.path.join(data_dir, 'resale_synthetic.zip')
+    per_file = max(rows // files, 1)
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        for i in range(files):
+            start_year = 1990 + i * 8
+            df = make_resale_frame(per_file, start_year, start_year + 7, with_lease=i >= files // 2,
+                                   lease_format='years' if i == files // 2 else 'text', seed=seed + i)
+            zip_ref.writestr(f"resale-{start_year}-{start_year + 7}.csv", df.to_csv(index=False))
+    return zip_path
@@ -0,0 +1,46 @@
+"""
+EDA and preprocessing building blocks.
+
+Public classes are loaded on first attribute access (PEP 562), so
+`from eda import DataPreprocessor` only imports the preprocessing module and
+not the plotting or sparse-matrix dependencies of its siblings.
+"""
+import importlib
+
+_LAZY_ATTRS = {
+    'ArrowBackend': 'eda.backends',
+    'PandasBackend': 'eda.backends',
+    'PolarsBackend': 'eda.backends',
+    'get_backend': 'eda.backends',
+    'CorrelationAccumulator': 'eda.correlation',
+    'DataAnalyser': 'eda.data_analyser',
+    'DataEncoder': 'eda.data_encoder',
+    'FrequencyEncoder': 'eda.data_encoder',
+    'SparseOneHotEncoder': 'eda.data_encoder',
+    'DataIngestor': 'eda.data_ingestor',
+    'DataInspector': 'eda.data_inspector',
+    'DataProfile': 'eda.data_inspector',
+    'DataOptimizer': 'eda.data_optimizer',
+    'IncrementalPipeline': 'eda.data_pipeline',
+    'IngestManifest': 'eda.data_pipeline',
+    'DataPreprocessor': 'eda.data_preprocessor',
+    'PreprocessStep': 'eda.data_preprocessor',
+    'FeatureTransformer': 'eda.feature_transformer',
+    'DataSketches': 'eda.sketches',
+    'DriftMonitor': 'eda.drift',
+    'ReferenceProfile': 'eda.drift',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,418 @@
+import logging
+import numpy as np
+import pandas as pd
+from eda.data_preprocessor import (
+    LEASE_MISSING,
+    _LEASE_PATTERN,
+    derive_remaining_lease,
+    derive_storey_features,
+    derive_year_month,
+)
+from utils.logger import setup_logger
+
+logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
+
+_YEAR_MONTH_PATTERN = r'^\d{4}-(0[1-9]|1[0-2])$'
+
+
+class PandasBackend:
+    """
+    Reference execution backend: the column primitives used by DataPreprocessor,
+    FrequencyEncoder/DataEncoder and DataProfile/DataInspector, written against
+    pandas. Other backends subclass it, override what they can run natively and
+    return pandas objects with the same index, dtypes and values, so callers do
+    not depend on which backend ran. Anything a backend cannot handle exactly
+    (unusual dtypes, values outside the expected formats) falls back here.
+    """
+    name = 'pandas'
+
+    def derive_for(self, step):
+        """Return the derive function to use for a PreprocessStep."""
+        overrides = {
+            derive_year_month: self.derive_year_month,
+            derive_storey_features: self.derive_storey_features,
+            derive_remaining_lease: self.derive_remaining_lease,
+        }
+        return overrides.get(step.derive, step.derive)
+
+    def derive_year_month(self, values: pd.Series) -> dict:
+        return derive_year_month(values)
+
+    def derive_storey_features(self, values: pd.Series) -> dict:
+        return derive_storey_features(values)
+
+    def derive_remaining_lease(self, values: pd.Series) -> dict:
+        return derive_remaining_lease(values)
+
+    def value_counts(self, values: pd.Series) -> pd.Series:
+        """Non-null value counts, most frequent first (ties in order of appearance)."""
+        return values.value_counts()
+
+    def category_codes(self, values: pd.Series, categories: list) -> np.ndarray:
+        """Position of each value in categories, -1 for unseen values and nulls."""
+        return pd.Categorical(values, categories=categories).codes
+
+    def one_hot(self, values: pd.Series, drop_first=True) -> pd.DataFrame:
+        """Dummy columns for one column, as pd.get_dummies(prefix=column name)."""
+        return pd.get_dummies(values, prefix=values.name, drop_first=drop_first)
+
+    def null_counts(self, df: pd.DataFrame, key: str = None):
+        """
+        Null count per column and, if key is given, per column for every value of
+        key plus the row count per value, from a single null scan.
+        Returns:
+            tuple: (pd.Series of counts, pd.DataFrame of counts indexed by key or None,
+                pd.Series of rows per key value or None)
+        """
+        nulls = df.isnull()
+        if key is None:
+            return nulls.sum(), None, None
+        by_key = nulls.groupby(df[key], observed=True)
+        return nulls.sum(), by_key.sum(), by_key.size()
+
+    def read_parquet(self, path, columns=None, filters=None) -> pd.DataFrame:
+        """
+        Read a Parquet file or dataset folder, pushing the column projection and
+        the row filters (pyarrow DNF, e.g. [('year', '>=', 2020)]) down to the reader.
+        """
+        return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+def _one_hot_frame(values: pd.Series, categories: list, codes: np.ndarray, drop_first: bool) -> pd.DataFrame:
+    """Build the bool dummy frame get_dummies would produce from sorted categories and codes."""
+    start = 1 if drop_first else 0
+    dummies = codes[:, None] == np.arange(start, len(categories), dtype=codes.dtype)
+    names = [f"{values.name}_{cat}" for cat in categories[start:]]
+    return pd.DataFrame(dummies, index=values.index, columns=names)
+
+
+class ArrowBackend(PandasBackend):
+    """
+    PyArrow compute backend. String columns are dictionary-encoded, so parsing
+    and splitting run once per distinct value in Arrow kernels, and null counts
+    come from the Arrow validity bitmaps.
+    """
+    name = 'arrow'
+
+    def __init__(self):
+        import pyarrow  # noqa: F401  (fail at construction if pyarrow is missing)
+
+    # Modules are resolved on use rather than stored, so instances stay picklable.
+    @property
+    def pa(self):
+        import pyarrow
+        return pyarrow
+
+    @property
+    def pc(self):
+        import pyarrow.compute
+        return pyarrow.compute
+
+    @property
+    def pq(self):
+        import pyarrow.parquet
+        return pyarrow.parquet
+
+    @property
+    def _errors(self):
+        pa = self.pa
+        return (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError)
+
+    def _strings(self, values: pd.Series):
+        """Arrow string array for an object Series of strings, or None if it holds anything else."""
+        if values.dtype != object:
+            return None
+        try:
+            return self.pa.array(values, type=self.pa.string(), from_pandas=True)
+        except self._errors:
+            return None
+
+    def derive_year_month(self, values):
+        arr = self._strings(values)
+        pc = self.pc
+        if arr is None or arr.null_count or not pc.all(pc.match_substring_regex(arr, _YEAR_MONTH_PATTERN)).as_py():
+            return super().derive_year_month(values)
+        year = pc.cast(pc.utf8_slice_codeunits(arr, 0, 4), self.pa.int32())
+        month = pc.cast(pc.utf8_slice_codeunits(arr, 5, 7), self.pa.int32())
+        return {
+            'year': pd.Series(year.to_numpy(), index=values.index, name=values.name),
+            'month_num': pd.Series(month.to_numpy(), index=values.index, name=values.name),
+        }
+
+    def derive_storey_features(self, values):
+        arr = self._strings(values)
+        if arr is None:
+            return super().derive_storey_features(values)
+        if arr.null_count:
+            raise ValueError("storey range contains missing values")
+        encoded = arr.dictionary_encode()
+        parts = self.pc.split_pattern(encoded.dictionary, ' TO ')
+        if not self.pc.all(self.pc.equal(self.pc.list_value_length(parts), 2)).as_py():
+            return super().derive_storey_features(values)
+        try:
+            low = self.pc.cast(self.pc.list_element(parts, 0), self.pa.int64()).to_numpy()
+            high = self.pc.cast(self.pc.list_element(parts, 1), self.pa.int64()).to_numpy()
+        except self._errors:
+            return super().derive_storey_features(values)
+        codes = encoded.indices.to_numpy()
+        storey_min = low[codes]
+        storey_max = high[codes]
+        return {
+            'storey_min': pd.Series(storey_min, index=values.index),
+            'storey_max': pd.Series(storey_max, index=values.index),
+            'storey_mean': pd.Series((storey_min + storey_max) / 2, index=values.index),
+        }
+
+    def derive_remaining_lease(self, values):
+        arr = self._strings(values)
+        if arr is None:
+            return super().derive_remaining_lease(values)
+        pc = self.pc
+        encoded = arr.dictionary_encode()
+        parts = pc.extract_regex(encoded.dictionary, _LEASE_PATTERN)
+        numbers = []
+        for field in ('years', 'months'):
+            # Unmatched strings give null, unmatched optional groups give ''.
+            digits = pc.if_else(pc.is_valid(parts), pc.struct_field(parts, field), '')
+            digits = pc.if_else(pc.equal(digits, ''), '0', digits)
+            numbers.append(pc.cast(digits, self.pa.int64()).to_numpy())
+        parsed = np.append(np.round(numbers[0] + numbers[1] / 12, 2), LEASE_MISSING)
+        codes = encoded.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        return {values.name + '_years': pd.Series(parsed[codes], index=values.index, name=values.name)}
+
+    def value_counts(self, values):
+        arr = self._strings(values)
+        if arr is None:
+            return super().value_counts(values)
+        counts = self.pc.value_counts(arr.drop_null())
+        result = pd.Series(counts.field('counts').to_numpy(), index=pd.Index(counts.field('values').to_pylist(),
+                           dtype=object, name=values.name), name='count')
+        # Same stable-by-appearance ordering as pandas value_counts.
+        return result.sort_values(ascending=False)
+
+    def category_codes(self, values, categories):
+        arr = self._strings(values)
+        if arr is None or not all(isinstance(cat, str) for cat in categories):
+            return super().category_codes(values, categories)
+        codes = self.pc.index_in(arr, value_set=self.pa.array(categories, type=self.pa.string()))
+        return codes.fill_null(-1).to_numpy(zero_copy_only=False)
+
+    def one_hot(self, values, drop_first=True):
+        arr = self._strings(values)
+        if arr is None:
+            return super().one_hot(values, drop_first)
+        uniques = self.pc.unique(arr.drop_null())
+        categories = uniques.take(self.pc.sort_indices(uniques)).to_pylist()
+        return _one_hot_frame(values, categories, self.category_codes(values, categories).astype('int64'), drop_first)
+
+    def _table(self, df):
+        try:
+            return self.pa.Table.from_pandas(df, preserve_index=False)
+        except self._errors:
+            return None
+
+    def null_counts(self, df, key=None):
+        table = self._table(df)
+        if table is None or key is not None and (isinstance(df[key].dtype, pd.CategoricalDtype)
+                                                 or not self.pa.types.is_string(table.schema.field(key).type)):
+            return super().null_counts(df, key)
+        # Arrow keeps nulls in validity bitmaps, so the overall counts are free.
+        counts = pd.Series([table.column(i).null_count for i in range(table.num_columns)],
+                           index=df.columns, dtype='int64')
+        if key is None:
+            return counts, None, None
+        names = [f"c{i}" for i in range(table.num_columns)]
+        grouped = table.rename_columns(names).append_column('__key', table.column(key)).group_by('__key').aggregate(
+            [(name, 'count', self.pc.CountOptions(mode='only_null')) for name in names] + [([], 'count_all')]
+        ).to_pandas()
+        grouped = grouped[grouped['__key'].notna()].sort_values('__key')
+        index = pd.Index(grouped['__key'].to_numpy(), dtype=object, name=key)
+        by_key = pd.DataFrame(grouped[[f"{name}_count" for name in names]].to_numpy(dtype='int64'),
+                              index=index, columns=df.columns)
+        return counts, by_key, pd.Series(grouped['count_all'].to_numpy(dtype='int64'), index=index)
+
+    def read_parquet(self, path, columns=None, filters=None):
+        return self.pq.read_table(path, columns=columns, filters=filters).to_pandas()
+
+
+class PolarsBackend(PandasBackend):
+    """
+    Polars backend. Column work runs on Polars' multi-threaded engine and
+    read_parquet scans lazily, so projections and filters are pushed into the
+    Parquet reader.
+    """
+    name = 'polars'
+
+    def __init__(self):
+        try:
+            import polars  # noqa: F401
+        except ImportError as e:
+            raise ImportError("The 'polars' backend requires the polars package.") from e
+
+    @property
+    def pl(self):
+        import polars
+        return polars
+
+    def _strings(self, values: pd.Series):
+        """Polars String Series for an object Series of strings, or None if it holds anything else."""
+        if values.dtype != object:
+            return None
+        try:
+            series = self.pl.from_pandas(values.reset_index(drop=True))
+        except Exception:
+            return None
+        return series if series.dtype == self.pl.String else None
+
+    def derive_year_month(self, values):
+        s = self._strings(values)
+        pl = self.pl
+        if s is None or s.null_count() or not s.str.contains(_YEAR_MONTH_PATTERN).all():
+            return super().derive_year_month(values)
+        return {
+            'year': pd.Series(s.str.slice(0, 4).cast(pl.Int32).to_numpy(), index=values.index, name=values.name),
+            'month_num': pd.Series(s.str.slice(5, 2).cast(pl.Int32).to_numpy(), index=values.index, name=values.name),
+        }
+
+    def derive_storey_features(self, values):
+        s = self._strings(values)
+        pl = self.pl
+        if s is None:
+            return super().derive_storey_features(values)
+        if s.null_count():
+            raise ValueError("storey range contains missing values")
+        parts = s.str.split_exact(' TO ', 1).struct.unnest()
+        if parts['field_1'].null_count():
+            return super().derive_storey_features(values)
+        try:
+            storey_min = parts['field_0'].cast(pl.Int64).to_numpy()
+            storey_max = parts['field_1'].cast(pl.Int64).to_numpy()
+        except pl.exceptions.InvalidOperationError:
+            return super().derive_storey_features(values)
+        return {
+            'storey_min': pd.Series(storey_min, index=values.index),
+            'storey_max': pd.Series(storey_max, index=values.index),
+            'storey_mean': pd.Series((storey_min + storey_max) / 2, index=values.index),
+        }
+
+    def derive_remaining_lease(self, values):
+        s = self._strings(values)
+        pl = self.pl
+        if s is None:
+            return super().derive_remaining_lease(values)
+        parts = s.str.extract_groups(_LEASE_PATTERN).struct.unnest()
+        numbers = [
+            parts[field].fill_null('').replace('', '0').cast(pl.Int64).to_numpy()
+            for field in ('years', 'months')
+        ]
+        parsed = np.round(numbers[0] + numbers[1] / 12, 2)
+        parsed[s.is_null().to_numpy()] = LEASE_MISSING
+        return {values.name + '_years': pd.Series(parsed, index=values.index, name=values.name)}
+
+    def value_counts(self, values):
+        s = self._strings(values)
+        if s is None:
+            return super().value_counts(values)
+        counts = s.drop_nulls().to_frame('v').group_by('v', maintain_order=True).len()
+        result = pd.Series(counts['len'].to_numpy().astype('int64'),
+                           index=pd.Index(counts['v'].to_list(), dtype=object, name=values.name), name='count')
+        # Same stable-by-appearance ordering as pandas value_counts.
+        return result.sort_values(ascending=False)
+
+    def category_codes(self, values, categories):
+        s = self._strings(values)
+        if s is None or not all(isinstance(cat, str) for cat in categories):
+            return super().category_codes(values, categories)
+        codes = s.replace_strict(categories, list(range(len(categories))), default=-1, return_dtype=self.pl.Int64)
+        return codes.fill_null(-1).to_numpy()
+
+    def one_hot(self, values, drop_first=True):
+        s = self._strings(values)
+        if s is None:
+            return super().one_hot(values, drop_first)
+        categories = s.drop_nulls().unique().sort().to_list()
+        return _one_hot_frame(values, categories, self.category_codes(values, categories), drop_first)
+
+    def null_counts(self, df, key=None):
+        pl = self.pl
+        if df.columns.duplicated().any() or key is not None and isinstance(df[key].dtype, pd.CategoricalDtype):
+            return super().null_counts(df, key)
+        try:
+            frame = pl.from_pandas(df.reset_index(drop=True))
+        except Exception:
+            return super().null_counts(df, key)
+        if key is not None and frame.schema[key] != pl.String:
+            return super().null_counts(df, key)
+        counts = pd.Series(frame.null_count().row(0), index=df.columns, dtype='int64')
+        if key is None:
+            return counts, None, None
+        others = [col for col in frame.columns if col != key]
+        grouped = (
+            frame.filter(pl.col(key).is_not_null())
+            .group_by(key)
+            .agg([pl.col(col).is_null().sum().alias(col) for col in others] + [pl.len().alias('__rows')])
+            .sort(key)
+        )
+        index = pd.Index(grouped[key].to_list(), dtype=object, name=key)
+        by_key = pd.DataFrame({col: grouped[col].to_numpy().astype('int64') if col != key else 0
+                               for col in df.columns}, index=index).astype('int64')
+        return counts, by_key, pd.Series(grouped['__rows'].to_numpy().astype('int64'), index=index)
+
+    def read_parquet(self, path, columns=None, filters=None):
+        pl = self.pl
+        frame = pl.scan_parquet(path)
+        if filters:
+            ops = {
+                '=': lambda c, v: c == v, '==': lambda c, v: c == v, '!=': lambda c, v: c != v,
+                '<': lambda c, v: c < v, '<=': lambda c, v: c <= v, '>': lambda c, v: c > v,
+                '>=': lambda c, v: c >= v, 'in': lambda c, v: c.is_in(list(v)),
+                'not in': lambda c, v: ~c.is_in(list(v)),
+            }
+            # DNF: a flat list is one AND group, a list of lists is OR-ed groups.
+            groups = filters if isinstance(filters[0], list) else [filters]
+            expr = None
+            for group in groups:
+                conj = None
+                for col, op, value in group:
+                    term = ops[op](pl.col(col), value)
+                    conj = term if conj is None else conj & term
+                expr = conj if expr is None else expr | conj
+            frame = frame.filter(expr)
+        if columns is not None:
+            frame = frame.select(columns)
+        return frame.collect().to_pandas()
+
+
+BACKENDS = {
+    'pandas': PandasBackend,
+    'arrow': ArrowBackend,
+    'polars': PolarsBackend,
+}
+
+_instances = {}
+
+
+def get_backend(backend=None) -> PandasBackend:
+    """
+    Resolve a backend name ('pandas', 'arrow', 'polars') or instance.
+    None means pandas. Instances are cached per name; objects that are pickled
+    (encoders, profiles) keep the name and resolve the backend through here.
+    """
+    if backend is None:
+        backend = 'pandas'
+    if isinstance(backend, PandasBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from {sorted(BACKENDS)}.")
+    if backend not in _instances:
+        _instances[backend] = BACKENDS[backend]()
+        logger.info(f"⚙️ Using '{backend}' execution backend.")
+    return _instances[backend]
+
+# Example usage:
+# from eda.backends import get_backend
+# df = get_backend('polars').read_parquet('data/house_features', columns=['town', 'storey_range'],
+#                                         filters=[('year', '>=', 2020)])
+# df = DataPreprocessor(df).preprocess_all(backend='arrow')
+# df = DataEncoder(df, backend='arrow').frequency_encode()
+# results = DataInspector(df, backend='arrow').inspect_all()
@@ -0,0 +1,153 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.logger import setup_logger
+
+logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
+
+
+class CorrelationAccumulator:
+    """
+    Incremental Pearson correlation with pairwise NaN handling.
+
+    Keeps running sufficient statistics as float64 p x p matrices, where entry
+    [i, j] only covers rows in which both column i and column j are present:
+        n[i, j]      row count
+        sx[i, j]     sum of x_i
+        sxx[i, j]    sum of x_i ** 2
+        sxy[i, j]    sum of x_i * x_j
+    Values are shifted by a per-column constant (the first chunk's means) to
+    keep the sums well conditioned. Chunks are consumed in row blocks so the
+    float64 copy of a wide one-hot frame stays bounded, and accumulators built
+    on separate chunks or processes can be merged.
+    """
+    def __init__(self, columns=None, block_rows=50_000):
+        """
+        Args:
+            columns (list, optional): Columns to correlate. Defaults to the numeric
+                and bool columns of the first chunk.
+            block_rows (int): Rows converted to float64 at a time.
+        """
+        self.columns = list(columns) if columns is not None else None
+        self.block_rows = block_rows
+        self.shift = None
+        self.n = self.sx = self.sxx = self.sxy = None
+
+    def _init_stats(self, shift: np.ndarray):
+        p = len(self.columns)
+        self.shift = shift
+        self.n = np.zeros((p, p))
+        self.sx = np.zeros((p, p))
+        self.sxx = np.zeros((p, p))
+        self.sxy = np.zeros((p, p))
+
+    def update(self, df: pd.DataFrame):
+        """
+        Add a chunk of rows. Columns missing from the chunk count as NaN.
+        Returns:
+            CorrelationAccumulator: self, so calls can be chained.
+        """
+        if self.columns is None:
+            self.columns = df.select_dtypes(include=['number', 'bool']).columns.tolist()
+        frame = df.reindex(columns=self.columns)
+        if self.shift is None:
+            shift = frame.astype('float64').mean().fillna(0.0).to_numpy()
+            self._init_stats(shift)
+        for start in range(0, len(frame), self.block_rows):
+            block = frame.iloc[start:start + self.block_rows].to_numpy(dtype='float64', na_value=np.nan)
+            present = ~np.isnan(block)
+            values = np.where(present, block - self.shift, 0.0)
+            mask = present.astype('float64')
+            self.n += mask.T @ mask
+            self.sx += values.T @ mask
+            self.sxx += (values * values).T @ mask
+            self.sxy += values.T @ values
+        return self
+
+    def _shifted(self, shift: np.ndarray):
+        """Return this accumulator's sums re-expressed around another shift."""
+        d = self.shift - shift
+        di, dj = d[:, None], d[None, :]
+        sx = self.sx + di * self.n
+        sxx = self.sxx + 2 * di * self.sx + di * di * self.n
+        sxy = self.sxy + dj * self.sx + di * self.sx.T + di * dj * self.n
+        return sx, sxx, sxy
+
+    def merge(self, other):
+        """
+        Merge another accumulator over the same columns into this one.
+        Returns:
+            CorrelationAccumulator: self, so calls can be chained.
+        """
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.columns = list(other.columns)
+            self._init_stats(other.shift.copy())
+        if list(other.columns) != list(self.columns):
+            raise ValueError("Cannot merge correlation accumulators over different columns.")
+        sx, sxx, sxy = other._shifted(self.shift)
+        self.n += other.n
+        self.sx += sx
+        self.sxx += sxx
+        self.sxy += sxy
+        return self
+
+    @classmethod
+    def from_chunks(cls, chunks, columns=None, block_rows=50_000):
+        """Build an accumulator from an iterable of DataFrames."""
+        acc = cls(columns=columns, block_rows=block_rows)
+        for chunk in chunks:
+            acc.update(chunk)
+        return acc
+
+    def correlation(self, min_periods=1) -> pd.DataFrame:
+        """
+        Return the pairwise-complete correlation matrix, like DataFrame.corr().
+        Args:
+            min_periods (int): Minimum overlapping rows for a valid coefficient.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = self.n * self.sxy - self.sx * self.sx.T
+            var_i = self.n * self.sxx - self.sx ** 2
+            var_j = var_i.T
+            corr = cov / np.sqrt(var_i * var_j)
+        valid = (self.n >= max(min_periods, 2)) & (var_i > 0) & (var_j > 0)
+        corr = np.where(valid, np.clip(corr, -1.0, 1.0), np.nan)
+        diagonal = np.diag(valid).copy()
+        corr[np.diag_indices_from(corr)] = np.where(diagonal, 1.0, np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def top_pairs(self, k=20, min_periods=1) -> pd.DataFrame:
+        """
+        Return the k column pairs with the largest absolute correlation.
+        Returns:
+            pd.DataFrame: Columns 'column_a', 'column_b', 'correlation'.
+        """
+        corr = self.correlation(min_periods=min_periods).to_numpy()
+        i, j = np.triu_indices(len(self.columns), k=1)
+        values = corr[i, j]
+        keep = ~np.isnan(values)
+        i, j, values = i[keep], j[keep], values[keep]
+        order = np.argsort(-np.abs(values), kind='stable')[:k]
+        columns = np.asarray(self.columns, dtype=object)
+        return pd.DataFrame({
+            'column_a': columns[i[order]],
+            'column_b': columns[j[order]],
+            'correlation': values[order],
+        })
+
+    def save(self, path):
+        """Write the running statistics to a .npz file."""
+        np.savez(path, columns=np.asarray(self.columns, dtype=str), shift=self.shift,
+                 n=self.n, sx=self.sx, sxx=self.sxx, sxy=self.sxy, block_rows=self.block_rows)
+        logger.info(f"💾 Saved correlation statistics for {len(self.columns)} columns to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """Load statistics saved with save."""
+        with np.load(path) as data:
+            acc = cls(columns=data['columns'].tolist(), block_rows=int(data['block_rows']))
+            acc.shift = data['shift']
+            acc.n, acc.sx, acc.sxx, acc.sxy = data['n'], data['sx'], data['sxx'], data['sxy']
+        return acc
@@ -1,17 +1,41 @@
 import logging
+import os
+import re
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from eda.correlation import CorrelationAccumulator
+from eda.report_renderer import out_of_range_note, render_all
+from eda.sketches import DataSketches
 from utils.logger import setup_logger
 
 logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
 
 class DataAnalyser:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, sketches: DataSketches = None):
         """
         Initialize with a pandas DataFrame.
+        If sketches are given (see build_sketches), the category summaries and
+        plots are drawn from them instead of scanning the full columns; df may
+        then be None.
         """
         self.df = df
+        self.sketches = sketches
+
+    def build_sketches(self, chunks=None, bins=30, capacity=50):
+        """
+        Build mergeable column sketches and use them for the summaries and plots.
+        Args:
+            chunks (iterable, optional): DataFrame chunks, e.g. from
+                DataIngestor.iter_data_chunks(). Defaults to self.df.
+            bins (int): Histogram bins per numeric column.
+            capacity (int): Heavy-hitter candidates kept per categorical column.
+        Returns:
+            DataSketches: The built sketches (also stored in self.sketches).
+        """
+        chunks = [self.df] if chunks is None else chunks
+        self.sketches = DataSketches.from_chunks(chunks, bins=bins, capacity=capacity)
+        logger.info(f"🧮 Built sketches for {len(self.sketches.numeric)} numeric and {len(self.sketches.categorical)} categorical columns.")
+        return self.sketches
 
     def identify_columns(self):
         """
@@ -19,31 +43,50 @@ class DataAnalyser:
         Returns:
             tuple: (list of numeric columns, list of categorical columns)
         """
-        numeric_cols = self.df.select_dtypes(include='number').columns.tolist()
-        category_cols = self.df.select_dtypes(include='object').columns.tolist()
+        if self.df is None:
+            numeric_cols = list(self.sketches.numeric)
+            category_cols = list(self.sketches.categorical)
+        else:
+            numeric_cols = self.df.select_dtypes(include='number').columns.tolist()
+            category_cols = self.df.select_dtypes(include=['object', 'category']).columns.tolist()
         logger.info(f"🔢 Numeric columns: {numeric_cols}")
         logger.info(f"🏷️ Categorical columns: {category_cols}")
         return numeric_cols, category_cols
 
-    def print_category_values(self):
+    def print_category_values(self, top_k=10):
         """
         Print unique values for each categorical column.
+        With sketches, print the estimated distinct count and the top_k most
+        frequent values instead of the full unique arrays.
         """
         _, category_cols = self.identify_columns()
         for col in category_cols:
+            if self.sketches is not None and col in self.sketches.categorical:
+                sketch = self.sketches.categorical[col]
+                top = sketch.top_k(top_k)
+                logger.info("🔍 Column '%s' ~%s distinct values, top %s:\n%s", col, sketch.distinct.count(), len(top), top)
+                print(f"{col}: ~{sketch.distinct.count()} distinct, top: {top.index.tolist()}")
+                continue
             unique_vals = self.df[col].unique()
-            logger.info(f"🔍 Column '{col}' unique values: {unique_vals}")
+            logger.info("🔍 Column '%s' unique values: %s", col, unique_vals)
             print(f"{col}: {unique_vals}")
 
     def plot_numeric(self):
         """
         Plot histograms for all numeric columns.
         """
+        import matplotlib.pyplot as plt
         numeric_cols, _ = self.identify_columns()
         for col in numeric_cols:
             plt.figure(figsize=(6, 4))
-            self.df[col].hist(bins=30)
-            plt.title(f"Histogram of {col}")
+            title = f"Histogram of {col}"
+            if self.sketches is not None and col in self.sketches.numeric:
+                hist = self.sketches.numeric[col]
+                plt.stairs(hist.counts, hist.edges, fill=True)
+                title += out_of_range_note(hist.underflow, hist.overflow)
+            else:
+                self.df[col].hist(bins=30)
+            plt.title(title)
             plt.xlabel(col)
             plt.ylabel("Frequency")
             plt.tight_layout()
@@ -54,10 +97,14 @@ class DataAnalyser:
         """
         Plot bar charts for all categorical columns.
         """
+        import matplotlib.pyplot as plt
         _, category_cols = self.identify_columns()
         for col in category_cols:
             plt.figure(figsize=(8, 4))
-            self.df[col].value_counts().plot(kind='bar')
+            if self.sketches is not None and col in self.sketches.categorical:
+                self.sketches.categorical[col].top_k(30).plot(kind='bar')
+            else:
+                self.df[col].value_counts().plot(kind='bar')
             plt.title(f"Bar Chart of {col}")
             plt.xlabel(col)
             plt.ylabel("Count")
@@ -65,12 +112,29 @@ class DataAnalyser:
             plt.show()
             logger.info(f"📈 Plotted bar chart for {col}")
 
-    def plot_covariance_heatmap(self):
+    def plot_covariance_heatmap(self, top_k=None, accumulator: CorrelationAccumulator = None):
         """
         Plot a heatmap of the correlation matrix for numeric columns.
+        The matrix comes from a CorrelationAccumulator, so a running accumulator
+        that has been updated with new chunks can be passed instead of rescanning
+        the frame.
+        Args:
+            top_k (int, optional): Return the top_k most correlated column pairs
+                instead of plotting, e.g. for wide one-hot encoded frames.
+            accumulator (CorrelationAccumulator, optional): Precomputed statistics.
+        Returns:
+            pd.DataFrame or None: The top pairs when top_k is set.
         """
-        numeric_cols, _ = self.identify_columns()
-        corr = self.df[numeric_cols].corr()
+        if accumulator is None:
+            numeric_cols, _ = self.identify_columns()
+            accumulator = CorrelationAccumulator(columns=numeric_cols).update(self.df)
+        if top_k is not None:
+            pairs = accumulator.top_pairs(top_k)
+            logger.info("🧮 Top %s correlated column pairs:\n%s", top_k, pairs)
+            return pairs
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        corr = accumulator.correlation()
         logger.info("🧮 Plotting covariance (correlation) heatmap for numeric columns.")
         plt.figure(figsize=(10, 8))
         sns.heatmap(corr, annot=True, cmap='coolwarm', fmt=".2f")
@@ -79,5 +143,55 @@ class DataAnalyser:
         plt.show()
         logger.info("✅ Covariance heatmap plotted successfully.")
 
+    def render_report(self, output_dir, fmt='png', bins=30, top_k=30, max_workers=None):
+        """
+        Render all histograms, bar charts and the correlation heatmap to files,
+        without a display, and write an index.html next to them.
+        Counts are computed here with NumPy (or taken from self.sketches) and only
+        those are sent to the worker processes, which reuse one figure each.
+
+        Args:
+            output_dir (str): Folder for the report.
+            fmt (str): Image format, 'png' or 'svg'.
+            bins (int): Histogram bins when no sketches are available.
+            top_k (int): Maximum number of bars per categorical column.
+            max_workers (int, optional): Rendering processes; 1 renders in-process.
+        Returns:
+            str: Path of the written index.html.
+        """
+        numeric_cols, category_cols = self.identify_columns()
+
+        def path(kind, col):
+            safe = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(col))
+            return os.path.join(output_dir, f"{kind}_{safe}.{fmt}")
+
+        tasks = []
+        for col in numeric_cols:
+            if self.sketches is not None and col in self.sketches.numeric:
+                hist = self.sketches.numeric[col]
+                counts, edges = hist.counts, hist.edges
+                underflow, overflow = hist.underflow, hist.overflow
+            else:
+                values = self.df[col].to_numpy(dtype='float64')
+                counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+                underflow = overflow = 0
+            tasks.append(('hist', {'column': col, 'counts': counts, 'edges': edges, 'underflow': underflow,
+                                   'overflow': overflow, 'path': path('hist', col)}))
+        for col in category_cols:
+            if self.sketches is not None and col in self.sketches.categorical:
+                counts = self.sketches.categorical[col].top_k(top_k)
+            else:
+                counts = self.df[col].value_counts().head(top_k)
+            tasks.append(('bar', {'column': col, 'labels': counts.index.tolist(),
+                                  'counts': counts.to_numpy(), 'path': path('bar', col)}))
+        if self.df is not None and len(numeric_cols) > 1:
+            corr = CorrelationAccumulator(columns=numeric_cols).update(self.df).correlation()
+            tasks.append(('heatmap', {'labels': numeric_cols, 'matrix': corr.to_numpy(),
+                                      'path': path('heatmap', 'correlation')}))
+        logger.info(f"🗂️ Rendering {len(tasks)} figures to {output_dir}")
+        return render_all(tasks, output_dir, max_workers=max_workers)
+
 # Usage in notebook:
-# analyser.plot_covariance_heatmap()
\ No newline at end of file
+# analyser.plot_covariance_heatmap()
+# Batch jobs:
+# analyser.render_report('reports/eda', fmt='png')
\ No newline at end of file
@@ -1,46 +1,289 @@
+import json
 import pandas as pd
+import numpy as np
+import scipy.sparse as sp
 import logging
+from eda.backends import get_backend
+from utils.instrumentation import instrument
 from utils.logger import setup_logger
 
 logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
 
+
+class FrequencyEncoder:
+    """
+    Fit/transform frequency encoder.
+    Learns, per categorical column, the frequency of every category kept by the
+    threshold plus one shared frequency for the rare ones ('Other'), so the exact
+    training-time encoding can be reproduced on new batches or single requests.
+    """
+    def __init__(self, threshold=0.05, backend=None):
+        """
+        Args:
+            threshold (float): Minimum frequency (as a fraction) to keep a category.
+            backend (str, optional): Execution backend for counting and lookups
+                ('pandas', 'arrow' or 'polars'). The fitted maps are the same.
+        """
+        self.threshold = threshold
+        self.backend_name = get_backend(backend).name
+        self.maps = {}
+        self._lookups = None
+
+    @property
+    def backend(self):
+        """Execution backend, resolved from backend_name so pickled objects hold only the name."""
+        return get_backend(self.backend_name)
+
+    def fit(self, df: pd.DataFrame, columns=None):
+        """
+        Learn the frequency maps from a DataFrame.
+        Args:
+            df (pd.DataFrame): Training data.
+            columns (list, optional): Columns to encode. Defaults to object columns.
+        Returns:
+            FrequencyEncoder: The fitted encoder.
+        """
+        if columns is None:
+            columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        n = len(df)
+        self.maps = {}
+        self._lookups = None
+        for col in columns:
+            counts = self.backend.value_counts(df[col])
+            keep = counts[counts / counts.sum() >= self.threshold]
+            freqs = (keep / n).to_numpy(dtype='float64')
+            self.maps[col] = {
+                'categories': keep.index.tolist(),
+                'frequencies': freqs.tolist(),
+                'other': float((n - keep.sum()) / n) if n else 0.0,
+            }
+            logger.info(f"🔢 Fitted frequency map for '{col}': kept {len(keep)} of {len(counts)} categories.")
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace each fitted column with a '<col>_freq' column.
+        Values are looked up through categorical codes, unseen or rare values get
+        the 'Other' frequency.
+        Args:
+            df (pd.DataFrame): Data to encode.
+        Returns:
+            pd.DataFrame: New DataFrame with frequency-encoded columns appended.
+        """
+        encoded = {}
+        for col, fmap in self.maps.items():
+            codes = self.backend.category_codes(df[col], fmap['categories'])
+            lookup = np.append(np.asarray(fmap['frequencies'], dtype='float64'), fmap['other'])
+            encoded[col + '_freq'] = pd.Series(lookup[codes], index=df.index)
+        columns = {col: df[col] for col in df.columns if col not in self.maps}
+        columns.update(encoded)
+        return pd.DataFrame(columns, index=df.index)
+
+    def fit_transform(self, df: pd.DataFrame, columns=None) -> pd.DataFrame:
+        """Fit on df and return its encoded version."""
+        return self.fit(df, columns).transform(df)
+
+    def transform_record(self, record: dict) -> dict:
+        """
+        Encode a single record (dict) without going through pandas.
+        Args:
+            record (dict): Raw feature values keyed by column name.
+        Returns:
+            dict: Record with '<col>_freq' keys in place of the fitted columns.
+        """
+        if self._lookups is None:
+            self._lookups = {
+                col: dict(zip(fmap['categories'], fmap['frequencies']))
+                for col, fmap in self.maps.items()
+            }
+        out = {k: v for k, v in record.items() if k not in self.maps}
+        for col, lookup in self._lookups.items():
+            out[col + '_freq'] = lookup.get(record.get(col), self.maps[col]['other'])
+        return out
+
+    def to_dict(self) -> dict:
+        """Return the fitted state as a JSON-serialisable dict."""
+        return {'threshold': self.threshold, 'maps': self.maps}
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild an encoder from to_dict output."""
+        encoder = cls(threshold=state['threshold'])
+        encoder.maps = state['maps']
+        return encoder
+
+    def save(self, path):
+        """Write the fitted frequency maps to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        logger.info(f"💾 Saved frequency maps to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """Load an encoder saved with save."""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+class SparseOneHotEncoder:
+    """
+    One-hot encoder that emits a SciPy CSR matrix instead of dense dummy columns.
+    Columns are converted to pandas 'category' dtype against a fixed, persisted
+    vocabulary, so the feature layout stays stable between training and serving.
+    Naming and drop_first behaviour follow pd.get_dummies.
+    """
+    def __init__(self, drop_first=True):
+        """
+        Args:
+            drop_first (bool): Drop the first category of each column, like pd.get_dummies.
+        """
+        self.drop_first = drop_first
+        self.vocabulary = {}
+
+    def fit(self, df: pd.DataFrame, columns=None):
+        """
+        Learn the sorted category vocabulary of each column.
+        Args:
+            df (pd.DataFrame): Training data.
+            columns (list, optional): Columns to encode. Defaults to object and category columns.
+        Returns:
+            SparseOneHotEncoder: The fitted encoder.
+        """
+        if columns is None:
+            columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        self.vocabulary = {
+            col: pd.Categorical(df[col]).categories.tolist() for col in columns
+        }
+        return self
+
+    def get_feature_names(self) -> list:
+        """Return the one-hot column names in matrix order ('<col>_<value>')."""
+        names = []
+        start = 1 if self.drop_first else 0
+        for col, categories in self.vocabulary.items():
+            names.extend(f"{col}_{cat}" for cat in categories[start:])
+        return names
+
+    def transform(self, df: pd.DataFrame) -> sp.csr_matrix:
+        """
+        Encode the fitted columns as a sparse boolean matrix.
+        Missing and unseen values produce all-zero rows for their column.
+        Args:
+            df (pd.DataFrame): Data to encode.
+        Returns:
+            scipy.sparse.csr_matrix: Matrix of shape (len(df), len(get_feature_names())).
+        """
+        n = len(df)
+        start = 1 if self.drop_first else 0
+        rows, cols = [], []
+        offset = 0
+        for col, categories in self.vocabulary.items():
+            codes = pd.Categorical(df[col], categories=categories).codes.astype('int64') - start
+            hit = codes >= 0
+            rows.append(np.flatnonzero(hit))
+            cols.append(codes[hit] + offset)
+            offset += len(categories) - start
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype='int64')
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype='int64')
+        data = np.ones(len(rows), dtype=bool)
+        return sp.csr_matrix((data, (rows, cols)), shape=(n, offset))
+
+    def transform_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace the fitted columns with pandas sparse one-hot columns.
+        Args:
+            df (pd.DataFrame): Data to encode.
+        Returns:
+            pd.DataFrame: Remaining columns followed by Sparse[bool] dummy columns.
+        """
+        dummies = pd.DataFrame.sparse.from_spmatrix(
+            self.transform(df).astype(np.uint8), index=df.index, columns=self.get_feature_names()
+        ).astype(pd.SparseDtype(bool, False))
+        rest = df[[col for col in df.columns if col not in self.vocabulary]]
+        return pd.concat([rest, dummies], axis=1)
+
+    def to_dict(self) -> dict:
+        """Return the fitted state as a JSON-serialisable dict."""
+        return {'drop_first': self.drop_first, 'vocabulary': self.vocabulary}
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild an encoder from to_dict output."""
+        encoder = cls(drop_first=state['drop_first'])
+        encoder.vocabulary = state['vocabulary']
+        return encoder
+
+    def save(self, path):
+        """Write the fitted vocabulary to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        logger.info(f"💾 Saved one-hot vocabulary to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """Load an encoder saved with save."""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
 class DataEncoder:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, backend=None):
         """
         Initialize with a pandas DataFrame.
+        Args:
+            backend (str, optional): 'pandas' (default), 'arrow' or 'polars' (see eda/backends.py).
         """
         self.df = df
+        self.backend_name = get_backend(backend).name
 
-    def encode_categorical(self):
+    @property
+    def backend(self):
+        return get_backend(self.backend_name)
+
+    @instrument
+    def encode_categorical(self, sparse=False):
         """
-        Identify categorical columns (object dtype) and apply one-hot encoding.
+        Identify categorical columns (object or category dtype) and apply one-hot encoding.
+        Args:
+            sparse (bool): If True, encode through SparseOneHotEncoder and return
+                pandas sparse dummy columns instead of dense bool columns. The fitted
+                encoder is kept in self.one_hot_encoder; its transform gives a CSR matrix.
         Returns:
             pd.DataFrame: DataFrame with categorical variables encoded.
         """
-        cat_cols = self.df.select_dtypes(include='object').columns.tolist()
+        cat_cols = self.df.select_dtypes(include=['object', 'category']).columns.tolist()
         if not cat_cols:
             logger.info("🔎 No categorical columns found for encoding.")
             return self.df
         logger.info(f"🏷️ Identified categorical columns for encoding: {cat_cols}")
-        self.df = pd.get_dummies(self.df, columns=cat_cols, drop_first=True)
+        if sparse:
+            self.one_hot_encoder = SparseOneHotEncoder(drop_first=True).fit(self.df, cat_cols)
+            self.df = self.one_hot_encoder.transform_frame(self.df)
+            logger.info(f"🔄 Applied sparse one-hot encoding ({len(self.one_hot_encoder.get_feature_names())} columns).")
+            return self.df
+        if self.backend_name == 'pandas':
+            self.df = pd.get_dummies(self.df, columns=cat_cols, drop_first=True)
+        else:
+            # Same layout as get_dummies: untouched columns first, then dummies per column.
+            kept = self.df.drop(columns=cat_cols)
+            dummies = [self.backend.one_hot(self.df[col], drop_first=True) for col in cat_cols]
+            self.df = pd.concat([kept] + dummies, axis=1)
         logger.info("🔄 Applied one-hot encoding to categorical columns.")
         return self.df
 
+    @instrument
     def frequency_encode(self, threshold=0.05):
         """
         Frequency encode categorical columns. Rare categories (below threshold) are grouped as 'Other'.
+        The fitted FrequencyEncoder is kept in self.frequency_encoder so the same
+        maps can be saved and reused at serving time.
         Args:
             threshold (float): Minimum frequency (as a fraction) to keep a category.
         Returns:
             pd.DataFrame: DataFrame with frequency-encoded categorical columns.
         """
-        cat_cols = self.df.select_dtypes(include='object').columns.tolist()
-        for col in cat_cols:
-            freq = self.df[col].value_counts(normalize=True)
-            to_keep = freq[freq >= threshold].index
-            self.df[col] = self.df[col].apply(lambda x: x if x in to_keep else 'Other')
-            freq_map = self.df[col].value_counts(normalize=True)
-            self.df[col + '_freq'] = self.df[col].map(freq_map)
-            self.df.drop(columns=[col], inplace=True)
+        self.frequency_encoder = FrequencyEncoder(threshold=threshold, backend=self.backend_name).fit(self.df)
+        self.df = self.frequency_encoder.transform(self.df)
+        for col in self.frequency_encoder.maps:
             logger.info(f"🔢 Frequency-encoded '{col}' with threshold {threshold}.")
         return self.df
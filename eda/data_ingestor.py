@@ -1,14 +1,27 @@
 import logging
 import os
+import queue
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from utils.instrumentation import instrument
 from utils.logger import setup_logger
 
 logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
 
 class DataIngestor:
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, cache_dir: str = None):
+        """
+        Args:
+            data_dir (str): Folder containing the zipped source data.
+            cache_dir (str, optional): Folder for the columnar member cache used by
+                load_cached. Defaults to '<data_dir>/.cache'.
+        """
         self.data_dir = data_dir
+        self.cache_dir = cache_dir or os.path.join(data_dir, '.cache')
 
     def _find_zip_file(self) -> str:
         """Find the first zip file in the data directory."""
@@ -21,12 +34,116 @@ class DataIngestor:
         logger.error("❌ No zip file found in the data directory.")
         raise FileNotFoundError("No zip file found in the data directory.")
 
-    def load_data_file(self) -> pd.DataFrame:
+    def _list_members(self, zip_ref: zipfile.ZipFile) -> list:
+        """Return the supported file members of an open zip, failing like load_data_file."""
+        file_list = zip_ref.namelist()
+        if not file_list:
+            logger.error("⚠️ Zip file is empty.")
+            raise ValueError("Zip file is empty.")
+        for file_name in file_list:
+            if not file_name.endswith(('.csv', '.xlsx')):
+                logger.error(f"🚫 Unsupported file type: {file_name}")
+                raise ValueError(f"Unsupported file type: {file_name}")
+        return file_list
+
+    def _read_member_chunks(self, zip_path: str, file_name: str, chunksize: int):
+        """
+        Yield DataFrames of at most `chunksize` rows from one zip member.
+        Each call opens its own handle on the zip so members can be decoded from
+        several threads at once. Excel files cannot be read incrementally, so they
+        are loaded whole and then sliced.
+        """
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            with zip_ref.open(file_name) as f:
+                if file_name.endswith('.csv'):
+                    with pd.read_csv(f, chunksize=chunksize) as reader:
+                        for chunk in reader:
+                            chunk['source_file'] = file_name
+                            yield chunk
+                else:
+                    df = pd.read_excel(f)
+                    for start in range(0, len(df), chunksize):
+                        chunk = df.iloc[start:start + chunksize].copy()
+                        chunk['source_file'] = file_name
+                        yield chunk
+
+    @instrument
+    def iter_data_chunks(self, chunksize: int = 100_000, max_workers: int = None):
+        """
+        Stream the zip contents as bounded-size DataFrame chunks.
+        Members are decoded concurrently by a thread pool and handed over through
+        a bounded queue, so at most a few chunks per worker are held in memory
+        no matter how many files the zip contains. Chunks from different members
+        may arrive interleaved; use the 'source_file' column to tell them apart.
+
+        Args:
+            chunksize (int): Maximum number of rows per yielded chunk.
+            max_workers (int, optional): Number of members decoded at once.
+                Defaults to min(number of members, CPU count).
+        Yields:
+            pd.DataFrame: Chunk of rows with a 'source_file' column.
+        """
+        zip_path = self._find_zip_file()
+        logger.info(f"🗂️ Streaming zip file: {zip_path} (chunksize={chunksize})")
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            file_list = self._list_members(zip_ref)
+        if max_workers is None:
+            max_workers = min(len(file_list), os.cpu_count() or 1)
+
+        done = object()
+        chunks = queue.Queue(maxsize=max_workers * 2)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker(file_name):
+            logger.info(f"📄 Streaming file from zip: {file_name}")
+            try:
+                for chunk in self._read_member_chunks(zip_path, file_name, chunksize):
+                    if not put(chunk):
+                        return
+            except Exception as e:
+                put(e)
+            finally:
+                put(done)
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for file_name in file_list:
+                pool.submit(worker, file_name)
+            remaining = len(file_list)
+            total_rows = 0
+            while remaining:
+                item = chunks.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    logger.error(f"❌ Failed to stream zip member: {item}")
+                    raise item
+                else:
+                    total_rows += len(item)
+                    yield item
+            logger.info(f"✅ Streamed {total_rows} rows from {len(file_list)} files.")
+        finally:
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @instrument
+    def load_data_file(self, file_names: list = None) -> pd.DataFrame:
         """
         Extract all files from the zip and concatenate them into a single DataFrame.
         Adds a column 'source_file' indicating the filename for each row.
         Assumes all files have the same columns.
-        
+
+        Args:
+            file_names (list, optional): Only load these zip members. Defaults to all.
         Returns:
             pd.DataFrame: Concatenated DataFrame from all files in the zip.
         """
@@ -38,6 +155,8 @@ class DataIngestor:
             if not file_list:
                 logger.error("⚠️ Zip file is empty.")
                 raise ValueError("Zip file is empty.")
+            if file_names is not None:
+                file_list = [name for name in file_list if name in set(file_names)]
             for file_name in file_list:
                 logger.info(f"📄 Loading file from zip: {file_name}")
                 with zip_ref.open(file_name) as f:
@@ -58,7 +177,98 @@ class DataIngestor:
             logger.error("❌ No supported files found in the zip.")
             raise ValueError("No supported files found in the zip.")
 
+    def member_hashes(self) -> dict:
+        """
+        Return {member name: content hash} for the zip members.
+        The hash is the CRC-32 and uncompressed size from the zip central
+        directory, so no member has to be decompressed.
+        """
+        zip_path = self._find_zip_file()
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            self._list_members(zip_ref)
+            return {info.filename: f"{info.CRC:08x}-{info.file_size}" for info in zip_ref.infolist()}
+
+    def _cache_path(self, info: zipfile.ZipInfo) -> str:
+        """
+        Build the cache file path for a zip member.
+        The key comes from the zip central directory (CRC, uncompressed size and
+        the member's modification time), so it is known without decompressing.
+        """
+        stem = info.filename.replace('/', '__')
+        mtime = ''.join(f"{part:02d}" for part in info.date_time)
+        return os.path.join(self.cache_dir, f"{stem}.{info.CRC:08x}-{info.file_size}-{mtime}.feather")
+
+    def _refresh_member_cache(self, zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, cache_path: str):
+        """Parse one zip member, write it as uncompressed Feather and drop stale versions."""
+        logger.info(f"📄 Parsing and caching file from zip: {info.filename}")
+        with zip_ref.open(info) as f:
+            if info.filename.endswith('.csv'):
+                df = pd.read_csv(f)
+            else:
+                df = pd.read_excel(f)
+        df['source_file'] = info.filename
+        prefix = info.filename.replace('/', '__') + '.'
+        for old in os.listdir(self.cache_dir):
+            if old.startswith(prefix) and old.endswith('.feather'):
+                os.remove(os.path.join(self.cache_dir, old))
+        tmp_path = cache_path + '.tmp'
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+
+    @staticmethod
+    def _concat_tables(tables: list) -> pd.DataFrame:
+        """
+        Concatenate cached member tables into one DataFrame.
+        Members whose column types disagree (e.g. 'remaining_lease' stored as
+        int64 in the 2015-2016 file and as strings from 2017 on) are concatenated
+        with pandas instead, so the result matches load_data_file exactly.
+        """
+        try:
+            return pa.concat_tables(tables, promote_options='default').to_pandas()
+        except (pa.ArrowTypeError, pa.ArrowInvalid) as e:
+            logger.info(f"🔀 Member schemas differ ({e}); concatenating with pandas.")
+            return pd.concat([table.to_pandas() for table in tables], ignore_index=True)
+
+    @instrument
+    def load_cached(self, columns: list = None) -> pd.DataFrame:
+        """
+        Load the zip contents through the on-disk columnar cache.
+        Each member is converted to Feather the first time it is read. Later calls
+        memory-map the cached files and only re-parse members whose CRC, size or
+        modification time changed in the zip.
+
+        Args:
+            columns (list, optional): Columns to load. Columns missing from a
+                member are skipped for that member. Defaults to all columns.
+        Returns:
+            pd.DataFrame: Concatenated DataFrame, same layout as load_data_file.
+        """
+        zip_path = self._find_zip_file()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        logger.info(f"🗂️ Loading zip file through cache: {zip_path} -> {self.cache_dir}")
+        tables = []
+        hits = 0
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            self._list_members(zip_ref)
+            for info in zip_ref.infolist():
+                cache_path = self._cache_path(info)
+                if os.path.exists(cache_path):
+                    hits += 1
+                else:
+                    self._refresh_member_cache(zip_ref, info, cache_path)
+                table = feather.read_table(cache_path, memory_map=True)
+                if columns is not None:
+                    table = table.select([c for c in columns if c in table.column_names])
+                tables.append(table)
+        logger.info(f"💾 Cache hits: {hits}/{len(tables)} members.")
+        big_df = self._concat_tables(tables)
+        logger.info(f"✅ Loaded cached DataFrame with shape: {big_df.shape}")
+        return big_df
+
 # Example usage:
 # ingestor = DataIngestor(data_dir='data')
 # df = ingestor.load_data_file()
-# print(df.head())
\ No newline at end of file
+# print(df.head())
+# for chunk in ingestor.iter_data_chunks(chunksize=100_000):
+#     print(chunk.shape)
+# df = ingestor.load_cached(columns=['month', 'town', 'resale_price'])
\ No newline at end of file
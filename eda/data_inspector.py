@@ -1,15 +1,210 @@
 import logging
+import warnings
 import pandas as pd
+from eda.backends import get_backend
+from eda.sketches import HyperLogLog
 from utils.logger import setup_logger
 
 logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
 
+
+class DataProfile:
+    """
+    Mergeable column profile built from one or more DataFrame chunks.
+    Each update makes a single null scan (isnull(), or the validity bitmaps with
+    the Arrow backend) that feeds both the overall and the per-'source_file' null
+    counts, plus vectorized min/max/sum for numeric columns and HyperLogLog
+    distinct-count sketches. Profiles of separate chunks (or processes) can be
+    combined with merge, so the whole frame never has to be in memory at once.
+
+    Column dtypes are those pd.concat would give the concatenated chunks. A
+    one-row sample holding each column's first non-null value is kept and
+    concatenated with the next chunk's sample, so a column that is all-NaN
+    (float64) in one chunk and holds strings in another ends up object, and an
+    integer column missing from a chunk ends up float64.
+    """
+    def __init__(self, precision=12, backend=None):
+        """
+        Args:
+            precision (int): HyperLogLog precision for distinct-count estimates.
+            backend (str, optional): Execution backend for the null counts
+                ('pandas', 'arrow' or 'polars').
+        """
+        self.precision = precision
+        self.backend_name = get_backend(backend).name
+        self.rows = 0
+        self.columns = []
+        self.dtypes = None
+        self.sample = None
+        self.column_rows = None
+        self.null_counts = None
+        self.source_rows = None
+        self.source_null_counts = None
+        self.numeric = None
+        self.sketches = {}
+
+    @property
+    def backend(self):
+        return get_backend(self.backend_name)
+
+    @staticmethod
+    def _add(left, right):
+        """Add two count Series/DataFrames, treating missing labels as zero."""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        return left.add(right, fill_value=0)
+
+    def update(self, df: pd.DataFrame):
+        """
+        Add a chunk of rows to the profile.
+        Returns:
+            DataProfile: self, so calls can be chained.
+        """
+        self._add_columns(df.columns)
+        self._merge_sample(self._first_valid_row(df))
+        self.rows += len(df)
+        self.column_rows = self._add(self.column_rows, pd.Series(len(df), index=df.columns))
+        key = 'source_file' if 'source_file' in df.columns else None
+        null_counts, source_nulls, source_rows = self.backend.null_counts(df, key)
+        self.null_counts = self._add(self.null_counts, null_counts)
+        if key is not None:
+            self.source_null_counts = self._add(self.source_null_counts, source_nulls)
+            self.source_rows = self._add(self.source_rows, source_rows)
+
+        numeric = df.select_dtypes(include='number')
+        stats = pd.DataFrame({
+            'min': numeric.min(),
+            'max': numeric.max(),
+            'sum': numeric.astype('float64').sum(),
+            'count': numeric.count(),
+        })
+        self._merge_numeric(stats)
+
+        for col in df.columns:
+            self.sketches.setdefault(col, HyperLogLog(self.precision)).update(df[col])
+        return self
+
+    @staticmethod
+    def _first_valid_row(df: pd.DataFrame) -> pd.DataFrame:
+        """One-row frame with each column's first non-null value (or a null), keeping the dtypes."""
+        if df.empty:
+            return df.iloc[:0]
+        positions = df.notna().to_numpy().argmax(axis=0)
+        return pd.concat([df.iloc[[pos], j].reset_index(drop=True) for j, pos in enumerate(positions)], axis=1)
+
+    def _merge_sample(self, sample: pd.DataFrame):
+        """Widen the dtypes as pd.concat would, by concatenating the one-row samples."""
+        if self.sample is not None:
+            with warnings.catch_warnings():
+                # pandas deprecates leaving all-NA columns out of the result dtype; concatenating
+                # the chunks themselves is subject to the same rule, so follow whatever it does.
+                warnings.simplefilter('ignore', FutureWarning)
+                sample = self._first_valid_row(pd.concat([self.sample, sample], ignore_index=True))
+        self.sample = sample
+        self.dtypes = sample.dtypes
+
+    def _add_columns(self, columns):
+        """Remember column order; chunks from different files may add columns."""
+        seen = set(self.columns)
+        self.columns.extend(col for col in columns if col not in seen)
+
+    def _merge_numeric(self, stats: pd.DataFrame):
+        """Fold per-column min/max/sum/count into the running numeric stats."""
+        if self.numeric is None:
+            self.numeric = stats
+            return
+        combined = pd.concat([self.numeric, stats], keys=['a', 'b'])
+        grouped = combined.groupby(level=1, sort=False)
+        self.numeric = pd.DataFrame({
+            'min': grouped['min'].min(),
+            'max': grouped['max'].max(),
+            'sum': grouped['sum'].sum(),
+            'count': grouped['count'].sum(),
+        })
+
+    def merge(self, other):
+        """
+        Merge another profile into this one.
+        Returns:
+            DataProfile: self, so calls can be chained.
+        """
+        if other.rows == 0:
+            return self
+        self._add_columns(other.columns)
+        self._merge_sample(other.sample)
+        self.rows += other.rows
+        self.column_rows = self._add(self.column_rows, other.column_rows)
+        self.null_counts = self._add(self.null_counts, other.null_counts)
+        self.source_null_counts = self._add(self.source_null_counts, other.source_null_counts)
+        self.source_rows = self._add(self.source_rows, other.source_rows)
+        if other.numeric is not None:
+            self._merge_numeric(other.numeric)
+        for col, sketch in other.sketches.items():
+            self.sketches.setdefault(col, HyperLogLog(self.precision)).merge(sketch)
+        return self
+
+    @classmethod
+    def from_chunks(cls, chunks, precision=12, backend=None):
+        """
+        Build a profile from an iterable of DataFrames, e.g. DataIngestor.iter_data_chunks().
+        """
+        profile = cls(precision=precision, backend=backend)
+        for chunk in chunks:
+            profile.update(chunk)
+        return profile
+
+    def shape(self) -> tuple:
+        """Return (rows, columns) of the profiled data."""
+        return (self.rows, len(self.columns))
+
+    def total_null_counts(self) -> pd.Series:
+        """
+        Return null counts per column. Rows from chunks that lacked a column
+        count as nulls, as they would after concatenating the chunks.
+        """
+        missing = self.rows - self.column_rows
+        return (self.null_counts + missing).reindex(self.columns).astype('int64')
+
+    def null_percentages(self) -> pd.Series:
+        """Return the percentage of null values per column."""
+        return self.total_null_counts() / self.rows * 100
+
+    def nulls_by_source_file(self) -> dict:
+        """Return {source_file: null percentage per column}, rounded to 2 decimals."""
+        if self.source_null_counts is None:
+            return None
+        # A source missing a column entirely has no count for it: it is 100% null.
+        counts = self.source_null_counts.reindex(columns=self.columns)
+        counts = counts.apply(lambda col: col.fillna(self.source_rows))
+        percent = (counts.div(self.source_rows, axis=0) * 100).round(2)
+        return {name: row.rename(None) for name, row in percent.sort_index().iterrows()}
+
+    def column_stats(self) -> pd.DataFrame:
+        """
+        Return per-column null count, estimated distinct count, and min/max/mean
+        for numeric columns.
+        """
+        stats = pd.DataFrame({
+            'null_count': self.total_null_counts(),
+            'distinct_estimate': pd.Series({col: sk.count() for col, sk in self.sketches.items()}),
+        }, index=self.columns)
+        if self.numeric is not None:
+            stats['min'] = self.numeric['min']
+            stats['max'] = self.numeric['max']
+            stats['mean'] = self.numeric['sum'] / self.numeric['count']
+        return stats
+
 class DataInspector:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, backend=None):
         """
         Initialize with a pandas DataFrame.
+        Args:
+            backend (str, optional): 'pandas' (default), 'arrow' or 'polars' (see eda/backends.py).
         """
         self.df = df
+        self.backend = backend
 
     def data_shape(self):
         """Log and return the shape of the DataFrame."""
@@ -20,13 +215,13 @@ class DataInspector:
     def data_types(self):
         """Log and return the data types of each column."""
         dtypes = self.df.dtypes
-        logger.info(f"🔠 Data types:\n{dtypes}")
+        logger.info("🔠 Data types:\n%s", dtypes)
         return dtypes
 
     def null_percentages(self):
         """Log and return the percentage of null values per column."""
         null_percent = self.df.isnull().mean() * 100
-        logger.info(f"🕳️ Null percentages per column:\n{null_percent}")
+        logger.info("🕳️ Null percentages per column:\n%s", null_percent)
         return null_percent
 
     def nulls_by_source_file(self):
@@ -36,33 +231,50 @@ class DataInspector:
         if 'source_file' not in self.df.columns:
             logger.warning("⚠️ Column 'source_file' not found for per-file null analysis.")
             return None
-        grouped = self.df.groupby('source_file')
+        grouped = self.df.groupby('source_file', observed=True)
         result = {}
         for name, group in grouped:
             nulls = (group.isnull().mean() * 100).round(2)
-            logger.info(f"📂 Null percentages for source_file={name}:\n{nulls}")
+            logger.info("📂 Null percentages for source_file=%s:\n%s", name, nulls)
             result[name] = nulls
         return result
 
-    def inspect_all(self):
+    def inspect_all(self, profile: DataProfile = None):
         """
-        Run all inspection methods and return a dictionary with their results.
+        Run all inspections in a single profiling pass and return a dictionary with their results.
         Logs each step.
+        Args:
+            profile (DataProfile, optional): Precomputed (e.g. chunk-merged) profile to
+                report on instead of profiling self.df.
         Returns:
             dict: {
                 "shape": tuple,
                 "dtypes": pd.Series,
                 "null_percentages": pd.Series,
-                "nulls_by_source_file": dict or None
+                "nulls_by_source_file": dict or None,
+                "column_stats": pd.DataFrame
             }
         """
         logger.info("🔎 Running full data inspection...")
+        if profile is None:
+            profile = DataProfile(backend=self.backend).update(self.df)
+        self.profile = profile
         results = {
-            "shape": self.data_shape(),
-            "dtypes": self.data_types(),
-            "null_percentages": self.null_percentages(),
-            "nulls_by_source_file": self.nulls_by_source_file()
+            "shape": profile.shape(),
+            "dtypes": profile.dtypes,
+            "null_percentages": profile.null_percentages(),
+            "nulls_by_source_file": profile.nulls_by_source_file(),
+            "column_stats": profile.column_stats(),
         }
+        logger.info(f"📏 Data shape: {results['shape']}")
+        logger.info("🔠 Data types:\n%s", results['dtypes'])
+        logger.info("🕳️ Null percentages per column:\n%s", results['null_percentages'])
+        if results["nulls_by_source_file"] is None:
+            logger.warning("⚠️ Column 'source_file' not found for per-file null analysis.")
+        else:
+            for name, nulls in results["nulls_by_source_file"].items():
+                logger.info("📂 Null percentages for source_file=%s:\n%s", name, nulls)
+        logger.info("📊 Column statistics:\n%s", results['column_stats'])
         logger.info("✅ Data inspection complete.")
         return results
 # Example usage:
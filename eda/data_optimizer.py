@@ -0,0 +1,80 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.logger import lazy, setup_logger
+
+logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
+
+class DataOptimizer:
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize with a pandas DataFrame.
+        """
+        self.df = df
+        self.report = {}
+
+    def memory_usage(self) -> int:
+        """Return the deep memory usage of the DataFrame in bytes."""
+        return int(self.df.memory_usage(deep=True).sum())
+
+    def downcast_numeric(self, downcast_floats=True):
+        """
+        Downcast integer columns to the smallest signed type that holds their range,
+        and float64 columns to float32 when that round-trips without loss.
+        Args:
+            downcast_floats (bool): Also try float64 -> float32. Default is True.
+        Returns:
+            pd.DataFrame: DataFrame with downcast numeric columns.
+        """
+        for col in self.df.select_dtypes(include='integer').columns:
+            self.df[col] = pd.to_numeric(self.df[col], downcast='integer')
+        if downcast_floats:
+            for col in self.df.select_dtypes(include='float64').columns:
+                values = self.df[col].to_numpy()
+                as_f32 = values.astype('float32')
+                if np.array_equal(as_f32.astype('float64'), values, equal_nan=True):
+                    self.df[col] = as_f32
+        logger.info("🔽 Downcast numeric columns:\n%s", lazy(lambda: self.df.select_dtypes(include='number').dtypes))
+        return self.df
+
+    def categorize_strings(self, max_unique_ratio=0.5):
+        """
+        Convert low-cardinality string columns to 'category' dtype.
+        Args:
+            max_unique_ratio (float): Convert a column when its distinct values
+                make up at most this fraction of the rows. Default is 0.5.
+        Returns:
+            pd.DataFrame: DataFrame with categorical string columns.
+        """
+        n = len(self.df)
+        for col in self.df.select_dtypes(include='object').columns:
+            values = self.df[col]
+            if n and values.nunique(dropna=True) / n <= max_unique_ratio:
+                self.df[col] = values.astype('category')
+                logger.info(f"🏷️ Converted '{col}' to category ({len(self.df[col].cat.categories)} categories).")
+        return self.df
+
+    def optimize_all(self, downcast_floats=True, max_unique_ratio=0.5):
+        """
+        Run all optimizations and log the memory saved.
+        Results are stored in self.report as bytes before/after and the reduction ratio.
+        Returns:
+            pd.DataFrame: The compacted DataFrame.
+        """
+        logger.info("🧰 Optimizing DataFrame dtypes...")
+        before = self.memory_usage()
+        self.downcast_numeric(downcast_floats=downcast_floats)
+        self.categorize_strings(max_unique_ratio=max_unique_ratio)
+        after = self.memory_usage()
+        self.report = {
+            "bytes_before": before,
+            "bytes_after": after,
+            "reduction": round(before / after, 2) if after else None,
+        }
+        logger.info(f"✅ Memory usage {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB ({self.report['reduction']}x smaller).")
+        return self.df
+
+# Example usage:
+# from eda.data_ingestor import DataIngestor
+# df = DataIngestor(data_dir='data').load_data_file()
+# df = DataOptimizer(df).optimize_all()
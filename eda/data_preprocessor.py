@@ -1,9 +1,173 @@
 import pandas as pd
+import numpy as np
 import logging
+import re
+import time
+from datetime import datetime
+import tracemalloc
+from utils.instrumentation import instrument
 from utils.logger import setup_logger
 
 logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
 
+LEASE_MISSING = -1000
+_LEASE_PATTERN = r'^\s*(?:(?P<years>\d+)\s*years?)?\D*?(?:(?P<months>\d+)\s*months?)?\s*$'
+_LEASE_RE = re.compile(_LEASE_PATTERN)
+
+
+def parse_lease(val):
+    """
+    Convert a single remaining lease value like '61 years 04 months' to float years.
+    NaN and unsupported types become LEASE_MISSING, numbers are passed through as float.
+    """
+    if pd.isna(val):
+        return LEASE_MISSING
+    if isinstance(val, (int, float)):
+        return float(val)
+    if isinstance(val, str):
+        years = 0
+        months = 0
+        if 'year' in val:
+            parts = val.split('year')
+            years = int(parts[0].strip())
+            if 'month' in parts[1]:
+                months_part = parts[1].split('month')[0]
+                months = int(''.join(filter(str.isdigit, months_part)))
+        elif 'month' in val:
+            months = int(''.join(filter(str.isdigit, val)))
+        return round(years + months / 12, 2)
+    return LEASE_MISSING
+
+
+def parse_lease_series(series: pd.Series) -> pd.Series:
+    """
+    Vectorized equivalent of applying parse_lease to a Series.
+    The column only holds a few hundred distinct lease strings, so the values are
+    factorized first, the distinct strings are parsed with one str.extract call and
+    NumPy arithmetic, and the results are mapped back through the factor codes.
+
+    Args:
+        series (pd.Series): Raw remaining lease values.
+    Returns:
+        pd.Series: Float years rounded to 2 decimals, LEASE_MISSING for NaN.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = np.asarray(uniques, dtype=object)
+    parsed = np.full(len(uniques), LEASE_MISSING, dtype='float64')
+
+    is_str = np.fromiter((isinstance(v, str) for v in uniques), dtype=bool, count=len(uniques))
+    is_num = np.fromiter((isinstance(v, (int, float)) for v in uniques), dtype=bool, count=len(uniques))
+    parsed[is_num] = uniques[is_num].astype('float64')
+    if is_str.any():
+        parts = pd.Series(uniques[is_str], dtype=object).str.extract(_LEASE_PATTERN)
+        years = parts['years'].fillna('0').to_numpy(dtype='int64')
+        months = parts['months'].fillna('0').to_numpy(dtype='int64')
+        parsed[is_str] = np.round(years + months / 12, 2)
+
+    # NaN rows carry code -1, which picks up the trailing LEASE_MISSING slot.
+    parsed = np.append(parsed, LEASE_MISSING)
+    return pd.Series(parsed[codes], index=series.index, name=series.name)
+
+
+def parse_lease_value(val) -> float:
+    """
+    Scalar twin of parse_lease_series, with exactly the same results: strings
+    the lease pattern does not match give 0.0, numbers pass through as float,
+    and missing or unsupported values give LEASE_MISSING.
+    """
+    if isinstance(val, str):
+        match = _LEASE_RE.search(val)
+        years = int(match['years'] or 0) if match else 0
+        months = int(match['months'] or 0) if match else 0
+        return float(np.round(years + months / 12, 2))
+    if isinstance(val, (int, float, np.integer, np.floating)) and val == val:
+        return float(val)
+    return LEASE_MISSING
+
+
+def parse_year_month(value) -> tuple:
+    """
+    Lenient scalar counterpart of derive_year_month for single records:
+    (year, month) from 'YYYY-MM', or (nan, nan) for missing values. Unlike the
+    batch step, which raises, values in any other format also give (nan, nan).
+    """
+    if isinstance(value, str):
+        try:
+            parsed = datetime.strptime(value, '%Y-%m')
+        except ValueError:
+            return np.nan, np.nan
+        return parsed.year, parsed.month
+    return np.nan, np.nan
+
+
+def derive_year_month(values: pd.Series) -> dict:
+    """Derive 'year' and 'month_num' from a YYYY-MM column."""
+    dates = pd.to_datetime(values, format='%Y-%m', cache=True)
+    return {'year': dates.dt.year, 'month_num': dates.dt.month}
+
+
+def derive_storey_features(values: pd.Series) -> dict:
+    """Derive 'storey_min', 'storey_max' and 'storey_mean' from ranges like '04 TO 06'."""
+    codes, uniques = pd.factorize(values)
+    if (codes < 0).any():
+        raise ValueError("storey range contains missing values")
+    bounds = pd.Series(uniques).str.split(' TO ', expand=True).astype(int).to_numpy()
+    storey_min = bounds[codes, 0]
+    storey_max = bounds[codes, 1]
+    return {
+        'storey_min': pd.Series(storey_min, index=values.index),
+        'storey_max': pd.Series(storey_max, index=values.index),
+        'storey_mean': pd.Series((storey_min + storey_max) / 2, index=values.index),
+    }
+
+
+def parse_storey_range(value) -> tuple:
+    """
+    Scalar counterpart of derive_storey_features: (min, max) from a range like
+    '04 TO 06'. Missing or malformed ranges are logged and give (nan, nan), the
+    result the batch step (raise_on_error=False) leaves for a batch of that record.
+    """
+    try:
+        low, high = value.split(' TO ')
+        return int(low), int(high)
+    except (AttributeError, ValueError) as e:
+        logger.error(f"❌ Failed to extract storey range features from {value!r}: {e}")
+        return np.nan, np.nan
+
+
+def derive_remaining_lease(values: pd.Series) -> dict:
+    """Derive 'remaining_lease_years' from the raw remaining lease column."""
+    return {values.name + '_years': parse_lease_series(values)}
+
+
+class PreprocessStep:
+    """
+    Declarative preprocessing step: reads one source column, derives new columns
+    and drops the source. Steps never touch the frame themselves, so any number
+    of them can be combined into a single assembly of the output frame.
+    """
+    def __init__(self, name: str, source: str, derive, raise_on_error: bool = True):
+        """
+        Args:
+            name (str): Step name used in logs and the timing report.
+            source (str): Column the step reads and replaces.
+            derive (callable): Function taking the source Series and returning a
+                dict of new column name -> Series or array aligned with it.
+            raise_on_error (bool): If False, failures are logged and the source
+                column is left untouched.
+        """
+        self.name = name
+        self.source = source
+        self.derive = derive
+        self.raise_on_error = raise_on_error
+
+
+DEFAULT_STEPS = [
+    PreprocessStep('year_month', 'month', derive_year_month),
+    PreprocessStep('storey_range', 'storey_range', derive_storey_features, raise_on_error=False),
+    PreprocessStep('remaining_lease', 'remaining_lease', derive_remaining_lease),
+]
+
 class DataPreprocessor:
     def __init__(self, df: pd.DataFrame):
         """
@@ -11,6 +175,7 @@ class DataPreprocessor:
         """
         self.df = df
 
+    @instrument
     def get_year_and_month_to_datetime(self, column='month'):
         """
         Convert the specified column to datetime format (YYYY-MM).
@@ -30,6 +195,7 @@ class DataPreprocessor:
             logger.warning(f"⚠️ Column '{column}' not found in DataFrame.")
         return self.df
 
+    @instrument
     def extract_storey_range_features(self, column='storey_range'):
         """
         Extract numeric features from a storey range column.
@@ -52,7 +218,8 @@ class DataPreprocessor:
             logger.warning(f"⚠️ Column '{column}' not found in DataFrame.")
         return self.df
 
-    def process_remaining_lease(self, column='remaining_lease'):
+    @instrument
+    def process_remaining_lease(self, column='remaining_lease', vectorized=True):
         """
         Process the 'remaining_lease' column:
         - Replace NaN with -1000
@@ -62,47 +229,77 @@ class DataPreprocessor:
 
         Args:
             column (str): The column name to process. Default is 'remaining_lease'.
+            vectorized (bool): Use the vectorized parser (default). Set to False to
+                fall back to the per-row parse_lease.
         Returns:
             pd.DataFrame: DataFrame with the processed column.
         """
-        import numpy as np
-        def parse_lease(val):
-            if pd.isna(val):
-                return -1000
-            if isinstance(val, (int, float)):
-                return float(val)
-            if isinstance(val, str):
-                years = 0
-                months = 0
-                if 'year' in val:
-                    parts = val.split('year')
-                    years = int(parts[0].strip())
-                    if 'month' in parts[1]:
-                        months_part = parts[1].split('month')[0]
-                        months = int(''.join(filter(str.isdigit, months_part)))
-                elif 'month' in val:
-                    months = int(''.join(filter(str.isdigit, val)))
-                return round(years + months / 12, 2)
-            return -1000
-
         if column in self.df.columns:
             new_col = column + '_years'
-            self.df[new_col] = self.df[column].apply(parse_lease)
+            if vectorized:
+                self.df[new_col] = parse_lease_series(self.df[column])
+            else:
+                self.df[new_col] = self.df[column].apply(parse_lease)
             self.df.drop(columns=[column], inplace=True)
             logger.info(f"⏳ Processed '{column}' to '{new_col}' (years as float, NaN as -1000) and dropped original column.")
         else:
             logger.warning(f"⚠️ Column '{column}' not found in DataFrame.")
         return self.df
 
-    def preprocess_all(self):
+    @instrument
+    def preprocess_all(self, steps=None, track_memory=False, backend=None):
         """
         Run all preprocessing steps: convert month to datetime, extract storey range features,
         and process remaining lease. Returns the processed DataFrame.
+
+        Every step only derives its new columns; the output frame is assembled
+        once at the end instead of being copied by each step. Per-step timings
+        (and peak memory if requested) are stored in self.report.
+
+        Args:
+            steps (list, optional): PreprocessStep objects to run. Defaults to DEFAULT_STEPS.
+            track_memory (bool): Record peak Python/NumPy allocations per step
+                with tracemalloc. Slows the steps down, so it is off by default.
+            backend (str, optional): 'pandas' (default), 'arrow' or 'polars'; runs the
+                default steps on that engine with identical results (see eda/backends.py).
+        Returns:
+            pd.DataFrame: New DataFrame with the derived columns.
         """
         logger.info("🚦 Starting full preprocessing pipeline...")
-        self.get_year_and_month_to_datetime()
-        self.extract_storey_range_features()
-        self.process_remaining_lease()
+        from eda.backends import get_backend
+        backend = get_backend(backend)
+        steps = DEFAULT_STEPS if steps is None else steps
+        self.report = []
+        derived = {}
+        consumed = set()
+        for step in steps:
+            if step.source not in self.df.columns:
+                logger.warning(f"⚠️ Column '{step.source}' not found in DataFrame.")
+                continue
+            if track_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                new_cols = backend.derive_for(step)(self.df[step.source])
+            except Exception as e:
+                if step.raise_on_error:
+                    raise
+                logger.error(f"❌ Step '{step.name}' failed: {e}")
+                continue
+            finally:
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+                if track_memory:
+                    tracemalloc.stop()
+            derived.update(new_cols)
+            consumed.add(step.source)
+            entry = {'step': step.name, 'seconds': round(elapsed, 6), 'peak_bytes': peak}
+            self.report.append(entry)
+            logger.info(f"⏱️ Step '{step.name}' produced {list(new_cols)} in {elapsed:.3f}s (peak bytes: {peak}).")
+
+        columns = {col: self.df[col] for col in self.df.columns if col not in consumed}
+        columns.update(derived)
+        self.df = pd.DataFrame(columns, index=self.df.index)
         logger.info("✅ Preprocessing complete.")
         return self.df
 
@@ -0,0 +1,313 @@
+import json
+import logging
+import numpy as np
+import pandas as pd
+from utils.logger import setup_logger
+
+logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
+
+# 'month' is the period key itself: every new batch brings unseen values by construction.
+EXCLUDED_COLUMNS = ('house_id', 'event_timestamp', 'created', 'source_file', 'month')
+_EPS = 1e-4
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """
+    Population stability index between two binned distributions (counts or
+    proportions). Empty bins are floored at 1e-4 so the log stays finite.
+    """
+    p = np.maximum(expected / max(expected.sum(), 1), _EPS)
+    q = np.maximum(actual / max(actual.sum(), 1), _EPS)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def jensen_shannon(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Jensen-Shannon distance (base 2, in [0, 1]) between two binned distributions."""
+    p = expected / max(expected.sum(), 1)
+    q = actual / max(actual.sum(), 1)
+    m = (p + q) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kl_p = np.where(p > 0, p * np.log2(p / m), 0.0).sum()
+        kl_q = np.where(q > 0, q * np.log2(q / m), 0.0).sum()
+    return float(np.sqrt(max((kl_p + kl_q) / 2, 0.0)))
+
+
+def ks_pvalue(statistic: float, n: int, m: int) -> float:
+    """Asymptotic two-sample Kolmogorov-Smirnov p-value."""
+    from scipy.stats import kstwobign
+    if not n or not m:
+        return float('nan')
+    en = np.sqrt(n * m / (n + m))
+    return float(kstwobign.sf(statistic * en))
+
+
+class ReferenceProfile:
+    """
+    Reference distribution summaries for drift checks, computed once and persisted.
+    Numeric features keep quantile bin edges with their counts (for PSI and
+    Jensen-Shannon) and the reference CDF on up to 1000 support points (for KS).
+    Categorical features keep the frequencies of the most common categories plus
+    one 'other' bucket. New batches are compared against these summaries, so the
+    reference data never has to be read again.
+    """
+    def __init__(self, bins=10, support_points=1000, max_categories=200):
+        """
+        Args:
+            bins (int): Quantile bins per numeric feature for PSI/Jensen-Shannon.
+            support_points (int): Reference CDF points kept per numeric feature for KS.
+            max_categories (int): Categories kept per categorical feature; the rest
+                share an 'other' bucket.
+        """
+        self.bins = bins
+        self.support_points = support_points
+        self.max_categories = max_categories
+        self.rows = 0
+        self.numeric = {}
+        self.categorical = {}
+
+    def fit(self, df: pd.DataFrame, columns=None):
+        """
+        Summarize the reference data.
+        Args:
+            df (pd.DataFrame): Reference feature rows.
+            columns (list, optional): Features to summarize. Defaults to every
+                numeric, object and category column except ids and timestamps.
+        Returns:
+            ReferenceProfile: self, so calls can be chained.
+        """
+        if columns is None:
+            columns = [col for col in df.columns if col not in EXCLUDED_COLUMNS]
+        self.rows = len(df)
+        self.numeric = {}
+        self.categorical = {}
+        for col in columns:
+            values = df[col]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                self.numeric[col] = self._fit_numeric(values.to_numpy(dtype='float64', na_value=np.nan))
+            else:
+                self.categorical[col] = self._fit_categorical(values)
+        logger.info(f"📐 Reference profile built from {self.rows} rows: "
+                    f"{len(self.numeric)} numeric and {len(self.categorical)} categorical features.")
+        return self
+
+    def _fit_numeric(self, values: np.ndarray) -> dict:
+        nulls = int(np.isnan(values).sum())
+        ordered = np.sort(values[~np.isnan(values)])
+        if not len(ordered):
+            return {'edges': [], 'counts': [0], 'support': [], 'cdf': [], 'count': 0, 'nulls': nulls}
+        # Interior quantile edges; the outer bins are open-ended.
+        edges = np.unique(np.quantile(ordered, np.linspace(0, 1, self.bins + 1)[1:-1]))
+        support = np.unique(np.quantile(ordered, np.linspace(0, 1, self.support_points + 1)))
+        return {
+            'edges': edges.tolist(),
+            'counts': _binned_counts(ordered, edges).tolist(),
+            'support': support.tolist(),
+            'cdf': (np.searchsorted(ordered, support, side='right') / len(ordered)).tolist(),
+            'count': int(len(ordered)),
+            'nulls': nulls,
+        }
+
+    def _fit_categorical(self, values: pd.Series) -> dict:
+        counts = values.value_counts(dropna=True)
+        top = counts.head(self.max_categories)
+        return {
+            'categories': [str(cat) for cat in top.index],
+            'counts': top.to_numpy(dtype='int64').tolist(),
+            'other': int(counts.sum() - top.sum()),
+            'nulls': int(values.isna().sum()),
+        }
+
+    @classmethod
+    def from_parquet(cls, path, columns=None, **kwargs):
+        """Summarize a reference Parquet file or dataset, reading only the feature columns."""
+        return cls(**kwargs).fit(pd.read_parquet(path, columns=columns), columns=columns)
+
+    def to_dict(self) -> dict:
+        """Return the summaries as a JSON-serialisable dict."""
+        return {
+            'bins': self.bins,
+            'support_points': self.support_points,
+            'max_categories': self.max_categories,
+            'rows': self.rows,
+            'numeric': self.numeric,
+            'categorical': self.categorical,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild a profile from to_dict output."""
+        profile = cls(bins=state['bins'], support_points=state['support_points'],
+                      max_categories=state['max_categories'])
+        profile.rows = state['rows']
+        profile.numeric = state['numeric']
+        profile.categorical = state['categorical']
+        return profile
+
+    def save(self, path):
+        """Write the reference summaries to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        logger.info(f"💾 Saved reference profile to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """Load a profile saved with save."""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def _binned_counts(ordered: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Counts per bin [edge_i, edge_i+1) of sorted values, with open outer bins."""
+    cumulative = np.concatenate(([0], np.searchsorted(ordered, edges, side='left'), [len(ordered)]))
+    return np.diff(cumulative)
+
+
+class DriftMonitor:
+    """
+    Compare feature batches against a persisted ReferenceProfile.
+    Every numeric column of a batch is sorted once, and the PSI and
+    Jensen-Shannon bin counts and the KS statistic are all read off that sorted
+    column with searchsorted. Categorical columns are counted once through
+    categorical codes against the reference categories.
+    """
+    def __init__(self, reference: ReferenceProfile, psi_threshold=0.2, js_threshold=0.1, ks_threshold=0.1):
+        """
+        Args:
+            reference (ReferenceProfile): Fitted (or loaded) reference summaries.
+            psi_threshold (float): PSI at or above which a feature is flagged (0.2
+                is the usual "significant shift" level).
+            js_threshold (float): Jensen-Shannon distance at or above which a feature is flagged.
+            ks_threshold (float): KS statistic at or above which a numeric feature is
+                flagged. PSI and Jensen-Shannon cannot see shifts of constant or
+                low-cardinality columns, whose reference quantile edges collapse
+                into one or two bins; KS compares the CDFs directly. The statistic
+                is used rather than the p-value, which flags negligible shifts on
+                large batches.
+        """
+        self.reference = reference
+        self.psi_threshold = psi_threshold
+        self.js_threshold = js_threshold
+        self.ks_threshold = ks_threshold
+
+    def check(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute drift statistics of one batch for every reference feature it contains.
+        Returns:
+            pd.DataFrame: One row per feature with kind, rows, null rates, psi,
+                js_distance, ks_statistic, ks_pvalue (numeric only) and drifted.
+        """
+        rows = []
+        numeric_cols = [col for col in self.reference.numeric if col in batch.columns]
+        if numeric_cols:
+            matrix = batch[numeric_cols].to_numpy(dtype='float64', na_value=np.nan)
+            valid_counts = (~np.isnan(matrix)).sum(axis=0)
+            # One sort for all numeric features; NaN sorts to the end of each column.
+            matrix.sort(axis=0)
+            for j, col in enumerate(numeric_cols):
+                rows.append(self._numeric_stats(col, matrix[:valid_counts[j], j], len(batch)))
+        for col, ref in self.reference.categorical.items():
+            if col in batch.columns:
+                rows.append(self._categorical_stats(col, ref, batch[col]))
+        result = pd.DataFrame(rows, columns=['feature', 'kind', 'rows', 'null_rate_reference', 'null_rate_batch',
+                                             'psi', 'js_distance', 'ks_statistic', 'ks_pvalue'])
+        result['drifted'] = ((result['psi'] >= self.psi_threshold) | (result['js_distance'] >= self.js_threshold)
+                             | (result['ks_statistic'] >= self.ks_threshold))
+        return result.set_index('feature')
+
+    def _numeric_stats(self, col, ordered: np.ndarray, rows: int) -> dict:
+        ref = self.reference.numeric[col]
+        edges = np.asarray(ref['edges'], dtype='float64')
+        expected = np.asarray(ref['counts'], dtype='float64')
+        actual = _binned_counts(ordered, edges).astype('float64')
+        ks = float('nan')
+        pvalue = float('nan')
+        if ref['count'] and len(ordered):
+            support = np.asarray(ref['support'], dtype='float64')
+            batch_cdf = np.searchsorted(ordered, support, side='right') / len(ordered)
+            ks = float(np.max(np.abs(batch_cdf - np.asarray(ref['cdf']))))
+            pvalue = ks_pvalue(ks, ref['count'], len(ordered))
+        return {
+            'feature': col,
+            'kind': 'numeric',
+            'rows': rows,
+            'null_rate_reference': _rate(ref['nulls'], ref['count'] + ref['nulls']),
+            'null_rate_batch': _rate(rows - len(ordered), rows),
+            'psi': psi(expected, actual),
+            'js_distance': jensen_shannon(expected, actual),
+            'ks_statistic': ks,
+            'ks_pvalue': pvalue,
+        }
+
+    @staticmethod
+    def _categorical_stats(col, ref: dict, values: pd.Series) -> dict:
+        categories = ref['categories']
+        if values.dtype != object:
+            # Reference categories are stored as strings.
+            values = values.astype('string').astype(object)
+        codes = pd.Categorical(values, categories=categories).codes
+        nulls = int(values.isna().sum())
+        # Code -1 covers both unseen categories and nulls; nulls are taken back out.
+        counts = np.bincount(codes.astype('int64') + 1, minlength=len(categories) + 1).astype('float64')
+        counts[0] -= nulls
+        expected = np.append(np.asarray(ref['counts'], dtype='float64'), ref['other'])
+        actual = np.append(counts[1:], counts[0])
+        total_ref = sum(ref['counts']) + ref['other']
+        return {
+            'feature': col,
+            'kind': 'categorical',
+            'rows': len(values),
+            'null_rate_reference': _rate(ref['nulls'], total_ref + ref['nulls']),
+            'null_rate_batch': _rate(nulls, len(values)),
+            'psi': psi(expected, actual),
+            'js_distance': jensen_shannon(expected, actual),
+            'ks_statistic': float('nan'),
+            'ks_pvalue': float('nan'),
+        }
+
+    def check_periods(self, df: pd.DataFrame, timestamp_col='event_timestamp', freq='M') -> pd.DataFrame:
+        """
+        Run check on each period (monthly by default) of a frame.
+        Timestamps may be tz-naive or tz-aware; aware ones are grouped by their
+        wall-clock time in their own time zone.
+        Returns:
+            pd.DataFrame: check results indexed by (period, feature).
+        """
+        periods = pd.to_datetime(df[timestamp_col]).dt.tz_localize(None).dt.to_period(freq)
+        results = {str(period): self.check(batch) for period, batch in df.groupby(periods, sort=True)}
+        if not results:
+            return pd.DataFrame()
+        return pd.concat(results, names=['period', 'feature'])
+
+    def save_report(self, results: pd.DataFrame, path):
+        """
+        Write check results as a JSON report and log the drifted features.
+        NaN statistics (e.g. KS for categorical features) are written as null.
+        """
+        drifted = results.index[results['drifted']].tolist()
+        report = {
+            'psi_threshold': self.psi_threshold,
+            'js_threshold': self.js_threshold,
+            'ks_threshold': self.ks_threshold,
+            'reference_rows': self.reference.rows,
+            'drifted': [list(key) if isinstance(key, tuple) else key for key in drifted],
+            'features': json.loads(results.reset_index().to_json(orient='records')),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        if drifted:
+            logger.warning(f"⚠️ Drift detected in {len(drifted)} feature checks: {drifted}")
+        logger.info(f"📝 Saved drift report to {path}")
+        return report
+
+
+def _rate(part, total) -> float:
+    return float(part / total) if total else 0.0
+
+# Example usage:
+# from feature_store.feature_repo.definations import house_features_view
+# columns = [field.name for field in house_features_view.features]
+# reference = ReferenceProfile.from_parquet('data/house_features.parquet', columns=columns)
+# reference.save('data/drift_reference.json')
+# monitor = DriftMonitor(ReferenceProfile.load('data/drift_reference.json'))
+# results = monitor.check(new_month_df)
+# monitor.save_report(results, 'logs/drift_report.json')
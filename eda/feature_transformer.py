@@ -0,0 +1,131 @@
+import json
+import logging
+from functools import lru_cache
+import pandas as pd
+from eda.data_encoder import FrequencyEncoder
+from eda.data_preprocessor import DataPreprocessor, parse_lease_value, parse_storey_range, parse_year_month
+from utils.logger import setup_logger
+
+logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
+
+
+_split_month = lru_cache(maxsize=4096)(parse_year_month)
+
+
+_split_storey = lru_cache(maxsize=4096)(parse_storey_range)
+
+
+_parse_lease_cached = lru_cache(maxsize=4096)(parse_lease_value)
+
+
+class FeatureTransformer:
+    """
+    Fitted preprocessing + frequency encoding shared by training and serving.
+
+    fit learns the frequency maps and the output column layout from a raw
+    training frame. transform runs the vectorized batch path (DataPreprocessor
+    and FrequencyEncoder); transform_record computes the same features for one
+    raw record using plain Python and cached parsers, without pandas. The
+    fitted state round-trips through to_dict/save/load.
+
+    For a single record both paths give the same features, with one deliberate
+    difference: a malformed month makes transform raise, like DataPreprocessor,
+    while transform_record returns NaN year and month_num so one bad request
+    does not fail serving.
+    """
+    def __init__(self, target='resale_price', threshold=0.05, exclude=('source_file',)):
+        """
+        Args:
+            target (str): Target column, dropped from the features.
+            threshold (float): Frequency encoder threshold.
+            exclude (tuple): Raw columns dropped instead of encoded.
+        """
+        self.target = target
+        self.threshold = threshold
+        self.exclude = list(exclude)
+        self.encoder = FrequencyEncoder(threshold=threshold)
+        self.columns = []
+
+    def _preprocess(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.drop(columns=[c for c in self.exclude + [self.target] if c in df.columns])
+        return DataPreprocessor(df).preprocess_all()
+
+    def fit(self, df: pd.DataFrame):
+        """
+        Learn frequency maps and the feature layout from raw training data.
+        Returns:
+            FeatureTransformer: The fitted transformer.
+        """
+        processed = self._preprocess(df)
+        self.encoder = FrequencyEncoder(threshold=self.threshold).fit(processed)
+        self.columns = self.encoder.transform(processed).columns.tolist()
+        logger.info(f"🧩 Fitted feature transformer with {len(self.columns)} output columns.")
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized batch transform of raw rows into model features.
+        Returns:
+            pd.DataFrame: Features in the fitted column order.
+        """
+        return self.encoder.transform(self._preprocess(df)).reindex(columns=self.columns)
+
+    def transform_record(self, record: dict) -> dict:
+        """
+        Transform one raw record (dict) into a feature dict, without pandas.
+        Returns:
+            dict: Features keyed in the fitted column order.
+        """
+        values = {k: v for k, v in record.items() if k not in self.exclude and k != self.target}
+        if 'month' in values:
+            month = values.pop('month')
+            values['year'], values['month_num'] = _split_month(month) if isinstance(month, str) \
+                else parse_year_month(month)
+        if 'storey_range' in values:
+            storey = values.pop('storey_range')
+            storey_min, storey_max = _split_storey(storey) if isinstance(storey, str) \
+                else parse_storey_range(storey)
+            values['storey_min'] = storey_min
+            values['storey_max'] = storey_max
+            values['storey_mean'] = (storey_min + storey_max) / 2
+        if 'remaining_lease' in values:
+            lease = values.pop('remaining_lease')
+            values['remaining_lease_years'] = float(
+                _parse_lease_cached(lease) if isinstance(lease, str) else parse_lease_value(lease))
+        encoded = self.encoder.transform_record(values)
+        return {col: encoded.get(col) for col in self.columns}
+
+    def to_dict(self) -> dict:
+        """Return the fitted state as a JSON-serialisable dict."""
+        return {
+            'target': self.target,
+            'threshold': self.threshold,
+            'exclude': self.exclude,
+            'columns': self.columns,
+            'encoder': self.encoder.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild a transformer from to_dict output."""
+        transformer = cls(target=state['target'], threshold=state['threshold'], exclude=state['exclude'])
+        transformer.columns = state['columns']
+        transformer.encoder = FrequencyEncoder.from_dict(state['encoder'])
+        return transformer
+
+    def save(self, path):
+        """Write the fitted transformer to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        logger.info(f"💾 Saved feature transformer to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """Load a transformer saved with save."""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+# Example usage:
+# transformer = FeatureTransformer().fit(raw_df)
+# transformer.save('feature_store/data/feature_transformer.json')
+# features = FeatureTransformer.load('feature_store/data/feature_transformer.json').transform_record(raw_row)
@@ -0,0 +1,120 @@
+import html
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from utils.logger import setup_logger
+
+logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
+
+_figure = None
+
+
+def _get_figure(size):
+    """
+    Return this process's reusable figure, cleared and resized.
+    The figure is attached to an Agg canvas directly instead of going through
+    pyplot, so rendering is headless without switching the process's backend
+    (which would break a notebook calling render_report with max_workers=1).
+    """
+    global _figure
+    if _figure is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        _figure = Figure()
+        FigureCanvasAgg(_figure)
+    _figure.clf()
+    _figure.set_size_inches(*size)
+    return _figure
+
+
+def out_of_range_note(underflow, overflow) -> str:
+    """Title suffix reporting values that fell outside a histogram's bins, or ''."""
+    if not underflow and not overflow:
+        return ""
+    return f" ({underflow} below, {overflow} above range)"
+
+
+def render_histogram(payload: dict) -> str:
+    """
+    Render precomputed histogram counts to payload['path'].
+    Optional 'underflow'/'overflow' counts are shown in the title.
+    """
+    fig = _get_figure((6, 4))
+    ax = fig.add_subplot()
+    ax.stairs(payload['counts'], payload['edges'], fill=True)
+    ax.set_title(f"Histogram of {payload['column']}"
+                 + out_of_range_note(payload.get('underflow', 0), payload.get('overflow', 0)))
+    ax.set_xlabel(payload['column'])
+    ax.set_ylabel("Frequency")
+    fig.tight_layout()
+    fig.savefig(payload['path'])
+    return payload['path']
+
+
+def render_bar(payload: dict) -> str:
+    """Render precomputed category counts to payload['path']."""
+    fig = _get_figure((8, 4))
+    ax = fig.add_subplot()
+    positions = np.arange(len(payload['counts']))
+    ax.bar(positions, payload['counts'])
+    ax.set_xticks(positions, [str(label) for label in payload['labels']], rotation=90)
+    ax.set_title(f"Bar Chart of {payload['column']}")
+    ax.set_xlabel(payload['column'])
+    ax.set_ylabel("Count")
+    fig.tight_layout()
+    fig.savefig(payload['path'])
+    return payload['path']
+
+
+def render_heatmap(payload: dict) -> str:
+    """Render a precomputed correlation matrix to payload['path']."""
+    import seaborn as sns
+    fig = _get_figure((10, 8))
+    ax = fig.add_subplot()
+    labels = payload['labels']
+    sns.heatmap(
+        np.asarray(payload['matrix']), ax=ax, xticklabels=labels, yticklabels=labels,
+        annot=len(labels) <= 20, cmap='coolwarm', fmt=".2f",
+    )
+    ax.set_title("Correlation Heatmap of Numeric Columns")
+    fig.tight_layout()
+    fig.savefig(payload['path'])
+    return payload['path']
+
+
+def _render(task):
+    """Dispatch one (kind, payload) task inside a worker process."""
+    kind, payload = task
+    return {'hist': render_histogram, 'bar': render_bar, 'heatmap': render_heatmap}[kind](payload)
+
+
+def render_all(tasks, output_dir, max_workers=None, title="EDA Report") -> str:
+    """
+    Render (kind, payload) tasks in a process pool and write an index.html.
+    Payloads only hold precomputed counts, so workers never receive the DataFrame.
+
+    Args:
+        tasks (list): (kind, payload) tuples; kind is 'hist', 'bar' or 'heatmap'.
+        output_dir (str): Folder for the images and index.html.
+        max_workers (int, optional): Worker processes. Defaults to the CPU count.
+        title (str): Title of the index page.
+    Returns:
+        str: Path of the written index.html.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if max_workers == 1:
+        paths = [_render(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            paths = list(pool.map(_render, tasks))
+    index_path = os.path.join(output_dir, 'index.html')
+    items = "\n".join(
+        f'<figure><img src="{html.escape(os.path.basename(p))}"><figcaption>{html.escape(os.path.basename(p))}</figcaption></figure>'
+        for p in paths
+    )
+    with open(index_path, 'w', encoding='utf-8') as f:
+        f.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title></head>\n"
+                f"<body><h1>{html.escape(title)}</h1>\n{items}\n</body></html>\n")
+    logger.info(f"🖼️ Rendered {len(paths)} figures to {output_dir}")
+    return index_path
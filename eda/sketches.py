@@ -0,0 +1,542 @@
+import base64
+import json
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values) -> np.ndarray:
+    """
+    Hash values to uint64 with pandas' vectorized hashing.
+    Categorical values hash like their underlying labels, so chunks with object
+    and category dtypes produce the same hashes.
+    """
+    return pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy()
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Exact bit length of non-negative integers below 2**53."""
+    return np.frexp(values.astype('float64'))[1]
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct-count sketch.
+    Uses 2**precision one-byte registers; the relative error is about
+    1.04 / sqrt(2**precision) (1.6% with the default precision of 12).
+    """
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values):
+        """
+        Add values (any array-like); nulls are ignored.
+        Returns:
+            HyperLogLog: self, so calls can be chained.
+        """
+        values = pd.Series(values)
+        values = values[values.notna()]
+        if values.empty:
+            return self
+        hashes = hash_values(values)
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.intp)
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+        rank = (tail_bits - _bit_length(tail) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """Merge another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """Return the estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype('float64')))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self) -> dict:
+        """Return the sketch as a JSON-serialisable dict."""
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild a sketch from to_dict output."""
+        sketch = cls(precision=state['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(state['registers']), dtype=np.uint8).copy()
+        return sketch
+
+
+class CountMinSketch:
+    """
+    Mergeable frequency sketch for point queries.
+    Estimates never undercount; with the defaults the overcount is at most
+    about total/width * e with high probability.
+    """
+    # Odd 64-bit multipliers for multiply-shift hashing, one per row.
+    _MULTIPLIERS = np.array([
+        0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93,
+        0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x94D049BB133111EB, 0xBF58476D1CE4E5B9,
+    ], dtype=np.uint64)
+
+    def __init__(self, width=2048, depth=4):
+        if width & (width - 1) or not 0 < depth <= len(self._MULTIPLIERS):
+            raise ValueError("width must be a power of two and depth between 1 and 8.")
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        """Return a (depth, n) array of bucket indices for the hashed values."""
+        shift = np.uint64(64 - int(np.log2(self.width)))
+        with np.errstate(over='ignore'):
+            return ((hashes[None, :] * self._MULTIPLIERS[:self.depth, None]) >> shift).astype(np.intp)
+
+    def update_counts(self, counts: pd.Series):
+        """Add pre-aggregated counts (index = values, values = counts)."""
+        if counts.empty:
+            return self
+        columns = self._columns(hash_values(counts.index))
+        weights = counts.to_numpy(dtype='float64')
+        for row in range(self.depth):
+            self.table[row] += np.bincount(columns[row], weights=weights, minlength=self.width).astype(np.int64)
+        return self
+
+    def update(self, values):
+        """Add raw values; nulls are ignored."""
+        return self.update_counts(pd.Series(values).value_counts(dropna=True))
+
+    def estimate(self, values) -> np.ndarray:
+        """Return estimated counts for the given values."""
+        columns = self._columns(hash_values(values))
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def merge(self, other):
+        """Merge another sketch with the same shape into this one."""
+        if self.table.shape != other.table.shape:
+            raise ValueError("Cannot merge CountMinSketch objects with different shapes.")
+        self.table += other.table
+        return self
+
+    def to_dict(self) -> dict:
+        """Return the sketch as a JSON-serialisable dict."""
+        return {
+            'width': self.width,
+            'depth': self.depth,
+            'table': base64.b64encode(self.table.tobytes()).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild a sketch from to_dict output."""
+        sketch = cls(width=state['width'], depth=state['depth'])
+        table = np.frombuffer(base64.b64decode(state['table']), dtype=np.int64)
+        sketch.table = table.reshape(sketch.depth, sketch.width).copy()
+        return sketch
+
+
+class HeavyHitters:
+    """
+    Misra-Gries summary keeping at most `capacity` candidate heavy hitters.
+    Every value occurring more than total/(capacity + 1) times is guaranteed to
+    be a candidate. Summaries merge by adding counters and trimming again.
+    """
+    def __init__(self, capacity=50):
+        self.capacity = capacity
+        self.counters = pd.Series(dtype='int64')
+
+    def _trim(self, counters: pd.Series) -> pd.Series:
+        """Keep at most `capacity` counters, subtracting the first dropped count."""
+        if len(counters) <= self.capacity:
+            return counters
+        counters = counters.sort_values(ascending=False, kind='stable')
+        cut = counters.iloc[self.capacity]
+        counters = counters.iloc[:self.capacity] - cut
+        return counters[counters > 0]
+
+    def update_counts(self, counts: pd.Series):
+        """Add pre-aggregated counts (index = values, values = counts)."""
+        combined = self.counters.add(counts.astype('int64'), fill_value=0).astype('int64')
+        self.counters = self._trim(combined)
+        return self
+
+    def update(self, values):
+        """Add raw values; nulls are ignored."""
+        return self.update_counts(pd.Series(values).value_counts(dropna=True))
+
+    def merge(self, other):
+        """Merge another summary into this one."""
+        return self.update_counts(other.counters)
+
+    def candidates(self) -> list:
+        """Return the candidate heavy hitters, most frequent first."""
+        return self.counters.sort_values(ascending=False, kind='stable').index.tolist()
+
+    def to_dict(self) -> dict:
+        """Return the summary as a JSON-serialisable dict."""
+        return {
+            'capacity': self.capacity,
+            'values': self.counters.index.tolist(),
+            'counts': self.counters.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild a summary from to_dict output."""
+        summary = cls(capacity=state['capacity'])
+        summary.counters = pd.Series(state['counts'], index=state['values'], dtype='int64')
+        return summary
+
+
+class FixedHistogram:
+    """
+    Mergeable histogram over fixed, equal-width bins.
+    Values outside [low, high] are counted in underflow/overflow instead of
+    being dropped, so the bins stay comparable across chunks and days.
+    """
+    def __init__(self, low, high, bins=30):
+        low, high = float(low), float(high)
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.nulls = 0
+
+    def update(self, values):
+        """Add values; nulls are counted separately."""
+        values = np.asarray(values, dtype='float64')
+        missing = np.isnan(values)
+        self.nulls += int(missing.sum())
+        values = values[~missing]
+        self.underflow += int((values < self.edges[0]).sum())
+        self.overflow += int((values > self.edges[-1]).sum())
+        self.counts += np.histogram(values, bins=self.edges)[0]
+        return self
+
+    def merge(self, other):
+        """Merge another histogram with identical edges into this one."""
+        if not isinstance(other, FixedHistogram) or not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge FixedHistogram objects with different edges; "
+                             "build both with the same explicit range.")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self.nulls += other.nulls
+        return self
+
+    def total(self) -> int:
+        """Return the number of non-null values seen."""
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def to_dict(self) -> dict:
+        """Return the histogram as a JSON-serialisable dict."""
+        return {
+            'edges': self.edges.tolist(),
+            'counts': self.counts.tolist(),
+            'underflow': self.underflow,
+            'overflow': self.overflow,
+            'nulls': self.nulls,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild a histogram from to_dict output."""
+        hist = cls(0, 1, bins=len(state['counts']))
+        hist.edges = np.asarray(state['edges'], dtype='float64')
+        hist.counts = np.asarray(state['counts'], dtype=np.int64)
+        hist.underflow = state['underflow']
+        hist.overflow = state['overflow']
+        hist.nulls = state['nulls']
+        return hist
+
+
+class AdaptiveHistogram:
+    """
+    Mergeable histogram whose range follows the data.
+    Bins have a power-of-two width on a grid anchored at zero. When values fall
+    outside the current bins, or a merged histogram covers a different range,
+    the width is doubled (adjacent bins added together) until everything fits,
+    so rebinning is exact and histograms built independently always merge.
+    The range can end up to twice as wide as the data, leaving some bins empty.
+    Infinite values are counted in underflow/overflow.
+    """
+    def __init__(self, bins=30):
+        self.bins = bins
+        self.exponent = None  # bin width is 2**exponent; None until the first value
+        self.offset = 0       # grid index of the first bin
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.nulls = 0
+
+    @property
+    def edges(self) -> np.ndarray:
+        if self.exponent is None:
+            return np.linspace(0.0, 1.0, self.bins + 1)
+        return np.ldexp(self.offset + np.arange(self.bins + 1, dtype='float64'), self.exponent)
+
+    def _span(self):
+        """(exponent, first, last) grid indices of the occupied bins, or None if empty."""
+        occupied = np.flatnonzero(self.counts)
+        if not occupied.size:
+            return None
+        return self.exponent, self.offset + int(occupied[0]), self.offset + int(occupied[-1])
+
+    def _cover(self, spans, low=None, high=None):
+        """Smallest (exponent, offset) whose bins hold every span and [low, high]."""
+        exponents = [span[0] for span in spans]
+        if low is not None:
+            width = (high - low) / self.bins
+            scale = width if width > 0 else abs(low) / 2**20 or 2.0**-20
+            exponents.append(int(np.floor(np.log2(scale))))
+        exponent = max(exponents)
+        while True:
+            lows = [first >> (exponent - e) for e, first, _ in spans]
+            highs = [last >> (exponent - e) for e, _, last in spans]
+            if low is not None:
+                lows.append(int(np.floor(np.ldexp(low, -exponent))))
+                highs.append(int(np.floor(np.ldexp(high, -exponent))))
+            if max(highs) - min(lows) < self.bins:
+                return exponent, min(lows)
+            exponent += 1
+
+    def _counts_on(self, exponent, offset) -> np.ndarray:
+        """This histogram's counts re-binned onto a coarser (or equal) grid."""
+        counts = np.zeros(self.bins, dtype=np.int64)
+        occupied = np.flatnonzero(self.counts)
+        if occupied.size:
+            index = (self.offset + occupied.astype(np.int64)) >> (exponent - self.exponent)
+            np.add.at(counts, index - offset, self.counts[occupied])
+        return counts
+
+    def update(self, values):
+        """Add values; nulls are counted separately."""
+        values = np.asarray(values, dtype='float64')
+        missing = np.isnan(values)
+        self.nulls += int(missing.sum())
+        values = values[~missing]
+        self.underflow += int(np.isneginf(values).sum())
+        self.overflow += int(np.isposinf(values).sum())
+        values = values[np.isfinite(values)]
+        if not values.size:
+            return self
+        span = self._span()
+        exponent, offset = self._cover([span] if span else [], float(values.min()), float(values.max()))
+        self.counts = self._counts_on(exponent, offset) if span else self.counts
+        self.exponent, self.offset = exponent, offset
+        index = np.floor(np.ldexp(values, -exponent)).astype(np.int64) - offset
+        self.counts += np.bincount(index, minlength=self.bins)
+        return self
+
+    def merge(self, other):
+        """Merge another adaptive histogram with the same number of bins into this one."""
+        if not isinstance(other, AdaptiveHistogram) or other.bins != self.bins:
+            raise ValueError("Can only merge AdaptiveHistogram objects with the same number of bins.")
+        spans = [span for span in (self._span(), other._span()) if span]
+        if spans:
+            exponent, offset = self._cover(spans)
+            counts = self._counts_on(exponent, offset) if self._span() else np.zeros(self.bins, dtype=np.int64)
+            if other._span():
+                counts += other._counts_on(exponent, offset)
+            self.counts, self.exponent, self.offset = counts, exponent, offset
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self.nulls += other.nulls
+        return self
+
+    def total(self) -> int:
+        """Return the number of non-null values seen."""
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def to_dict(self) -> dict:
+        """Return the histogram as a JSON-serialisable dict."""
+        return {
+            'kind': 'adaptive',
+            'exponent': self.exponent,
+            'offset': self.offset,
+            'counts': self.counts.tolist(),
+            'underflow': self.underflow,
+            'overflow': self.overflow,
+            'nulls': self.nulls,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild a histogram from to_dict output."""
+        hist = cls(bins=len(state['counts']))
+        hist.exponent = state['exponent']
+        hist.offset = state['offset']
+        hist.counts = np.asarray(state['counts'], dtype=np.int64)
+        hist.underflow = state['underflow']
+        hist.overflow = state['overflow']
+        hist.nulls = state['nulls']
+        return hist
+
+
+def histogram_from_dict(state: dict):
+    """Rebuild a FixedHistogram or AdaptiveHistogram from its to_dict output."""
+    if state.get('kind') == 'adaptive':
+        return AdaptiveHistogram.from_dict(state)
+    return FixedHistogram.from_dict(state)
+
+
+class CategorySketch:
+    """Distinct count, frequency and heavy-hitter sketches for one categorical column."""
+    def __init__(self, capacity=50, width=2048, depth=4, precision=12):
+        self.distinct = HyperLogLog(precision)
+        self.frequencies = CountMinSketch(width, depth)
+        self.heavy_hitters = HeavyHitters(capacity)
+        self.nulls = 0
+
+    def update(self, values):
+        """Add a chunk of values; they are aggregated once and fed to every sketch."""
+        values = pd.Series(values)
+        counts = values.value_counts(dropna=True)
+        counts = counts[counts > 0]
+        self.nulls += int(values.isna().sum())
+        self.distinct.update(counts.index)
+        self.frequencies.update_counts(counts)
+        self.heavy_hitters.update_counts(counts)
+        return self
+
+    def merge(self, other):
+        """Merge another category sketch into this one."""
+        self.distinct.merge(other.distinct)
+        self.frequencies.merge(other.frequencies)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.nulls += other.nulls
+        return self
+
+    def top_k(self, k=10) -> pd.Series:
+        """Return the k most frequent values with their estimated counts."""
+        candidates = self.heavy_hitters.candidates()
+        if not candidates:
+            return pd.Series(dtype='int64')
+        estimates = pd.Series(self.frequencies.estimate(candidates), index=candidates)
+        return estimates.sort_values(ascending=False, kind='stable').head(k)
+
+    def to_dict(self) -> dict:
+        """Return the sketch as a JSON-serialisable dict."""
+        return {
+            'distinct': self.distinct.to_dict(),
+            'frequencies': self.frequencies.to_dict(),
+            'heavy_hitters': self.heavy_hitters.to_dict(),
+            'nulls': self.nulls,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild a sketch from to_dict output."""
+        sketch = cls()
+        sketch.distinct = HyperLogLog.from_dict(state['distinct'])
+        sketch.frequencies = CountMinSketch.from_dict(state['frequencies'])
+        sketch.heavy_hitters = HeavyHitters.from_dict(state['heavy_hitters'])
+        sketch.nulls = state['nulls']
+        return sketch
+
+
+class DataSketches:
+    """
+    Collection of per-column sketches for a dataset: CategorySketch for
+    object/category columns and a histogram for numeric ones. Columns with an
+    explicit range get a FixedHistogram (values outside it are counted in
+    underflow/overflow, and collections only merge if their ranges match);
+    all other columns get an AdaptiveHistogram, which widens as later chunks
+    arrive and merges with any other collection.
+    """
+    def __init__(self, bins=30, capacity=50, ranges=None):
+        """
+        Args:
+            bins (int): Number of histogram bins per numeric column.
+            capacity (int): Heavy-hitter candidates kept per categorical column.
+            ranges (dict, optional): {column: (low, high)} fixed histogram ranges.
+                Columns without a range get an AdaptiveHistogram.
+        """
+        self.bins = bins
+        self.capacity = capacity
+        self.ranges = dict(ranges or {})
+        self.categorical = {}
+        self.numeric = {}
+
+    def update(self, df: pd.DataFrame):
+        """Add a chunk of rows to the sketches."""
+        for col in df.select_dtypes(include=['object', 'category']).columns:
+            self.categorical.setdefault(col, CategorySketch(capacity=self.capacity)).update(df[col])
+        for col in df.select_dtypes(include='number').columns:
+            if col not in self.numeric:
+                if col in self.ranges:
+                    self.numeric[col] = FixedHistogram(*self.ranges[col], bins=self.bins)
+                else:
+                    self.numeric[col] = AdaptiveHistogram(bins=self.bins)
+            self.numeric[col].update(df[col])
+        return self
+
+    def merge(self, other):
+        """
+        Merge another collection into this one.
+        Raises:
+            ValueError: If a column has fixed ranges that differ between the two.
+        """
+        for col, sketch in other.categorical.items():
+            if col in self.categorical:
+                self.categorical[col].merge(sketch)
+            else:
+                self.categorical[col] = sketch
+        for col, hist in other.numeric.items():
+            if col in self.numeric:
+                self.numeric[col].merge(hist)
+            else:
+                self.numeric[col] = hist
+        return self
+
+    @classmethod
+    def from_chunks(cls, chunks, **kwargs):
+        """Build sketches from an iterable of DataFrames."""
+        sketches = cls(**kwargs)
+        for chunk in chunks:
+            sketches.update(chunk)
+        return sketches
+
+    def to_dict(self) -> dict:
+        """Return all sketches as a JSON-serialisable dict."""
+        return {
+            'bins': self.bins,
+            'capacity': self.capacity,
+            'categorical': {col: sk.to_dict() for col, sk in self.categorical.items()},
+            'numeric': {col: hist.to_dict() for col, hist in self.numeric.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        """Rebuild a collection from to_dict output."""
+        sketches = cls(bins=state['bins'], capacity=state['capacity'])
+        sketches.categorical = {col: CategorySketch.from_dict(sk) for col, sk in state['categorical'].items()}
+        sketches.numeric = {col: histogram_from_dict(h) for col, h in state['numeric'].items()}
+        for col, hist in sketches.numeric.items():
+            if isinstance(hist, FixedHistogram):
+                sketches.ranges[col] = (hist.edges[0], hist.edges[-1])
+        return sketches
+
+    def save(self, path):
+        """Write all sketches to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        """Load sketches saved with save."""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
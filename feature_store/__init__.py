@@ -0,0 +1,28 @@
+"""
+Feature store access. Classes are loaded on first attribute access (PEP 562),
+so importing the package does not import Feast, pyarrow.dataset or psycopg.
+"""
+import importlib
+
+_LAZY_ATTRS = {
+    'FeastFeatureStore': 'feature_store.feature_store',
+    'OnlineFeatureBatcher': 'feature_store.async_retrieval',
+    'MaterializationScheduler': 'feature_store.materialization',
+    'OnlineFeatureCache': 'feature_store.online_cache',
+    'PostgresBulkWriter': 'feature_store.pg_writer',
+    'PointInTimeJoiner': 'feature_store.point_in_time',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
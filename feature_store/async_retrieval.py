@@ -0,0 +1,117 @@
+import asyncio
+import functools
+import numpy as np
+import pandas as pd
+
+
+def format_columns(columns: dict, output='dict'):
+    """
+    Convert {column: list} results to the requested output format.
+    Args:
+        columns (dict): Column name -> list of values.
+        output (str): 'dict' (lists), 'numpy' (arrays) or 'pandas'.
+    """
+    if output == 'dict':
+        return columns
+    if output == 'numpy':
+        return {name: np.asarray(values) for name, values in columns.items()}
+    if output == 'pandas':
+        return pd.DataFrame(columns)
+    raise ValueError(f"Unsupported output format: {output}")
+
+
+class OnlineFeatureBatcher:
+    """
+    Coalesce concurrent online feature lookups into batched calls.
+
+    Requests for the same feature list that arrive within `window` seconds (or
+    until `max_batch_size` entity rows are queued) are merged, de-duplicated by
+    entity key, fetched with one call to `fetch` in a worker thread, and the
+    results are fanned back out to each awaiting caller.
+    """
+    def __init__(self, fetch, window=0.002, max_batch_size=512, executor=None):
+        """
+        Args:
+            fetch (callable): Blocking function (entity_rows, features) -> {column: list},
+                e.g. FeastFeatureStore.get_online_features_dict.
+            window (float): Seconds to wait for more requests before fetching.
+            max_batch_size (int): Flush as soon as this many entity rows are queued.
+            executor (Executor, optional): Executor for fetch; defaults to the loop's.
+        """
+        self.fetch = fetch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self._pending = {}
+        self._timers = {}
+        self._tasks = set()
+        self.batches = 0
+        self.requests = 0
+        self.coalesced = 0  # requests that joined a batch another request had opened
+
+    async def get(self, entity_rows, features, output='dict'):
+        """
+        Queue a lookup and wait for its share of the batched result.
+        Returns:
+            dict or pd.DataFrame: Columns for entity_rows, in the requested format.
+        """
+        loop = asyncio.get_running_loop()
+        key = tuple(features)
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        if batch:
+            self.coalesced += 1
+        batch.append((list(entity_rows), future))
+        self.requests += 1
+        if sum(len(rows) for rows, _ in batch) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        return format_columns(await future, output)
+
+    def _flush(self, key):
+        """Start fetching the pending batch for one feature list."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(list(key), batch))
+        self._tasks.add(task)
+        task.add_done_callback(functools.partial(self._finish, batch))
+
+    def _finish(self, batch, task):
+        """
+        Forget a finished fetch task. If it ended without answering its callers
+        (it was cancelled, possibly before it started), cancel them rather than
+        leave them waiting forever.
+        """
+        self._tasks.discard(task)
+        for _, future in batch:
+            if not future.done():
+                future.cancel()
+
+    async def _run(self, features, batch):
+        """Fetch one coalesced batch and resolve the waiting futures."""
+        positions = {}
+        unique_rows = []
+        for rows, _ in batch:
+            for row in rows:
+                entity_key = tuple(sorted(row.items()))
+                if entity_key not in positions:
+                    positions[entity_key] = len(unique_rows)
+                    unique_rows.append(row)
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        try:
+            columns = await loop.run_in_executor(self.executor, self.fetch, unique_rows, features)
+            for rows, future in batch:
+                if future.done():
+                    continue
+                index = [positions[tuple(sorted(row.items()))] for row in rows]
+                future.set_result({name: [values[i] for i in index] for name, values in columns.items()})
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
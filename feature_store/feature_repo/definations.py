@@ -4,7 +4,8 @@ from feast.types import Float32, Int64, String
 from feast.infra.offline_stores.contrib.postgres_offline_store.postgres_source import PostgreSQLSource
 import os
 
-# Define the path to your feature data (for FileSource)
+# Define the path to your feature data (for FileSource): a Parquet file, or the folder of
+# per-source-file parts written by eda.data_pipeline.IncrementalPipeline
 house_features_path = os.path.abspath(os.path.join("..", "data", "house_features.parquet"))
 house_target_path = os.path.abspath(os.path.join("..", "data", "house_target.parquet"))
 
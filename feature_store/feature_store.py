@@ -1,20 +1,38 @@
-from feast import FeatureStore
-from feast.infra.offline_stores.file_source import SavedDatasetFileStorage
 import pandas as pd
 from datetime import datetime, timedelta
+from feature_store.async_retrieval import OnlineFeatureBatcher
+from feature_store.materialization import MaterializationScheduler
+from feature_store.online_cache import OnlineFeatureCache
+from feature_store.point_in_time import PointInTimeJoiner, write_partitioned_features
+from utils.instrumentation import instrument
 
 
 class FeastFeatureStore:
-    def __init__(self, path):
+    def __init__(self, path, online_cache_size=0, max_cache_ttl=None):
         """
         Initialize the Feast Feature Store.
 
         Args:
             path (str): Path to the feature_repo directory containing feature_store.yaml.
+            online_cache_size (int): Number of feature values kept in the in-process
+                online cache. 0 (default) disables the cache.
+            max_cache_ttl (timedelta, optional): Upper bound on the cache TTL, which
+                otherwise comes from each FeatureView.ttl.
         """
+        # Feast is imported here rather than at module load: it pulls in a large
+        # dependency tree that importers of this module may never use.
+        from feast import FeatureStore
         self.store = FeatureStore(repo_path=path)
         self.retrievalJob = None
+        self.online_cache = None
+        self.batcher = None
+        if online_cache_size:
+            view_ttls = {view.name: view.ttl for view in self.store.list_feature_views()}
+            self.online_cache = OnlineFeatureCache(
+                max_entries=online_cache_size, view_ttls=view_ttls, max_ttl=max_cache_ttl
+            )
 
+    @instrument
     def get_entity_dataframe(self, path) -> pd.DataFrame:
         """
         Read a Parquet file as an entity DataFrame.
@@ -28,6 +46,7 @@ class FeastFeatureStore:
         entity_df = pd.read_parquet(path=path)
         return entity_df
 
+    @instrument
     def get_historical_features(self, entity_df: pd.DataFrame, features) -> pd.DataFrame:
         """
         Fetch historical features for a given entity DataFrame.
@@ -45,6 +64,52 @@ class FeastFeatureStore:
         )
         return self.retrievalJob.to_df()
     
+    @instrument
+    def write_feature_partitions(self, df: pd.DataFrame, dataset_path):
+        """
+        Append features to a Parquet dataset partitioned by event year/month,
+        for use with get_historical_features_local.
+
+        Args:
+            df (pd.DataFrame): Features with 'house_id' and 'event_timestamp' columns.
+            dataset_path (str): Dataset folder.
+        """
+        write_partitioned_features(df, dataset_path)
+
+    def _view_ttl(self, features):
+        """Return the TTL of the feature view referenced by the first feature."""
+        ttl = self.store.get_feature_view(features[0].split(':', 1)[0]).ttl
+        return ttl or None
+
+    @instrument
+    def get_historical_features_local(self, entity_df: pd.DataFrame, features, dataset_path, ttl=None) -> pd.DataFrame:
+        """
+        Point-in-time join against a local partitioned feature dataset, without
+        going through Feast's offline store. Only the partitions covering the
+        entity timestamp range are read.
+
+        Args:
+            entity_df (pd.DataFrame): DataFrame containing entity columns and event_timestamp.
+            features (List[str]): List of feature references (e.g., ["house_features:storey_min"]).
+            dataset_path (str): Dataset folder written by write_feature_partitions.
+            ttl (timedelta, optional): Maximum feature age. Defaults to the feature view's ttl.
+
+        Returns:
+            pd.DataFrame: entity_df with the feature columns attached.
+        """
+        ttl = ttl if ttl is not None else self._view_ttl(features)
+        return PointInTimeJoiner(dataset_path).join(entity_df, features, ttl=ttl)
+
+    def iter_historical_features_local(self, entity_df: pd.DataFrame, features, dataset_path, ttl=None,
+                                       batch_size=100_000):
+        """
+        Same as get_historical_features_local, streamed as pyarrow RecordBatches
+        in event timestamp order.
+        """
+        ttl = ttl if ttl is not None else self._view_ttl(features)
+        return PointInTimeJoiner(dataset_path).iter_batches(entity_df, features, ttl=ttl, batch_size=batch_size)
+
+    @instrument
     def save_dataset(self, file_name, path):
         """
         Save the last retrieved historical features as a SavedDataset.
@@ -53,6 +118,7 @@ class FeastFeatureStore:
             file_name (str): Name for the saved dataset.
             path (str): Path where the dataset will be stored.
         """
+        from feast.infra.offline_stores.file_source import SavedDatasetFileStorage
         self.store.create_saved_dataset(
             from_=self.retrievalJob,
             name=file_name,
@@ -60,6 +126,7 @@ class FeastFeatureStore:
         )
         print(str.format("File {0} saved successfully", file_name))
 
+    @instrument
     def materialize(self, end_date, start_date=None, increment=False):
         """
         Materialize features from offline to online store.
@@ -76,7 +143,44 @@ class FeastFeatureStore:
                 start_date=start_date)
         else:
             self.store.materialize_incremental(end_date=end_date)
+        if self.online_cache is not None:
+            self.online_cache.invalidate()
+
+    @instrument
+    def materialize_windows(self, start_date, end_date, window=timedelta(days=30), checkpoint_path=None,
+                            feature_views=None, max_workers=None):
+        """
+        Materialize features window by window, concurrently across feature views,
+        with a checkpoint so a failed backfill resumes where it stopped.
+
+        Args:
+            start_date (datetime): Start date for materialization.
+            end_date (datetime): End date for materialization.
+            window (timedelta): Size of each materialization window.
+            checkpoint_path (str, optional): JSON file recording completed windows.
+            feature_views (List[str], optional): Views to materialize. Defaults to all online views.
+            max_workers (int, optional): Views materialized at once.
+
+        Returns:
+            list: Per-window reports with seconds, rows and rows_per_sec.
+        """
+        scheduler = MaterializationScheduler(
+            self.store, checkpoint_path=checkpoint_path, window=window, max_workers=max_workers,
+            progress=self._print_window_report,
+        )
+        try:
+            return scheduler.run(start_date, end_date, feature_views=feature_views)
+        finally:
+            if self.online_cache is not None:
+                self.online_cache.invalidate()
 
+    @staticmethod
+    def _print_window_report(report):
+        """Print the progress line for one materialized window."""
+        print(str.format("Materialized {0} {1} -> {2} in {3}s ({4} rows/s)", report['feature_view'],
+                         report['start_date'], report['end_date'], report['seconds'], report['rows_per_sec']))
+
+    @instrument
     def get_online_features(self, entity_rows, features) -> pd.DataFrame:
         """
         Fetch online features for given entity rows.
@@ -88,8 +192,112 @@ class FeastFeatureStore:
         Returns:
             pd.DataFrame: DataFrame with online feature values.
         """
+        if self.online_cache is not None:
+            return pd.DataFrame(self._get_cached_online_features(entity_rows, features))
         retrievalJob = self.store.get_online_features(
             entity_rows=entity_rows,
             features=features
         )
-        return retrievalJob.to_df()
\ No newline at end of file
+        return retrievalJob.to_df()
+
+    @instrument
+    def get_online_features_dict(self, entity_rows, features) -> dict:
+        """
+        Fetch online features as {column: list of values}, skipping pandas.
+
+        Args:
+            entity_rows (List[Dict]): List of dicts with entity keys and values.
+            features (List[str]): List of feature references (e.g., ["house_features:storey_min"]).
+
+        Returns:
+            dict: Entity key and feature columns, in entity_rows order.
+        """
+        if self.online_cache is not None:
+            return self._get_cached_online_features(entity_rows, features)
+        return self.store.get_online_features(
+            entity_rows=entity_rows,
+            features=features
+        ).to_dict()
+
+    @instrument
+    async def get_online_features_async(self, entity_rows, features, output='dict'):
+        """
+        Fetch online features from asyncio code.
+        Concurrent calls within a short window are coalesced into one batched
+        Feast call by an OnlineFeatureBatcher (see feature_store/async_retrieval.py).
+
+        Args:
+            entity_rows (List[Dict]): List of dicts with entity keys and values.
+            features (List[str]): List of feature references.
+            output (str): 'dict' (lists), 'numpy' (arrays) or 'pandas'.
+
+        Returns:
+            dict or pd.DataFrame: Online feature values in the requested format.
+        """
+        if self.batcher is None:
+            self.batcher = OnlineFeatureBatcher(self.get_online_features_dict)
+        return await self.batcher.get(entity_rows, features, output=output)
+
+    def _get_cached_online_features(self, entity_rows, features) -> dict:
+        """
+        Serve online features through the in-process cache.
+        Only entity rows with at least one missing or expired feature value are
+        fetched from Feast, in a single call; the columns match to_dict(). Rows
+        another caller is already fetching are waited for instead of fetched again.
+        Like Feast without full_feature_names, columns are keyed by feature name,
+        so the same name from two feature views is rejected.
+        """
+        cache = self.online_cache
+        names = [ref.split(':', 1)[-1] for ref in features]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Feature names requested from more than one feature view: {duplicates}")
+        rows = [None] * len(entity_rows)
+        pending, waited = list(range(len(entity_rows))), False
+        while pending:
+            claimed, waiting = [], []
+            for i in pending:
+                key = cache.entity_key(entity_rows[i])
+                state, result = cache.claim(key, features, waited=waited)
+                if state == 'hit':
+                    rows[i] = result
+                elif state == 'wait':
+                    waiting.append((i, result))
+                else:
+                    claimed.append((i, key, result))
+            if claimed:
+                self._fetch_claimed(entity_rows, features, names, claimed, rows)
+            for _, event in waiting:
+                event.wait()
+            pending, waited = [i for i, _ in waiting], True
+
+        columns = {}
+        for entity_row in entity_rows:
+            for key in entity_row:
+                columns.setdefault(key, [])
+        for key in columns:
+            columns[key] = [entity_row.get(key) for entity_row in entity_rows]
+        for j, name in enumerate(names):
+            columns[name] = [values[j] for values in rows]
+        return columns
+
+    def _fetch_claimed(self, entity_rows, features, names, claimed, rows):
+        """Fetch the rows claimed from the cache in one Feast call and fill the cache."""
+        cache = self.online_cache
+        filled = 0
+        try:
+            fetched = self.store.get_online_features(
+                entity_rows=[entity_rows[i] for i, _, _ in claimed],
+                features=features
+            ).to_dict()
+            for pos, (i, key, generation) in enumerate(claimed):
+                rows[i] = [fetched[name][pos] for name in names]
+                cache.fill(key, features, rows[i], generation)
+                filled += 1
+        finally:
+            for _, key, _ in claimed[filled:]:
+                cache.release(key, features)
+
+    def cache_stats(self) -> dict:
+        """Return hit/miss metrics of the online cache, or None if it is disabled."""
+        return self.online_cache.stats() if self.online_cache is not None else None
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import pandas as pd
+from utils.logger import setup_logger
+
+logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
+
+
+def split_windows(start_date, end_date, window: timedelta) -> list:
+    """Split [start_date, end_date) into consecutive windows of at most `window`."""
+    windows = []
+    current = start_date
+    while current < end_date:
+        upper = min(current + window, end_date)
+        windows.append((current, upper))
+        current = upper
+    return windows
+
+
+def _utc_scalar(value, arrow_type):
+    """
+    A window bound as an Arrow scalar of the timestamp column's type.
+    Naive bounds and naive columns are both taken as UTC, like Feast does.
+    """
+    import pyarrow as pa
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+    if arrow_type.tz is None:
+        ts = ts.tz_localize(None)
+    return pa.scalar(ts, type=arrow_type)
+
+
+def count_file_source_rows(view, start_date, end_date):
+    """
+    Count the offline rows a window covers for FileSource-backed views.
+    The window filter is pushed into a pyarrow dataset scan, so only the
+    timestamp column of row groups that can match is read. Returns None for
+    other sources.
+    """
+    import pyarrow.dataset as ds
+    source = view.batch_source
+    path = getattr(source, 'path', None)
+    if not path or not str(path).endswith('.parquet'):
+        return None
+    column = source.timestamp_field
+    dataset = ds.dataset(path, format='parquet')
+    arrow_type = dataset.schema.field(column).type
+    field = ds.field(column)
+    window = (field >= _utc_scalar(start_date, arrow_type)) & (field < _utc_scalar(end_date, arrow_type))
+    return dataset.count_rows(filter=window)
+
+
+class MaterializationScheduler:
+    """
+    Materialize a date range window by window with checkpoints.
+
+    Feature views are materialized concurrently, but the windows of one view run
+    in time order so newer values are never overwritten by an older window.
+    Every completed (view, window) is written to a JSON checkpoint, so rerunning
+    the same range after a failure only repeats the windows that did not finish.
+    """
+    def __init__(self, store, checkpoint_path=None, window=timedelta(days=30), max_workers=None,
+                 row_counter=count_file_source_rows, progress=None):
+        """
+        Args:
+            store (feast.FeatureStore): Feature store to materialize.
+            checkpoint_path (str, optional): JSON file recording completed windows.
+            window (timedelta): Size of each materialization window.
+            max_workers (int, optional): Views materialized at once. Defaults to one per view.
+            row_counter (callable, optional): (view, start, end) -> rows or None, used
+                for the rows/sec report. It runs after the window is checkpointed and
+                a failure only leaves 'rows' empty.
+            progress (callable, optional): Called with each window report as it completes.
+        """
+        self.store = store
+        self.checkpoint_path = checkpoint_path
+        self.window = window
+        self.max_workers = max_workers
+        self.row_counter = row_counter
+        self.progress = progress
+        self._lock = threading.Lock()
+        self.completed = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> dict:
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                return json.load(f).get('completed', {})
+        return {}
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'completed': self.completed}, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @staticmethod
+    def window_key(view_name, start, end) -> str:
+        return f"{view_name}|{start.isoformat()}|{end.isoformat()}"
+
+    def _count_rows(self, view, start, end):
+        """Rows covered by a window, or None if there is no counter or it failed."""
+        if not self.row_counter:
+            return None
+        try:
+            return self.row_counter(view, start, end)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not count rows of {view.name} for {start} - {end}: {e}")
+            return None
+
+    def _run_view(self, view, windows) -> list:
+        """Materialize one view's windows in order, stopping at the first failure."""
+        reports = []
+        for start, end in windows:
+            key = self.window_key(view.name, start, end)
+            if key in self.completed:
+                continue
+            began = time.perf_counter()
+            self.store.materialize(start_date=start, end_date=end, feature_views=[view.name])
+            seconds = time.perf_counter() - began
+            report = {
+                'feature_view': view.name,
+                'start_date': start.isoformat(),
+                'end_date': end.isoformat(),
+                'seconds': round(seconds, 3),
+                'rows': None,
+                'rows_per_sec': None,
+            }
+            # Checkpoint first: the window is done even if counting its rows fails.
+            with self._lock:
+                self.completed[key] = report
+                self._save_checkpoint()
+            rows = self._count_rows(view, start, end)
+            if rows is not None:
+                with self._lock:
+                    report['rows'] = rows
+                    report['rows_per_sec'] = round(rows / seconds, 1) if seconds > 0 else None
+                    self._save_checkpoint()
+            if self.progress:
+                self.progress(report)
+            reports.append(report)
+        return reports
+
+    def run(self, start_date, end_date, feature_views=None) -> list:
+        """
+        Materialize [start_date, end_date) for the given (default: all online) views.
+        Args:
+            start_date (datetime): Start of the range.
+            end_date (datetime): End of the range.
+            feature_views (list, optional): Feature view names.
+        Returns:
+            list: Report dicts for the windows completed in this run.
+        Raises:
+            RuntimeError: If any view failed; completed windows stay checkpointed.
+        """
+        views = [v for v in self.store.list_feature_views() if v.online]
+        if feature_views is not None:
+            views = [v for v in views if v.name in set(feature_views)]
+        windows = split_windows(start_date, end_date, self.window)
+        workers = self.max_workers or max(len(views), 1)
+        reports, errors = [], {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._run_view, view, windows): view.name for view in views}
+            for future, name in futures.items():
+                try:
+                    reports.extend(future.result())
+                except Exception as e:
+                    errors[name] = e
+        if errors:
+            raise RuntimeError(f"Materialization failed for {sorted(errors)}: {errors}")
+        return reports
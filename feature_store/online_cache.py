@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+_ABSENT = object()
+
+
+class OnlineFeatureCache:
+    """
+    Bounded, thread-safe LRU cache for online feature values.
+
+    Entries are keyed on (entity key, feature reference), e.g.
+    ((('house_id', 42),), 'house_features:storey_min'), and expire after the
+    TTL of their feature view. Hit/miss/eviction counters are exposed by stats().
+
+    claim()/fill() let concurrent callers share one fetch per entity and feature
+    list: the first caller fetches, the others wait and are counted as coalesced
+    rather than as misses. Every invalidate() bumps a generation counter, and
+    values fetched under an older generation are not stored, so a fetch that
+    was in flight during an invalidation cannot write stale values back.
+    """
+    def __init__(self, max_entries=100_000, view_ttls=None, default_ttl=None, max_ttl=None, clock=time.monotonic):
+        """
+        Args:
+            max_entries (int): Maximum number of cached feature values.
+            view_ttls (dict, optional): {feature_view_name: timedelta or seconds}.
+            default_ttl (timedelta or float, optional): TTL for views not in view_ttls.
+                None means entries only leave through eviction or invalidation.
+            max_ttl (timedelta or float, optional): Upper bound applied to every TTL.
+            clock (callable): Time source in seconds, replaceable for tests.
+        """
+        self.max_entries = max_entries
+        self.view_ttls = {view: self._seconds(ttl) for view, ttl in (view_ttls or {}).items()}
+        self.default_ttl = self._seconds(default_ttl)
+        self.max_ttl = self._seconds(max_ttl)
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale_fills = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _seconds(ttl):
+        """Normalise a TTL to seconds; None and zero mean no expiry (as in Feast)."""
+        if ttl is None:
+            return None
+        if isinstance(ttl, timedelta):
+            ttl = ttl.total_seconds()
+        return ttl or None
+
+    @staticmethod
+    def entity_key(entity_row: dict) -> tuple:
+        """Return a hashable, order-independent key for an entity row."""
+        return tuple(sorted(entity_row.items()))
+
+    def ttl_for(self, feature_ref: str):
+        """Return the TTL in seconds for a 'view:feature' reference."""
+        ttl = self.view_ttls.get(feature_ref.split(':', 1)[0], self.default_ttl)
+        if self.max_ttl is not None:
+            ttl = self.max_ttl if ttl is None else min(ttl, self.max_ttl)
+        return ttl
+
+    def _lookup(self, key):
+        """Return a live entry's value or _ABSENT, dropping it if expired. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _ABSENT
+        value, expires_at = entry
+        if expires_at is None or expires_at > self.clock():
+            self._entries.move_to_end(key)
+            return value
+        del self._entries[key]
+        self.expirations += 1
+        return _ABSENT
+
+    def _store(self, key, value):
+        """Insert a value and evict down to max_entries. Caller holds the lock."""
+        ttl = self.ttl_for(key[1])
+        self._entries[key] = (value, None if ttl is None else self.clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, entity_key: tuple, feature_ref: str, default=None):
+        """Return a cached value, or default on a miss or expired entry."""
+        with self._lock:
+            value = self._lookup((entity_key, feature_ref))
+            if value is _ABSENT:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def put(self, entity_key: tuple, feature_ref: str, value, generation=None):
+        """
+        Store a value, evicting the least recently used entries if full.
+        If generation is given (from claim()) and invalidate() has run since,
+        the value is dropped.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                self.stale_fills += 1
+                return
+            self._store((entity_key, feature_ref), value)
+
+    def claim(self, entity_key: tuple, feature_refs, waited=False):
+        """
+        Look up all feature_refs of one entity, or claim the fetch for them.
+        Args:
+            entity_key (tuple): Key from entity_key().
+            feature_refs (list): Feature references.
+            waited (bool): Retry after waiting on another caller's fetch; the
+                lookup was already counted as coalesced, so a hit is not counted again.
+        Returns:
+            tuple: ('hit', values) when every value is cached;
+                ('wait', threading.Event) when another caller is fetching them;
+                ('fetch', generation) when this caller must fetch them and then
+                call fill() (or release() if the fetch failed).
+        """
+        refs = tuple(feature_refs)
+        with self._lock:
+            values = []
+            for ref in refs:
+                value = self._lookup((entity_key, ref))
+                if value is _ABSENT:
+                    break
+                values.append(value)
+            else:
+                if not waited:
+                    self.hits += len(values)
+                return 'hit', values
+            event = self._inflight.get((entity_key, refs))
+            if event is not None:
+                if not waited:
+                    self.coalesced += 1
+                return 'wait', event
+            self._inflight[(entity_key, refs)] = threading.Event()
+            self.misses += 1
+            return 'fetch', self.generation
+
+    def fill(self, entity_key: tuple, feature_refs, values, generation):
+        """
+        Store the values fetched after claim() unless the cache was invalidated
+        in the meantime, then wake the callers waiting on this fetch.
+        """
+        refs = tuple(feature_refs)
+        with self._lock:
+            if generation == self.generation:
+                for ref, value in zip(refs, values):
+                    self._store((entity_key, ref), value)
+            else:
+                self.stale_fills += 1
+            event = self._inflight.pop((entity_key, refs), None)
+        if event is not None:
+            event.set()
+
+    def release(self, entity_key: tuple, feature_refs):
+        """Give up a claimed fetch (e.g. it failed) and wake the waiting callers."""
+        with self._lock:
+            event = self._inflight.pop((entity_key, tuple(feature_refs)), None)
+        if event is not None:
+            event.set()
+
+    def invalidate(self, feature_views=None):
+        """
+        Drop cached values.
+        Args:
+            feature_views (list, optional): Only drop entries of these views. Defaults to all.
+        """
+        with self._lock:
+            self.generation += 1
+            if feature_views is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                views = set(feature_views)
+                stale = [key for key in self._entries if key[1].split(':', 1)[0] in views]
+                for key in stale:
+                    del self._entries[key]
+                dropped = len(stale)
+            self.invalidations += dropped
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss metrics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_fills": self.stale_fills,
+            }
@@ -0,0 +1,159 @@
+import io
+import logging
+import time
+import pandas as pd
+from psycopg import sql
+from psycopg_pool import ConnectionPool
+from utils.logger import setup_logger
+
+logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
+
+# COPY NULL marker. An explicit marker keeps empty strings as '' instead of NULL
+# (the csv default treats an unquoted empty field as NULL); note that the literal
+# string '\N' is read back as NULL.
+COPY_NULL = r'\N'
+
+
+def postgres_type(dtype) -> str:
+    """Map a pandas dtype to a PostgreSQL column type."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE PRECISION"
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return "TIMESTAMPTZ"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+class PostgresBulkWriter:
+    """
+    Stream DataFrames into PostgreSQL with COPY ... FROM STDIN (CSV format).
+
+    Rows are sent in chunks of `chunksize`, each serialised to CSV in memory and
+    copied in its own transaction, so memory stays bounded for large frames.
+    Upserts copy each chunk into a temporary table and merge it with
+    INSERT ... ON CONFLICT (key) DO UPDATE.
+    """
+    def __init__(self, conninfo=None, pool=None, min_size=1, max_size=4):
+        """
+        Args:
+            conninfo (str, optional): libpq connection string, e.g.
+                'postgresql://postgres:1@localhost:5432/feast_offline'.
+            pool (optional): Existing pool; anything with a connection() context
+                manager yielding a psycopg connection works, which allows a
+                stand-in for tests.
+            min_size (int): Minimum pool size when creating a pool.
+            max_size (int): Maximum pool size when creating a pool.
+        """
+        if pool is None:
+            if conninfo is None:
+                raise ValueError("Either conninfo or pool must be given.")
+            pool = ConnectionPool(conninfo, min_size=min_size, max_size=max_size, open=True)
+            self._owns_pool = True
+        else:
+            self._owns_pool = False
+        self.pool = pool
+
+    def close(self):
+        """Close the pool if this writer created it."""
+        if self._owns_pool:
+            self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def create_table(self, df: pd.DataFrame, table: str, key=None, replace=False):
+        """
+        Create the target table from the DataFrame's dtypes if it does not exist.
+        Args:
+            df (pd.DataFrame): Frame whose columns define the table.
+            table (str): Table name.
+            key (str, optional): Column with a unique index, needed for upserts.
+            replace (bool): Drop an existing table first, like to_sql(if_exists='replace').
+        """
+        columns = sql.SQL(", ").join(
+            sql.SQL("{} {}").format(sql.Identifier(col), sql.SQL(postgres_type(dtype)))
+            for col, dtype in df.dtypes.items()
+        )
+        with self.pool.connection() as conn:
+            if replace:
+                conn.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table)))
+            conn.execute(sql.SQL("CREATE TABLE IF NOT EXISTS {} ({})").format(sql.Identifier(table), columns))
+            if key is not None:
+                conn.execute(sql.SQL("CREATE UNIQUE INDEX IF NOT EXISTS {} ON {} ({})").format(
+                    sql.Identifier(f"{table}_{key}_key"), sql.Identifier(table), sql.Identifier(key)))
+
+    @staticmethod
+    def _csv_chunk(chunk: pd.DataFrame) -> bytes:
+        """Serialise a chunk to CSV; NaN/None/NaT become the COPY_NULL marker."""
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, header=False, index=False, na_rep=COPY_NULL, date_format='%Y-%m-%d %H:%M:%S.%f%z')
+        return buffer.getvalue().encode('utf-8')
+
+    def _copy(self, cur, table: str, columns: list, payload: bytes):
+        copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL {})").format(
+            sql.Identifier(table), sql.SQL(", ").join(map(sql.Identifier, columns)), sql.Literal(COPY_NULL))
+        with cur.copy(copy_sql) as copy:
+            copy.write(payload)
+
+    def write(self, df: pd.DataFrame, table: str, mode='append', key='house_id', chunksize=50_000) -> dict:
+        """
+        Write a DataFrame to a table with COPY.
+        Args:
+            df (pd.DataFrame): Rows to write.
+            table (str): Target table.
+            mode (str): 'append', 'replace' (drop and recreate) or 'upsert' by key.
+            key (str): Unique key column for 'upsert'.
+            chunksize (int): Rows per COPY chunk and transaction.
+        Returns:
+            dict: rows written, seconds and rows_per_sec.
+        """
+        if mode not in ('append', 'replace', 'upsert'):
+            raise ValueError(f"Unsupported mode: {mode}")
+        self.create_table(df, table, key=key if mode == 'upsert' else None, replace=mode == 'replace')
+        columns = list(df.columns)
+        start = time.perf_counter()
+        for offset in range(0, len(df), chunksize):
+            payload = self._csv_chunk(df.iloc[offset:offset + chunksize])
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                if mode == 'upsert':
+                    self._upsert_chunk(cur, table, columns, key, payload)
+                else:
+                    self._copy(cur, table, columns, payload)
+        seconds = time.perf_counter() - start
+        report = {
+            "rows": len(df),
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(len(df) / seconds, 1) if seconds > 0 else None,
+        }
+        logger.info(f"🐘 Wrote {len(df)} rows to '{table}' ({mode}) in {seconds:.2f}s.")
+        return report
+
+    def _upsert_chunk(self, cur, table: str, columns: list, key: str, payload: bytes):
+        """COPY a chunk into a temp table and merge it into the target on key."""
+        staging = f"_staging_{table}"
+        cur.execute(sql.SQL("CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP").format(
+            sql.Identifier(staging), sql.Identifier(table)))
+        self._copy(cur, staging, columns, payload)
+        column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+        values = [col for col in columns if col != key]
+        if values:
+            conflict = sql.SQL("DO UPDATE SET {}").format(sql.SQL(", ").join(
+                sql.SQL("{} = EXCLUDED.{}").format(sql.Identifier(col), sql.Identifier(col)) for col in values))
+        else:
+            # Only the key column: nothing to update, existing keys are kept.
+            conflict = sql.SQL("DO NOTHING")
+        # Keep the last row per key within the chunk; ON CONFLICT cannot touch a row twice.
+        cur.execute(sql.SQL(
+            "INSERT INTO {table} ({cols}) "
+            "SELECT DISTINCT ON ({key}) {cols} FROM {staging} ORDER BY {key}, ctid DESC "
+            "ON CONFLICT ({key}) {conflict}"
+        ).format(table=sql.Identifier(table), cols=column_list, key=sql.Identifier(key),
+                 staging=sql.Identifier(staging), conflict=conflict))
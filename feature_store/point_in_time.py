@@ -0,0 +1,149 @@
+import uuid
+from datetime import timedelta
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+PARTITION_COLS = ('event_year', 'event_month')
+
+
+def _to_utc(timestamps: pd.Series) -> pd.Series:
+    """Return timestamps as UTC-aware datetimes, treating naive values as UTC."""
+    timestamps = pd.to_datetime(timestamps)
+    if timestamps.dt.tz is None:
+        return timestamps.dt.tz_localize('UTC')
+    return timestamps.dt.tz_convert('UTC')
+
+
+def write_partitioned_features(df: pd.DataFrame, root: str, timestamp_col='event_timestamp'):
+    """
+    Append a feature DataFrame to a Parquet dataset partitioned by the year and
+    month of its event timestamp (event_year=YYYY/event_month=M directories).
+    Partitions follow the event timestamp rather than the 'year'/'month_num'
+    feature columns, because point-in-time pruning works on event time.
+
+    Args:
+        df (pd.DataFrame): Features with entity and event timestamp columns.
+        root (str): Dataset folder.
+        timestamp_col (str): Event timestamp column.
+    """
+    timestamps = _to_utc(df[timestamp_col])
+    table = pa.Table.from_pandas(
+        df.assign(**{
+            timestamp_col: timestamps,
+            PARTITION_COLS[0]: timestamps.dt.year.astype('int32'),
+            PARTITION_COLS[1]: timestamps.dt.month.astype('int32'),
+        }),
+        preserve_index=False,
+    )
+    pq.write_to_dataset(
+        table, root, partition_cols=list(PARTITION_COLS),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+    )
+
+
+class PointInTimeJoiner:
+    """
+    Local point-in-time join over a partitioned feature dataset.
+
+    For each entity row the latest feature row of the same entity with
+    event_timestamp <= the entity timestamp (and within ttl, if given) is
+    attached, like Feast's historical retrieval. Only the partitions overlapping
+    the entity timestamp range (minus ttl) and the requested columns are read.
+    """
+    def __init__(self, dataset_path, entity_col='house_id', timestamp_col='event_timestamp'):
+        """
+        Args:
+            dataset_path (str): Folder written by write_partitioned_features.
+            entity_col (str): Entity join key.
+            timestamp_col (str): Event timestamp column in both frames.
+        """
+        self.entity_col = entity_col
+        self.timestamp_col = timestamp_col
+        self.dataset = ds.dataset(dataset_path, format='parquet', partitioning='hive')
+
+    @staticmethod
+    def feature_columns(features) -> list:
+        """Map feature references ('view:feature') to column names."""
+        return [ref.split(':', 1)[-1] for ref in features]
+
+    def _partition_filter(self, low, high):
+        """Expression keeping partitions whose (year, month) lies within [low, high]."""
+        year, month = pc.field(PARTITION_COLS[0]), pc.field(PARTITION_COLS[1])
+        after_low = (year > low.year) | ((year == low.year) & (month >= low.month))
+        before_high = (year < high.year) | ((year == high.year) & (month <= high.month))
+        return after_low & before_high
+
+    def read_features(self, columns, low, high) -> pd.DataFrame:
+        """
+        Read feature rows with low <= event_timestamp <= high, pruning partitions.
+        Args:
+            columns (list): Feature columns to read.
+            low (pd.Timestamp, optional): Lower bound; None reads from the start.
+            high (pd.Timestamp): Upper bound.
+        """
+        ts = pc.field(self.timestamp_col)
+        expr = ts <= pa.scalar(high.to_pydatetime(), type=pa.timestamp('us', tz='UTC'))
+        if low is not None:
+            expr = expr & self._partition_filter(low, high)
+            expr = expr & (ts >= pa.scalar(low.to_pydatetime(), type=pa.timestamp('us', tz='UTC')))
+        else:
+            expr = expr & self._partition_filter(pd.Timestamp.min.tz_localize('UTC'), high)
+        table = self.dataset.to_table(columns=[self.entity_col, self.timestamp_col] + list(columns), filter=expr)
+        features_df = table.to_pandas()
+        features_df[self.timestamp_col] = _to_utc(features_df[self.timestamp_col])
+        return features_df
+
+    def _join_slice(self, entity_df: pd.DataFrame, columns, ttl) -> pd.DataFrame:
+        """Point-in-time join one slice of entity rows (sorted by timestamp)."""
+        ts = self.timestamp_col
+        if entity_df.empty:
+            # No timestamp range to read (min/max are NaT): only add the feature columns.
+            empty = self.dataset.schema.empty_table().select(list(columns)).to_pandas()
+            return pd.concat([entity_df, empty.set_axis(entity_df.index)], axis=1)
+        high = entity_df[ts].max()
+        low = entity_df[ts].min() - ttl if ttl else None
+        features_df = self.read_features(columns, low, high).sort_values(ts, kind='stable')
+        features_df = features_df.rename(columns={ts: '_feature_timestamp'})
+        joined = pd.merge_asof(
+            entity_df, features_df,
+            left_on=ts, right_on='_feature_timestamp', by=self.entity_col,
+            direction='backward', allow_exact_matches=True, tolerance=ttl,
+        )
+        return joined.drop(columns=['_feature_timestamp'])
+
+    def _prepare(self, entity_df: pd.DataFrame) -> pd.DataFrame:
+        """Normalise timestamps and sort entity rows by time, remembering their order."""
+        entity_df = entity_df.copy()
+        entity_df[self.timestamp_col] = _to_utc(entity_df[self.timestamp_col])
+        entity_df['_row'] = range(len(entity_df))
+        return entity_df.sort_values(self.timestamp_col, kind='stable')
+
+    def iter_batches(self, entity_df: pd.DataFrame, features, ttl: timedelta = None, batch_size=100_000):
+        """
+        Stream the joined result as Arrow record batches.
+        Entity rows are processed in time order, batch_size at a time, and each
+        slice only reads the partitions it needs.
+        Yields:
+            pa.RecordBatch: Entity columns followed by the requested features.
+        """
+        columns = self.feature_columns(features)
+        entity_df = self._prepare(entity_df)
+        ttl = pd.Timedelta(ttl) if ttl else None
+        for start in range(0, len(entity_df), batch_size):
+            joined = self._join_slice(entity_df.iloc[start:start + batch_size], columns, ttl)
+            yield from pa.Table.from_pandas(joined.drop(columns=['_row']), preserve_index=False).to_batches()
+
+    def join(self, entity_df: pd.DataFrame, features, ttl: timedelta = None) -> pd.DataFrame:
+        """
+        Return the point-in-time joined DataFrame in the original entity row order.
+        """
+        columns = self.feature_columns(features)
+        prepared = self._prepare(entity_df)
+        joined = self._join_slice(prepared, columns, pd.Timedelta(ttl) if ttl else None)
+        joined = joined.sort_values('_row').drop(columns=['_row'])
+        joined.index = entity_df.index
+        return joined
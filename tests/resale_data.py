@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+TOWNS = ['ANG MO KIO', 'BEDOK', 'BISHAN', 'BUKIT MERAH', 'CLEMENTI', 'HOUGANG', 'JURONG WEST',
+         'PUNGGOL', 'SENGKANG', 'TAMPINES', 'WOODLANDS', 'YISHUN']
+FLAT_TYPES = ['2 ROOM', '3 ROOM', '4 ROOM', '5 ROOM', 'EXECUTIVE']
+FLAT_MODELS = ['Improved', 'New Generation', 'Model A', 'Standard', 'Premium Apartment', 'Maisonette', 'DBSS']
+STOREY_RANGES = [f"{low:02d} TO {low + 2:02d}" for low in range(1, 40, 3)]
+
+
+def make_resale_frame(rows: int, start_year: int, end_year: int, with_lease=True, seed=0) -> pd.DataFrame:
+    """Rows shaped like the HDB resale CSVs, with remaining_lease as '61 years 04 months' strings."""
+    rng = np.random.default_rng(seed)
+    years = rng.integers(start_year, end_year + 1, rows)
+    lease_start = rng.integers(1966, 2020, rows)
+    df = pd.DataFrame({
+        'month': [f"{y}-{m:02d}" for y, m in zip(years, rng.integers(1, 13, rows))],
+        'town': rng.choice(TOWNS, rows),
+        'flat_type': rng.choice(FLAT_TYPES, rows, p=[0.05, 0.3, 0.38, 0.2, 0.07]),
+        'block': rng.integers(1, 999, rows).astype(str),
+        'street_name': rng.choice([f"STREET {i}" for i in range(300)], rows),
+        'storey_range': rng.choice(STOREY_RANGES, rows),
+        'floor_area_sqm': rng.uniform(30, 180, rows).round(0),
+        'flat_model': rng.choice(FLAT_MODELS, rows),
+        'lease_commence_date': lease_start,
+        'resale_price': rng.uniform(1.5e5, 1.2e6, rows).round(-3),
+    })
+    if with_lease:
+        remaining = np.clip(99 - (years - lease_start), 1, 98) * 12 - rng.integers(0, 12, rows)
+        df.insert(9, 'remaining_lease', [
+            f"{m // 12:02d} years {m % 12:02d} months" if m % 12 else f"{m // 12:02d} years" for m in remaining
+        ])
+    return df
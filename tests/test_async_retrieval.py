@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+import pytest
+
+from feature_store.async_retrieval import OnlineFeatureBatcher
+
+FEATURES = ['house_features:storey_mean']
+
+
+class FakeFetch:
+    """Blocking fetch returning house_id * 10, recording the entity rows of every call."""
+    def __init__(self, error=None, gate=None):
+        self.calls = []
+        self.error = error
+        self.gate = gate
+
+    def __call__(self, entity_rows, features):
+        self.calls.append([row['house_id'] for row in entity_rows])
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {'house_id': [row['house_id'] for row in entity_rows],
+                'storey_mean': [row['house_id'] * 10 for row in entity_rows]}
+
+
+def _rows(*ids):
+    return [{'house_id': i} for i in ids]
+
+
+def test_requests_within_the_window_share_one_fetch():
+    fetch = FakeFetch()
+    batcher = OnlineFeatureBatcher(fetch, window=0.05)
+
+    async def main():
+        return await asyncio.gather(batcher.get(_rows(1), FEATURES), batcher.get(_rows(2, 3), FEATURES))
+
+    first, second = asyncio.run(main())
+    assert first == {'house_id': [1], 'storey_mean': [10]}
+    assert second == {'house_id': [2, 3], 'storey_mean': [20, 30]}
+    assert fetch.calls == [[1, 2, 3]]
+    assert (batcher.batches, batcher.requests, batcher.coalesced) == (1, 2, 1)
+
+
+def test_batch_is_flushed_at_max_batch_size_without_waiting_for_the_window():
+    fetch = FakeFetch()
+    batcher = OnlineFeatureBatcher(fetch, window=60, max_batch_size=3)
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(
+            batcher.get(_rows(1, 2), FEATURES), batcher.get(_rows(3), FEATURES)), timeout=5)
+
+    first, second = asyncio.run(main())
+    assert first['storey_mean'] == [10, 20] and second['storey_mean'] == [30]
+    assert fetch.calls == [[1, 2, 3]]
+
+
+def test_entity_rows_are_fetched_once_and_fanned_out_in_caller_order():
+    fetch = FakeFetch()
+    batcher = OnlineFeatureBatcher(fetch, window=0.05)
+
+    async def main():
+        return await asyncio.gather(batcher.get(_rows(5, 4, 5), FEATURES), batcher.get(_rows(4), FEATURES),
+                                    batcher.get(_rows(5), FEATURES, output='numpy'))
+
+    first, second, third = asyncio.run(main())
+    assert fetch.calls == [[5, 4]]
+    assert first['storey_mean'] == [50, 40, 50]
+    assert second['storey_mean'] == [40]
+    assert third['storey_mean'].tolist() == [50]
+
+
+def test_fetch_error_reaches_every_waiter():
+    batcher = OnlineFeatureBatcher(FakeFetch(error=RuntimeError('online store down')), window=0.05)
+
+    async def main():
+        return await asyncio.gather(batcher.get(_rows(1), FEATURES), batcher.get(_rows(2), FEATURES),
+                                    return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert all(str(result) == 'online store down' for result in results)
+
+
+@pytest.mark.parametrize('fetch_started', [False, True])
+def test_cancelled_fetch_does_not_leave_callers_waiting(fetch_started):
+    gate = threading.Event()
+    fetch = FakeFetch(gate=gate)
+    batcher = OnlineFeatureBatcher(fetch, window=0.001)
+
+    async def main():
+        waiters = [asyncio.ensure_future(batcher.get(_rows(i), FEATURES)) for i in (1, 2)]
+        while not batcher._tasks or (fetch_started and not fetch.calls):
+            await asyncio.sleep(0.001)
+        for task in batcher._tasks:
+            task.cancel()
+        try:
+            _, pending = await asyncio.wait(waiters, timeout=5)
+        finally:
+            gate.set()
+        return pending, waiters
+
+    pending, waiters = asyncio.run(main())
+    assert not pending
+    assert all(waiter.cancelled() for waiter in waiters)
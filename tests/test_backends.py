@@ -0,0 +1,98 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda.backends import ArrowBackend, get_backend
+from eda.data_encoder import DataEncoder, FrequencyEncoder
+from eda.data_inspector import DataInspector, DataProfile
+from eda.data_preprocessor import DataPreprocessor
+from resale_data import make_resale_frame
+
+ROWS = 5_000
+
+
+def make_parity_frame(rows: int, seed=0) -> pd.DataFrame:
+    """Synthetic rows plus the edge cases the backends must agree on."""
+    df = make_resale_frame(rows, 2015, 2024, seed=seed)
+    df['source_file'] = np.where(np.arange(rows) % 3 == 0, 'resale-2015.csv', 'resale-2017.csv')
+    edge = pd.DataFrame({
+        'remaining_lease': [np.nan, '11 months', '99 years', 'unknown', ''],
+        'town': [np.nan, 'BEDOK', 'BEDOK', 'RARE TOWN', 'BEDOK'],
+        'source_file': [None, 'resale-2015.csv', 'resale-2024.csv', 'resale-2024.csv', None],
+        'floor_area_sqm': [np.nan, 50.0, np.nan, 70.0, 80.0],
+    })
+    edge = edge.reindex(columns=df.columns)
+    template = df.iloc[:len(edge)].reset_index(drop=True)
+    for col in ('month', 'storey_range', 'flat_type', 'block', 'street_name', 'flat_model',
+                'lease_commence_date', 'resale_price'):
+        edge[col] = template[col]
+    edge['lease_commence_date'] = edge['lease_commence_date'].astype(df['lease_commence_date'].dtype)
+    return pd.concat([df, edge], ignore_index=True)
+
+
+def _assert_same(left, right, label):
+    if isinstance(left, pd.DataFrame):
+        pd.testing.assert_frame_equal(left, right, check_exact=True, obj=label)
+    elif isinstance(left, pd.Series):
+        pd.testing.assert_series_equal(left, right, check_exact=True, obj=label)
+    elif isinstance(left, dict):
+        assert left.keys() == right.keys(), f"{label}: keys differ"
+        for key in left:
+            _assert_same(left[key], right[key], f"{label}[{key!r}]")
+    else:
+        assert left == right, f"{label}: {left!r} != {right!r}"
+
+
+@pytest.fixture(scope='module')
+def raw():
+    return make_parity_frame(ROWS)
+
+
+@pytest.fixture(scope='module')
+def parquet_path(raw, tmp_path_factory):
+    path = tmp_path_factory.mktemp('parity') / 'house_features.parquet'
+    raw.to_parquet(path, index=False)
+    return str(path)
+
+
+CHECKS = {
+    'preprocess_all': lambda b, raw, path: DataPreprocessor(raw.copy()).preprocess_all(backend=b),
+    'frequency_encode': lambda b, raw, path: DataEncoder(raw.copy(), backend=b).frequency_encode(),
+    'frequency_maps': lambda b, raw, path: FrequencyEncoder(threshold=0.01, backend=b).fit(raw).to_dict()['maps'],
+    'encode_categorical': lambda b, raw, path: DataEncoder(
+        raw.drop(columns=['street_name', 'block', 'remaining_lease', 'month']), backend=b).encode_categorical(),
+    'inspect_all': lambda b, raw, path: DataInspector(raw, backend=b).inspect_all(),
+    'read_parquet': lambda b, raw, path: get_backend(b).read_parquet(
+        path, columns=['town', 'resale_price', 'source_file'],
+        filters=[('resale_price', '>=', 500_000.0), ('town', '!=', 'BEDOK')]),
+}
+
+
+@pytest.fixture(params=['arrow', 'polars'])
+def backend(request):
+    pytest.importorskip('pyarrow' if request.param == 'arrow' else 'polars')
+    return request.param
+
+
+@pytest.mark.parametrize('check', sorted(CHECKS))
+def test_backend_matches_pandas(backend, check, raw, parquet_path):
+    expected = CHECKS[check]('pandas', raw, parquet_path)
+    actual = CHECKS[check](backend, raw, parquet_path)
+    _assert_same(expected, actual, f"{backend}.{check}")
+
+
+def test_fitted_frequency_encoder_pickles(backend, raw):
+    encoder = FrequencyEncoder(threshold=0.01, backend=backend).fit(raw)
+    expected = encoder.transform(raw)
+    restored = pickle.loads(pickle.dumps(encoder))
+    assert restored.backend_name == backend
+    pd.testing.assert_frame_equal(restored.transform(raw), expected)
+
+
+def test_profile_and_backend_instances_pickle(backend, raw):
+    profile = DataProfile(backend=backend).update(raw)
+    restored = pickle.loads(pickle.dumps(profile))
+    assert restored.backend is get_backend(backend)
+    assert isinstance(pickle.loads(pickle.dumps(ArrowBackend())), ArrowBackend)
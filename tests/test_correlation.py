@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from eda.correlation import CorrelationAccumulator
+
+
+def _frame(rows=3_000, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=rows)
+    df = pd.DataFrame({
+        'price': 5e5 + 1e5 * base,
+        'area': 90 + 15 * (0.8 * base + 0.6 * rng.normal(size=rows)),
+        'storey': rng.integers(1, 40, rows).astype('float64'),
+        'is_bedok': rng.random(rows) < 0.2,
+        'lease': -0.5 * base + rng.normal(size=rows),
+    })
+    for col, rate in (('area', 0.1), ('storey', 0.3), ('lease', 0.05)):
+        df.loc[rng.random(rows) < rate, col] = np.nan
+    return df
+
+
+def test_chunked_correlation_matches_dataframe_corr_with_nans():
+    df = _frame()
+    acc = CorrelationAccumulator(block_rows=256).update(df.iloc[:1000]).update(df.iloc[1000:])
+    expected = df.astype('float64').corr()
+    pd.testing.assert_frame_equal(acc.correlation(), expected, check_exact=False, rtol=1e-9, atol=1e-12)
+
+
+def test_merged_accumulators_match_a_single_pass():
+    df = _frame(seed=1)
+    # Shift the second half so the two accumulators use very different shift constants.
+    df.loc[1500:, 'price'] += 1e6
+    left = CorrelationAccumulator.from_chunks([df.iloc[:700], df.iloc[700:1500]])
+    right = CorrelationAccumulator(columns=left.columns).update(df.iloc[1500:])
+    merged = CorrelationAccumulator().merge(left).merge(right)
+    expected = df.astype('float64').corr()
+    pd.testing.assert_frame_equal(merged.correlation(), expected, check_exact=False, rtol=1e-9, atol=1e-12)
+    pd.testing.assert_frame_equal(merged.correlation(min_periods=2000),
+                                  df.astype('float64').corr(min_periods=2000), check_exact=False, rtol=1e-9)
+
+
+def test_statistics_round_trip_through_npz(tmp_path):
+    acc = CorrelationAccumulator().update(_frame(500, seed=2))
+    path = tmp_path / 'corr.npz'
+    acc.save(path)
+    pd.testing.assert_frame_equal(CorrelationAccumulator.load(path).correlation(), acc.correlation())
@@ -0,0 +1,39 @@
+import zipfile
+
+import pandas as pd
+
+from eda.data_ingestor import DataIngestor
+
+
+def _write_zip(data_dir, members):
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(data_dir / 'resale.zip', 'w') as zip_ref:
+        for name, df in members.items():
+            zip_ref.writestr(name, df.to_csv(index=False))
+
+
+def test_load_cached_matches_load_data_file_with_mixed_lease_types(tmp_path):
+    # 2015-2016 style file stores remaining_lease as whole years (int64),
+    # 2017 onwards as strings like '61 years 04 months'.
+    _write_zip(tmp_path / 'data', {
+        'resale-2015-2016.csv': pd.DataFrame({'month': ['2015-01', '2016-02'], 'remaining_lease': [70, 65]}),
+        'resale-2017.csv': pd.DataFrame({'month': ['2017-01', '2017-02'],
+                                         'remaining_lease': ['61 years 04 months', '59 years']}),
+    })
+    ingestor = DataIngestor(str(tmp_path / 'data'))
+    expected = ingestor.load_data_file()
+
+    pd.testing.assert_frame_equal(ingestor.load_cached(), expected)
+    # Second call is served from the feather cache.
+    pd.testing.assert_frame_equal(ingestor.load_cached(), expected)
+
+
+def test_load_cached_fills_columns_missing_from_older_members(tmp_path):
+    _write_zip(tmp_path / 'data', {
+        'resale-1990.csv': pd.DataFrame({'month': ['1990-01'], 'resale_price': [9000.0]}),
+        'resale-2017.csv': pd.DataFrame({'month': ['2017-01'], 'resale_price': [300000.0],
+                                         'remaining_lease': ['61 years']}),
+    })
+    df = DataIngestor(str(tmp_path / 'data')).load_cached()
+    assert df['remaining_lease'].isna().tolist() == [True, False]
+    assert df['source_file'].tolist() == ['resale-1990.csv', 'resale-2017.csv']
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda.data_inspector import DataInspector, DataProfile
+from resale_data import make_resale_frame
+
+
+def _chunks():
+    older = make_resale_frame(300, 1990, 1999, with_lease=False, seed=1)
+    older['source_file'] = 'resale-1990-1999.csv'
+    older['town'] = np.nan  # all-NaN (float64) in the first chunk, strings later
+    newer = make_resale_frame(500, 2017, 2024, seed=2)
+    newer['source_file'] = 'resale-2017.csv'
+    newer.loc[::7, 'floor_area_sqm'] = np.nan
+    latest = make_resale_frame(200, 2024, 2024, seed=3).drop(columns=['lease_commence_date'])
+    latest['source_file'] = 'resale-2024.csv'
+    return [older, newer.iloc[:250], newer.iloc[250:], latest]
+
+
+def _assert_same_report(actual, expected):
+    assert actual['shape'] == expected['shape']
+    pd.testing.assert_series_equal(actual['dtypes'], expected['dtypes'])
+    pd.testing.assert_series_equal(actual['null_percentages'], expected['null_percentages'])
+    assert actual['nulls_by_source_file'].keys() == expected['nulls_by_source_file'].keys()
+    for name, nulls in expected['nulls_by_source_file'].items():
+        pd.testing.assert_series_equal(actual['nulls_by_source_file'][name], nulls)
+    pd.testing.assert_frame_equal(actual['column_stats'], expected['column_stats'], check_exact=False, rtol=1e-12)
+
+
+@pytest.fixture(scope='module')
+def one_shot():
+    return DataInspector(pd.concat(_chunks(), ignore_index=True)).inspect_all()
+
+
+def test_chunked_profile_matches_one_shot_profile(one_shot):
+    profile = DataProfile.from_chunks(_chunks())
+    _assert_same_report(DataInspector(None).inspect_all(profile=profile), one_shot)
+    assert profile.dtypes['town'] == object
+    assert profile.dtypes['lease_commence_date'] == 'float64'
+
+
+def test_merged_profiles_match_one_shot_profile(one_shot):
+    chunks = _chunks()
+    merged = DataProfile().merge(DataProfile.from_chunks(chunks[:2])).merge(DataProfile.from_chunks(chunks[2:]))
+    _assert_same_report(DataInspector(None).inspect_all(profile=merged), one_shot)
@@ -0,0 +1,72 @@
+import json
+import zipfile
+
+import pandas as pd
+
+from eda.data_pipeline import IncrementalPipeline
+from resale_data import make_resale_frame
+
+
+def _write_zip(data_dir, members):
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(data_dir / 'resale.zip', 'w') as zip_ref:
+        for name, df in members.items():
+            zip_ref.writestr(name, df.to_csv(index=False))
+
+
+def _pipeline(tmp_path):
+    return IncrementalPipeline(str(tmp_path / 'data'), str(tmp_path / 'out'), threshold=0.01)
+
+
+def _manifest(tmp_path):
+    return json.loads((tmp_path / 'out' / 'manifest.json').read_text())
+
+
+MEMBERS = {
+    'resale-2017.csv': make_resale_frame(40, 2017, 2017, seed=1),
+    'resale-2018.csv': make_resale_frame(30, 2018, 2018, seed=2),
+}
+
+
+def test_second_run_processes_only_the_added_member(tmp_path):
+    _write_zip(tmp_path / 'data', MEMBERS)
+    assert sorted(_pipeline(tmp_path).run()) == ['resale-2017.csv', 'resale-2018.csv']
+    features_dir = tmp_path / 'out' / 'house_features.parquet'
+    before = {path.name: path.read_bytes() for path in features_dir.iterdir()}
+    first_ids = {name: entry['first_house_id'] for name, entry in _manifest(tmp_path)['files'].items()}
+
+    _write_zip(tmp_path / 'data', {**MEMBERS, 'resale-2019.csv': make_resale_frame(20, 2019, 2019, seed=3)})
+    assert _pipeline(tmp_path).run() == ['resale-2019.csv']
+
+    after = {path.name: path.read_bytes() for path in features_dir.iterdir()}
+    assert sorted(after) == ['resale-2017.csv.parquet', 'resale-2018.csv.parquet', 'resale-2019.csv.parquet']
+    assert {name: after[name] for name in before} == before
+    manifest = _manifest(tmp_path)
+    assert {name: manifest['files'][name]['first_house_id'] for name in first_ids} == first_ids
+    assert manifest['files']['resale-2019.csv']['first_house_id'] == 71
+    features = pd.read_parquet(features_dir)
+    assert sorted(features['house_id']) == list(range(1, 91))
+    assert _pipeline(tmp_path).run() == []
+
+
+def test_changed_and_removed_members_replace_or_drop_their_parts(tmp_path):
+    _write_zip(tmp_path / 'data', MEMBERS)
+    _pipeline(tmp_path).run()
+
+    _write_zip(tmp_path / 'data', {'resale-2017.csv': make_resale_frame(10, 2017, 2017, seed=4)})
+    assert _pipeline(tmp_path).run() == ['resale-2017.csv']
+
+    features = pd.read_parquet(tmp_path / 'out' / 'house_features.parquet')
+    assert sorted(features['house_id']) == list(range(71, 81))
+    manifest = _manifest(tmp_path)
+    assert list(manifest['files']) == ['resale-2017.csv']
+    assert sorted((entry['source_file'], entry['first_house_id'], entry['rows'])
+                  for entry in manifest['retired']) == [('resale-2017.csv', 1, 40), ('resale-2018.csv', 41, 30)]
+
+
+def test_member_without_rows_is_recorded_and_not_reloaded(tmp_path):
+    empty = MEMBERS['resale-2018.csv'].iloc[:0]
+    _write_zip(tmp_path / 'data', {'resale-2017.csv': MEMBERS['resale-2017.csv'], 'resale-2018.csv': empty})
+    assert sorted(_pipeline(tmp_path).run()) == ['resale-2017.csv', 'resale-2018.csv']
+    assert _manifest(tmp_path)['files']['resale-2018.csv']['rows'] == 0
+    assert _pipeline(tmp_path).run() == []
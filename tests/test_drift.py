@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda.drift import DriftMonitor, ReferenceProfile
+
+
+def _frame(rows, shift=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'floor_area_sqm': rng.normal(90 + shift * 20, 20, rows),
+        'storey_mean': np.full(rows, 5.0 + shift),
+        'town': rng.choice(['BEDOK', 'TAMPINES', 'YISHUN'], rows, p=[0.5 - shift / 4, 0.3, 0.2 + shift / 4]),
+    })
+
+
+@pytest.fixture(scope='module')
+def reference():
+    return ReferenceProfile(bins=10).fit(_frame(20_000))
+
+
+def test_unshifted_batch_is_not_flagged(reference):
+    result = DriftMonitor(reference).check(_frame(5_000, seed=1))
+    assert not result['drifted'].any()
+    assert (result['psi'] < 0.01).all() and (result['js_distance'] < 0.05).all()
+    assert result.loc['floor_area_sqm', 'ks_statistic'] < 0.05
+    assert result.loc['floor_area_sqm', 'ks_pvalue'] > 0.01
+
+
+def test_shifted_batch_is_flagged_by_psi_js_and_ks(reference):
+    result = DriftMonitor(reference).check(_frame(5_000, shift=1.0, seed=1))
+    assert result['drifted'].all()
+    area = result.loc['floor_area_sqm']
+    assert area['psi'] > 0.2 and area['js_distance'] > 0.1 and area['ks_statistic'] > 0.3
+    assert area['ks_pvalue'] < 1e-6
+    assert result.loc['town', 'psi'] > 0.2 and np.isnan(result.loc['town', 'ks_statistic'])
+
+
+def test_shift_of_a_constant_column_is_caught_by_ks(reference):
+    result = DriftMonitor(reference).check(_frame(1_000, seed=1).assign(storey_mean=6.0))
+    storey = result.loc['storey_mean']
+    # The reference quantile edges all collapse onto 5.0, so the shift stays in one bin.
+    assert storey['psi'] == pytest.approx(0.0) and storey['ks_statistic'] == 1.0
+    assert storey['drifted']
+    assert not DriftMonitor(reference, ks_threshold=1.1).check(_frame(1_000).assign(storey_mean=6.0)).loc[
+        'storey_mean', 'drifted']
+
+
+def test_reference_profile_round_trips_through_json(reference, tmp_path):
+    path = tmp_path / 'reference.json'
+    reference.save(path)
+    restored = ReferenceProfile.load(path)
+    assert restored.to_dict() == json.loads(json.dumps(reference.to_dict()))
+    batch = _frame(2_000, shift=0.5, seed=2)
+    pd.testing.assert_frame_equal(DriftMonitor(restored).check(batch), DriftMonitor(reference).check(batch))
+
+
+@pytest.mark.parametrize('tz', [None, 'UTC', 'Asia/Singapore'])
+def test_check_periods_groups_naive_and_aware_timestamps_by_month(reference, tz):
+    batch = _frame(300, seed=3)
+    timestamps = pd.Series(pd.to_datetime(['2024-01-31 23:00', '2024-02-01 00:30', '2024-03-15 12:00']))
+    batch['event_timestamp'] = timestamps.repeat(100).dt.tz_localize(tz).reset_index(drop=True)
+    assert (batch['event_timestamp'].dt.tz is None) == (tz is None)
+    results = DriftMonitor(reference).check_periods(batch)
+    assert results.index.get_level_values('period').unique().tolist() == ['2024-01', '2024-02', '2024-03']
+    assert (results.xs('storey_mean', level='feature')['rows'] == 100).all()
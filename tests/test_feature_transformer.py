@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda.data_preprocessor import parse_lease_series, parse_lease_value
+from eda.feature_transformer import FeatureTransformer
+from resale_data import make_resale_frame
+
+EDGE_LEASES = [None, np.nan, '', 'unknown', 'abc year', '11 months', '99 years', '61 years 04 months',
+               ' 7 year 1 month ', 70, 65.5]
+EDGE_MONTHS = [None, np.nan, '2024-1', '']
+MALFORMED_MONTHS = ['2024-13', '2024/01', '2024-01-15', 'bad', 202401]
+EDGE_STOREYS = [None, np.nan, '04 TO 06', '04-06', 'high', 7]
+
+
+@pytest.fixture(scope='module')
+def transformer():
+    return FeatureTransformer().fit(make_resale_frame(2_000, 2017, 2024, seed=1))
+
+
+def _same(left, right):
+    if isinstance(left, float) and math.isnan(left):
+        return isinstance(right, float) and math.isnan(right)
+    return left == right
+
+
+@pytest.mark.parametrize('lease', EDGE_LEASES)
+def test_scalar_lease_parser_matches_series_parser(lease):
+    expected = parse_lease_series(pd.Series([lease], dtype=object)).iloc[0]
+    assert parse_lease_value(lease) == expected
+
+
+def _raw_with(field, value):
+    raw = make_resale_frame(1, 2017, 2024, seed=2)
+    raw[field] = pd.Series([value], dtype=object)
+    return raw
+
+
+@pytest.mark.parametrize('field, value', [('remaining_lease', v) for v in EDGE_LEASES]
+                         + [('month', v) for v in EDGE_MONTHS]
+                         + [('storey_range', v) for v in EDGE_STOREYS])
+def test_transform_record_matches_batch_transform_on_edge_values(transformer, field, value):
+    raw = _raw_with(field, value)
+    batch = transformer.transform(raw)
+    features = transformer.transform_record(raw.to_dict(orient='records')[0])
+    assert list(features) == list(batch.columns)
+    for col, result in features.items():
+        assert _same(float(result), float(batch[col].iloc[0])), (value, col, result, batch[col].iloc[0])
+
+
+@pytest.mark.parametrize('month', MALFORMED_MONTHS)
+def test_malformed_month_raises_in_batch_but_not_for_a_single_record(transformer, month):
+    raw = _raw_with('month', month)
+    with pytest.raises(ValueError):
+        transformer.transform(raw)
+    features = transformer.transform_record(raw.to_dict(orient='records')[0])
+    assert math.isnan(features['year']) and math.isnan(features['month_num'])
@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# pandas itself imports pandas.plotting (without a backend) and, when installed, pyarrow;
+# only what the statement adds on top of `import pandas` is checked for those.
+_PROBE = """
+import json, sys
+import pandas
+before = set(sys.modules)
+{statement}
+print(json.dumps({{'loaded': sorted(sys.modules), 'added': sorted(set(sys.modules) - before)}}))
+"""
+
+HEAVY = ('matplotlib', 'seaborn', 'feast', 'scipy', 'pandas.plotting._matplotlib', 'psycopg')
+ADDED_BY_US = ('pyarrow', 'pyarrow.dataset', 'pyarrow.feather', 'pyarrow.parquet', 'polars')
+
+
+def _modules(statement):
+    out = subprocess.run([sys.executable, '-c', _PROBE.format(statement=statement)], cwd=ROOT,
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('statement', [
+    'import eda.data_preprocessor',
+    'from eda import DataPreprocessor',
+    'import feature_store',
+])
+def test_preprocessing_entry_points_do_not_import_heavy_dependencies(statement):
+    modules = _modules(statement)
+    assert [m for m in HEAVY if m in modules['loaded']] == []
+    assert [m for m in ADDED_BY_US if m in modules['added']] == []
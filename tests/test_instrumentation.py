@@ -0,0 +1,94 @@
+import asyncio
+import tracemalloc
+
+import pytest
+
+from utils.instrumentation import instrument, tracer
+
+
+@pytest.fixture
+def traced():
+    tracer.reset()
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+    tracer.enable(profile_stage=None)
+    tracer.disable()
+    tracer.reset()
+
+
+def _parents(report):
+    return {rec['stage']: rec['parent'] for rec in report['stages']}
+
+
+@instrument(name='child_a')
+async def _child_a():
+    await asyncio.sleep(0.01)
+    await asyncio.sleep(0.01)
+
+
+@instrument(name='child_b')
+async def _child_b():
+    await asyncio.sleep(0.005)
+    await asyncio.sleep(0.02)
+
+
+@instrument(name='parent')
+async def _parent():
+    await asyncio.gather(_child_a(), _child_b())
+
+
+def test_concurrent_coroutines_do_not_become_each_others_parent(traced):
+    asyncio.run(_parent())
+    assert _parents(traced.report()) == {'child_a': 'parent', 'child_b': 'parent', 'parent': None}
+
+
+@instrument(name='gen_a')
+def _gen_a():
+    yield [1, 2]
+
+
+@instrument(name='gen_b')
+def _gen_b():
+    yield [1]
+    yield [2]
+
+
+@instrument(name='plain')
+def _plain():
+    return None
+
+
+def test_generators_finishing_out_of_order_pop_only_their_own_stage(traced):
+    a, b = _gen_a(), _gen_b()
+    next(a)
+    next(b)
+    list(a)          # gen_a ends while gen_b is still open
+    _plain()         # its parent must be the still-open gen_b, not gen_a
+    list(b)
+    _plain()
+    stages = traced.report()['stages']
+    assert [(rec['stage'], rec['parent']) for rec in stages] == [
+        ('gen_a', None), ('plain', 'gen_b'), ('gen_b', 'gen_a'), ('plain', None)]
+    assert stages[2]['rows_out'] == 2
+
+
+def test_profiling_leaves_running_tracemalloc_alone(traced):
+    traced.enable(profile_stage='plain', profile_mode='tracemalloc')
+    tracemalloc.start()
+    try:
+        _plain()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    profile = traced.report()['stages'][0]['profile']
+    assert profile['mode'] == 'tracemalloc'
+    assert profile['peak_scope'] == 'tracing'
+
+
+def test_profiling_stops_tracemalloc_it_started(traced):
+    traced.enable(profile_stage='plain', profile_mode='tracemalloc')
+    assert not tracemalloc.is_tracing()
+    _plain()
+    assert not tracemalloc.is_tracing()
+    assert traced.report()['stages'][0]['profile']['peak_scope'] == 'stage'
@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+
+from utils import logger as logger_module
+from utils.logger import LazyMessage, setup_logger, stop_queue_listeners
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    path = tmp_path / 'logs' / 'E2EML_test.log'
+    monkeypatch.setattr(logger_module, '_log_file', str(path))
+    created = []
+    yield path, created
+    stop_queue_listeners()
+    for name in created:
+        log = logging.getLogger(name)
+        for handler in list(log.handlers):
+            handler.close()
+            log.removeHandler(handler)
+
+
+def _logger(log_file, name, **kwargs):
+    log_file[1].append(name)
+    # setup_logger skips loggers that already reach a handler; keep pytest's root capture handler out of sight.
+    logging.getLogger(name).propagate = False
+    return setup_logger(name, log_level=logging.INFO, console_level=logging.CRITICAL, **kwargs)
+
+
+@pytest.mark.parametrize('use_queue', [False, True])
+def test_lazy_message_is_only_built_for_records_that_pass_the_level(log_file, use_queue):
+    calls = []
+
+    def payload():
+        calls.append(1)
+        return 'expensive payload'
+
+    log = _logger(log_file, f'test_lazy_{use_queue}', use_queue=use_queue)
+    log.debug("debug: %s", LazyMessage(payload))
+    assert calls == []
+    log.info("info: %s", LazyMessage(payload))
+    stop_queue_listeners()
+    assert calls == [1]
+    assert 'info: expensive payload' in log_file[0].read_text(encoding='utf-8')
+
+
+def test_log_file_rotates_at_the_size_from_the_environment(log_file, monkeypatch):
+    monkeypatch.setenv('E2EML_LOG_MAX_BYTES', '500')
+    log = _logger(log_file, 'test_rotation', backup_count=2)
+    for i in range(50):
+        log.info("line %03d %s", i, 'x' * 40)
+    path = log_file[0]
+    rotated = sorted(p.name for p in path.parent.iterdir())
+    assert rotated == [path.name, path.name + '.1', path.name + '.2']
+    assert all(p.stat().st_size <= 500 for p in path.parent.iterdir())
+    assert 'line 049' in path.read_text(encoding='utf-8')
@@ -0,0 +1,85 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from feature_store.materialization import MaterializationScheduler, count_file_source_rows
+
+pytest.importorskip('pyarrow')
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = datetime(2024, 1, 5, tzinfo=timezone.utc)
+
+
+class FakeStore:
+    def __init__(self, views):
+        self.views = views
+        self.calls = []
+
+    def list_feature_views(self):
+        return self.views
+
+    def materialize(self, start_date, end_date, feature_views):
+        self.calls.append((feature_views[0], start_date, end_date))
+
+
+def _view(path, name='house_features'):
+    return SimpleNamespace(name=name, online=True,
+                           batch_source=SimpleNamespace(path=str(path), timestamp_field='event_timestamp'))
+
+
+@pytest.fixture
+def naive_parquet(tmp_path):
+    path = tmp_path / 'house_features.parquet'
+    pd.DataFrame({
+        'house_id': range(96),
+        'event_timestamp': pd.date_range('2024-01-01', periods=96, freq='h'),  # naive, meant as UTC
+    }).to_parquet(path, index=False, row_group_size=24)
+    return path
+
+
+def test_counts_naive_parquet_against_aware_and_naive_bounds(naive_parquet):
+    view = _view(naive_parquet)
+    assert count_file_source_rows(view, START, START + timedelta(days=1)) == 24
+    assert count_file_source_rows(view, START.replace(tzinfo=None), START.replace(tzinfo=None)
+                                  + timedelta(hours=6)) == 6
+    singapore = timezone(timedelta(hours=8))
+    assert count_file_source_rows(view, datetime(2024, 1, 2, 8, tzinfo=singapore), END) == 72
+
+
+def test_counts_aware_parquet(tmp_path):
+    path = tmp_path / 'aware.parquet'
+    pd.DataFrame({
+        'event_timestamp': pd.date_range('2024-01-01', periods=48, freq='h', tz='Asia/Singapore'),
+    }).to_parquet(path, index=False)
+    # Naive bounds are UTC; 16:00 UTC on Dec 31 is midnight in Singapore, so the first 16 rows match.
+    assert count_file_source_rows(_view(path), datetime(2023, 12, 31, 16), datetime(2024, 1, 1, 8)) == 16
+
+
+def test_scheduler_reports_rows_and_checkpoints(naive_parquet, tmp_path):
+    store = FakeStore([_view(naive_parquet)])
+    checkpoint = tmp_path / 'checkpoint.json'
+    scheduler = MaterializationScheduler(store, checkpoint_path=str(checkpoint), window=timedelta(days=1))
+    reports = scheduler.run(START, END)
+    assert [r['rows'] for r in reports] == [24, 24, 24, 24]
+    saved = json.loads(checkpoint.read_text())['completed']
+    assert sorted(r['rows'] for r in saved.values()) == [24, 24, 24, 24]
+
+
+def test_counting_failure_does_not_fail_the_view(naive_parquet, tmp_path):
+    def broken_counter(view, start, end):
+        raise TypeError("cannot compare tz-naive and tz-aware")
+
+    store = FakeStore([_view(naive_parquet)])
+    checkpoint = tmp_path / 'checkpoint.json'
+    scheduler = MaterializationScheduler(store, checkpoint_path=str(checkpoint), window=timedelta(days=2),
+                                         row_counter=broken_counter)
+    reports = scheduler.run(START, END)
+    assert [r['rows'] for r in reports] == [None, None]
+    assert len(json.loads(checkpoint.read_text())['completed']) == 2
+
+    rerun = MaterializationScheduler(store, checkpoint_path=str(checkpoint), window=timedelta(days=2))
+    assert rerun.run(START, END) == []
+    assert len(store.calls) == 2
@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from feature_store.feature_store import FeastFeatureStore
+from feature_store.online_cache import OnlineFeatureCache
+
+FEATURES = ['house_features:storey_mean']
+
+
+class FakeResponse:
+    def __init__(self, columns):
+        self.columns = columns
+
+    def to_dict(self):
+        return self.columns
+
+
+class FakeFeast:
+    """Stand-in for feast.FeatureStore.get_online_features returning house_id * 10 (+ version)."""
+    def __init__(self, before_return=None):
+        self.calls = []
+        self.version = 0
+        self.before_return = before_return
+
+    def get_online_features(self, entity_rows, features):
+        self.calls.append([row['house_id'] for row in entity_rows])
+        values = [row['house_id'] * 10 + self.version for row in entity_rows]
+        if self.before_return:
+            self.before_return()
+        return FakeResponse({'house_id': [row['house_id'] for row in entity_rows], 'storey_mean': values})
+
+
+def _store(fake, size=100):
+    store = FeastFeatureStore.__new__(FeastFeatureStore)
+    store.store = fake
+    store.online_cache = OnlineFeatureCache(max_entries=size)
+    store.batcher = None
+    return store
+
+
+def test_invalidation_during_fetch_does_not_write_stale_values_back():
+    fake = FakeFeast()
+    store = _store(fake)
+
+    def materialize_meanwhile():
+        fake.before_return = None
+        fake.version = 1
+        store.online_cache.invalidate()
+
+    fake.before_return = materialize_meanwhile
+    first = store._get_cached_online_features([{'house_id': 1}], FEATURES)
+    assert first['storey_mean'] == [10]
+    assert store.cache_stats()['stale_fills'] == 1
+    assert store.cache_stats()['size'] == 0
+
+    second = store._get_cached_online_features([{'house_id': 1}], FEATURES)
+    assert second['storey_mean'] == [11]
+    assert fake.calls == [[1], [1]]
+
+
+def test_concurrent_misses_share_one_fetch_and_are_counted_as_coalesced():
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    fake = FakeFeast(before_return=block)
+    store = _store(fake)
+    results = {}
+    first = threading.Thread(target=lambda: results.setdefault(
+        'first', store._get_cached_online_features([{'house_id': 7}], FEATURES)))
+    first.start()
+    assert started.wait(5)
+    fake.before_return = None
+    second = threading.Thread(target=lambda: results.setdefault(
+        'second', store._get_cached_online_features([{'house_id': 7}], FEATURES)))
+    second.start()
+    for _ in range(500):
+        if store.cache_stats()['coalesced']:
+            break
+        second.join(0.01)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert results['first']['storey_mean'] == results['second']['storey_mean'] == [70]
+    assert fake.calls == [[7]]
+    stats = store.cache_stats()
+    assert (stats['misses'], stats['coalesced'], stats['hits']) == (1, 1, 0)
+
+
+def test_duplicate_rows_in_one_request_are_fetched_once():
+    fake = FakeFeast()
+    store = _store(fake)
+    result = store._get_cached_online_features([{'house_id': 2}, {'house_id': 3}, {'house_id': 2}], FEATURES)
+    assert result['storey_mean'] == [20, 30, 20]
+    assert fake.calls == [[2, 3]]
+
+
+def test_failed_fetch_releases_the_claim():
+    cache = OnlineFeatureCache()
+    key = cache.entity_key({'house_id': 1})
+    state, _ = cache.claim(key, FEATURES)
+    assert state == 'fetch'
+    cache.release(key, FEATURES)
+    state, generation = cache.claim(key, FEATURES)
+    assert state == 'fetch'
+    cache.fill(key, FEATURES, [1.5], generation)
+    assert cache.claim(key, FEATURES) == ('hit', [1.5])
+
+
+def test_same_feature_name_from_two_views_is_rejected():
+    store = _store(FakeFeast())
+    with pytest.raises(ValueError, match='storey_mean'):
+        store._get_cached_online_features([{'house_id': 1}], FEATURES + ['house_features_sql:storey_mean'])
@@ -0,0 +1,115 @@
+import csv
+import io
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('psycopg')
+pytest.importorskip('psycopg_pool')
+
+from feature_store.pg_writer import COPY_NULL, PostgresBulkWriter  # noqa: E402
+
+
+class FakeCopy:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, payload):
+        self.cursor.copied.append(payload)
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+        self.copied = log['copied']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query):
+        self.log['sql'].append(query.as_string())
+
+    def copy(self, query):
+        self.log['sql'].append(query.as_string())
+        return FakeCopy(self)
+
+
+class FakeConnection:
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, query):
+        self.log['sql'].append(query.as_string())
+
+    def cursor(self):
+        return FakeCursor(self.log)
+
+
+class FakePool:
+    def __init__(self):
+        self.log = {'sql': [], 'copied': []}
+
+    @contextmanager
+    def connection(self):
+        yield FakeConnection(self.log)
+
+
+def _read_copy_csv(payload: bytes) -> list:
+    """Parse a COPY payload the way PostgreSQL does with FORMAT csv, NULL COPY_NULL."""
+    rows = []
+    for line in payload.decode('utf-8').splitlines():
+        fields = next(csv.reader(io.StringIO(line)))
+        quoted = next(csv.reader(io.StringIO(line), quoting=csv.QUOTE_NONE))
+        rows.append([None if raw == COPY_NULL else value for value, raw in zip(fields, quoted)])
+    return rows
+
+
+def test_copy_keeps_empty_strings_and_nulls_apart():
+    pool = FakePool()
+    df = pd.DataFrame({'house_id': [1, 2, 3], 'town': ['BEDOK', '', None], 'price': [1.5, np.nan, 3.0]})
+    report = PostgresBulkWriter(pool=pool).write(df, 'house_features', mode='append')
+
+    assert report['rows'] == 3
+    copy_sql = [q for q in pool.log['sql'] if q.startswith('COPY')]
+    assert len(copy_sql) == 1
+    # Without a live connection psycopg renders the marker as an escape string (E'\\N').
+    assert copy_sql[0].startswith('COPY "house_features" ("house_id", "town", "price") FROM STDIN '
+                                  'WITH (FORMAT csv, NULL ')
+    assert _read_copy_csv(pool.log['copied'][0]) == [['1', 'BEDOK', '1.5'], ['2', '', None], ['3', None, '3.0']]
+
+
+def test_upsert_merges_through_staging_table_in_chunks():
+    pool = FakePool()
+    df = pd.DataFrame({'house_id': [1, 2, 3], 'price': [1.0, 2.0, 3.0]})
+    PostgresBulkWriter(pool=pool).write(df, 'house_features', mode='upsert', chunksize=2)
+
+    statements = pool.log['sql']
+    assert statements[0] == 'CREATE TABLE IF NOT EXISTS "house_features" ("house_id" BIGINT, "price" DOUBLE PRECISION)'
+    assert statements[1] == ('CREATE UNIQUE INDEX IF NOT EXISTS "house_features_house_id_key" '
+                             'ON "house_features" ("house_id")')
+    inserts = [q for q in statements if q.startswith('INSERT')]
+    assert len(inserts) == 2 and len(pool.log['copied']) == 2
+    assert inserts[0] == (
+        'INSERT INTO "house_features" ("house_id", "price") '
+        'SELECT DISTINCT ON ("house_id") "house_id", "price" FROM "_staging_house_features" '
+        'ORDER BY "house_id", ctid DESC '
+        'ON CONFLICT ("house_id") DO UPDATE SET "price" = EXCLUDED."price"')
+    assert [q for q in statements if q.startswith('COPY')][0].startswith('COPY "_staging_house_features"')
+
+
+def test_upsert_with_only_the_key_column_does_nothing_on_conflict():
+    pool = FakePool()
+    PostgresBulkWriter(pool=pool).write(pd.DataFrame({'house_id': [1, 2]}), 'houses', mode='upsert')
+    insert = next(q for q in pool.log['sql'] if q.startswith('INSERT'))
+    assert insert.endswith('ON CONFLICT ("house_id") DO NOTHING')
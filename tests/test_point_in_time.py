@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from feature_store.point_in_time import PointInTimeJoiner, write_partitioned_features  # noqa: E402
+
+FEATURES = ['house_features:storey_mean', 'house_features:town_freq']
+
+
+@pytest.fixture
+def joiner(tmp_path):
+    features = pd.DataFrame({
+        'house_id': [1, 1, 2],
+        'event_timestamp': pd.to_datetime(['2024-01-10', '2024-02-10', '2024-01-20'], utc=True),
+        'storey_mean': [2.0, 5.0, 8.0],
+        'town_freq': [0.1, 0.2, 0.3],
+    })
+    write_partitioned_features(features, str(tmp_path / 'features'))
+    return PointInTimeJoiner(str(tmp_path / 'features'))
+
+
+def test_join_takes_latest_feature_row_at_or_before_entity_time(joiner):
+    entity_df = pd.DataFrame({
+        'house_id': [1, 2, 1],
+        'event_timestamp': pd.to_datetime(['2024-02-15', '2024-01-19', '2024-01-31'], utc=True),
+    })
+    joined = joiner.join(entity_df, FEATURES, ttl=timedelta(days=30))
+    assert joined['storey_mean'].tolist()[0] == 5.0
+    assert pd.isna(joined['storey_mean'].tolist()[1])
+    assert joined['storey_mean'].tolist()[2] == 2.0
+
+
+def test_join_of_empty_entity_frame_returns_empty_result(joiner):
+    entity_df = pd.DataFrame({'house_id': pd.Series(dtype='int64'),
+                              'event_timestamp': pd.Series(dtype='datetime64[ns, UTC]')})
+    joined = joiner.join(entity_df, FEATURES, ttl=timedelta(days=30))
+    assert joined.empty
+    assert list(joined.columns) == ['house_id', 'event_timestamp', 'storey_mean', 'town_freq']
+    assert joined['storey_mean'].dtype == 'float64'
+    assert list(joiner.iter_batches(entity_df, FEATURES)) == []
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+matplotlib = pytest.importorskip('matplotlib')
+
+from eda.report_renderer import render_all  # noqa: E402
+
+
+@pytest.fixture
+def notebook_backend():
+    """Pretend a non-Agg (e.g. notebook) backend is active, and restore the original."""
+    original = matplotlib.get_backend()
+    matplotlib.use('svg')
+    yield 'svg'
+    matplotlib.use(original)
+
+
+def test_in_process_rendering_leaves_the_matplotlib_backend_alone(tmp_path, notebook_backend):
+    tasks = [
+        ('hist', {'column': 'price', 'counts': np.array([1, 3, 2]), 'edges': np.array([0.0, 1.0, 2.0, 3.0]),
+                  'underflow': 1, 'overflow': 0, 'path': str(tmp_path / 'hist_price.png')}),
+        ('bar', {'column': 'town', 'labels': ['A', 'B'], 'counts': np.array([5, 2]),
+                 'path': str(tmp_path / 'bar_town.png')}),
+    ]
+    index = render_all(tasks, str(tmp_path), max_workers=1)
+    assert matplotlib.get_backend() == notebook_backend
+    assert (tmp_path / 'hist_price.png').stat().st_size > 0
+    assert (tmp_path / 'bar_town.png').stat().st_size > 0
+    assert 'hist_price.png' in open(index, encoding='utf-8').read()
@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda.sketches import AdaptiveHistogram, DataSketches, FixedHistogram
+
+
+def test_adaptive_histogram_widens_for_later_chunks_without_losing_counts():
+    hist = AdaptiveHistogram(bins=10)
+    hist.update([1.0, 2.0, 3.0])
+    hist.update([100.0, 250.0, -40.0, np.nan])
+    assert hist.total() == 6 and hist.nulls == 1
+    assert hist.underflow == 0 and hist.overflow == 0
+    expected, _ = np.histogram([1.0, 2.0, 3.0, 100.0, 250.0, -40.0], bins=hist.edges)
+    np.testing.assert_array_equal(hist.counts, expected)
+
+
+def test_independently_built_sketches_merge_to_the_single_pass_histogram():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.normal(50, 5, 1000), rng.normal(5000, 300, 1000)])
+    left = DataSketches(bins=20).update(pd.DataFrame({'price': values[:1000]}))
+    right = DataSketches(bins=20).update(pd.DataFrame({'price': values[1000:]}))
+    merged = left.merge(right).numeric['price']
+    whole = DataSketches(bins=20).update(pd.DataFrame({'price': values})).numeric['price']
+
+    assert merged.total() == whole.total() == 2000
+    np.testing.assert_array_equal(merged.edges, whole.edges)
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+
+
+def test_explicit_ranges_count_out_of_range_values_and_must_match_to_merge():
+    sketches = DataSketches(bins=4, ranges={'price': (0, 100)})
+    sketches.update(pd.DataFrame({'price': [-1.0, 10.0, 50.0, 150.0, 200.0]}))
+    hist = sketches.numeric['price']
+    assert isinstance(hist, FixedHistogram)
+    assert (hist.underflow, hist.overflow, int(hist.counts.sum())) == (1, 2, 2)
+
+    other = DataSketches(bins=4, ranges={'price': (0, 200)}).update(pd.DataFrame({'price': [1.0]}))
+    with pytest.raises(ValueError):
+        sketches.merge(other)
+
+
+def test_sketches_round_trip_through_json(tmp_path):
+    sketches = DataSketches(bins=8, ranges={'area': (0, 200)})
+    sketches.update(pd.DataFrame({'price': [1.5, 3.0, np.inf], 'area': [50.0, 300.0, 10.0],
+                                  'town': ['BEDOK', 'BEDOK', None]}))
+    path = tmp_path / 'sketches.json'
+    sketches.save(path)
+    restored = DataSketches.load(path)
+    assert json.loads(path.read_text())['numeric']['price']['kind'] == 'adaptive'
+    for col in ('price', 'area'):
+        assert type(restored.numeric[col]) is type(sketches.numeric[col])
+        np.testing.assert_array_equal(restored.numeric[col].edges, sketches.numeric[col].edges)
+        np.testing.assert_array_equal(restored.numeric[col].counts, sketches.numeric[col].counts)
+    assert restored.numeric['price'].overflow == 1
+    assert restored.ranges == {'area': (0.0, 200.0)}
@@ -0,0 +1,346 @@
+import cProfile
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import platform
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from utils.logger import setup_logger
+
+logger = setup_logger("E2EML", log_level=logging.INFO, console_level=logging.ERROR)
+
+
+def count_rows(obj):
+    """
+    Best-effort row count of a stage input or output: DataFrames, Series,
+    arrays and sparse matrices by shape, lists by length, column dicts by the
+    length of their first column. Returns None for anything else.
+    """
+    if obj is None:
+        return None
+    shape = getattr(obj, 'shape', None)
+    if shape:
+        return int(shape[0])
+    if isinstance(obj, (list, tuple)):
+        return len(obj)
+    if isinstance(obj, dict) and obj:
+        first = next(iter(obj.values()))
+        return len(first) if isinstance(first, (list, tuple)) or hasattr(first, 'shape') else None
+    return None
+
+
+def frame_bytes(obj, deep=False):
+    """Memory held by a DataFrame or Series (memory_usage), or None for other objects."""
+    memory_usage = getattr(obj, 'memory_usage', None)
+    if memory_usage is None:
+        return None
+    usage = memory_usage(index=True, deep=deep)
+    return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+
+
+class StageTracer:
+    """
+    Collect per-stage timings for one pipeline run.
+
+    Methods decorated with @instrument (or blocks wrapped in tracer.stage())
+    record wall and CPU time, rows in/out and DataFrame memory before and after
+    the call. While the tracer is disabled the decorator only checks one flag,
+    so it can stay on the hot path. One stage can additionally be captured with
+    cProfile or tracemalloc.
+    Open stages are tracked in a ContextVar, so threads and concurrently running
+    asyncio tasks each see their own parent stage.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.deep_memory = False
+        self.profile_stage = None
+        self.profile_mode = 'cprofile'
+        self.profile_dir = None
+        self._open = contextvars.ContextVar(f"e2eml_open_stages_{id(self)}", default=())
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self, profile_stage=None, profile_mode='cprofile', profile_dir=None, deep_memory=False):
+        """
+        Start recording stages.
+
+        Args:
+            profile_stage (str, optional): Stage name (e.g. 'DataPreprocessor.preprocess_all')
+                to capture with a profiler.
+            profile_mode (str): 'cprofile' (function timings, dumped as a .prof file
+                when profile_dir is set) or 'tracemalloc' (top allocating lines).
+            profile_dir (str, optional): Folder for .prof dumps.
+            deep_memory (bool): Measure object columns with memory_usage(deep=True).
+                Exact, but it scans every string, so it is off by default.
+        """
+        if profile_mode not in ('cprofile', 'tracemalloc'):
+            raise ValueError(f"Unknown profile_mode: {profile_mode}")
+        self.profile_stage = profile_stage
+        self.profile_mode = profile_mode
+        self.profile_dir = profile_dir
+        self.deep_memory = deep_memory
+        self.enabled = True
+        return self
+
+    def disable(self):
+        """Stop recording; collected records are kept until reset()."""
+        self.enabled = False
+        return self
+
+    def reset(self):
+        """Drop collected records and start a new run id."""
+        with self._lock:
+            self.records = []
+            self.run_id = uuid.uuid4().hex[:12]
+            self.started_at = datetime.now().isoformat(timespec='seconds')
+
+    def _begin(self, name, rows_in, frame_in):
+        stack = self._open.get()
+        record = {
+            'stage': name,
+            'parent': stack[-1]['stage'] if stack else None,
+            'thread': threading.current_thread().name,
+            'rows_in': rows_in,
+            'rows_out': None,
+            'bytes_before': frame_bytes(frame_in, self.deep_memory),
+            'bytes_after': None,
+            'error': None,
+        }
+        self._open.set(stack + (record,))
+        profiler = None
+        if name == self.profile_stage:
+            if self.profile_mode == 'cprofile':
+                profiler = cProfile.Profile()
+                profiler.enable()
+            elif tracemalloc.is_tracing():
+                # Someone else is tracing: diff against a snapshot and leave tracing running.
+                profiler = (False, tracemalloc.take_snapshot())
+            else:
+                tracemalloc.start()
+                profiler = (True, None)
+        record['_start'] = (time.perf_counter(), time.process_time(), profiler)
+        return record
+
+    def _end(self, record, result, frame_out):
+        wall_start, cpu_start, profiler = record.pop('_start')
+        record['wall_seconds'] = round(time.perf_counter() - wall_start, 6)
+        record['cpu_seconds'] = round(time.process_time() - cpu_start, 6)
+        if profiler is not None:
+            if isinstance(profiler, tuple):
+                record['profile'] = self._tracemalloc_summary(*profiler)
+            else:
+                profiler.disable()
+                record['profile'] = self._cprofile_summary(profiler, record['stage'])
+        if record['rows_out'] is None:
+            record['rows_out'] = count_rows(result)
+        record['bytes_after'] = frame_bytes(frame_out if frame_out is not None else result, self.deep_memory)
+        # Remove only this record: generators can finish out of order.
+        self._open.set(tuple(r for r in self._open.get() if r is not record))
+        with self._lock:
+            self.records.append(record)
+
+    def _cprofile_summary(self, profiler, name, top=15):
+        """Top functions by cumulative time; the full stats go to profile_dir if set."""
+        stats = pstats.Stats(profiler)
+        summary = {'mode': 'cprofile', 'top': []}
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir, f"{name}.{self.run_id}.prof")
+            stats.dump_stats(path)
+            summary['path'] = path
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        for (filename, line, func), (_, ncalls, tottime, cumtime, _) in rows:
+            summary['top'].append({
+                'function': f"{os.path.basename(filename)}:{line}({func})",
+                'calls': ncalls,
+                'tottime': round(tottime, 6),
+                'cumtime': round(cumtime, 6),
+            })
+        return summary
+
+    @staticmethod
+    def _tracemalloc_summary(started, baseline, top=15):
+        """
+        Peak traced memory and the top allocating lines.
+        Tracing is stopped only if the stage started it. When it was already
+        running, the top lines are the growth since the stage began and the
+        peak covers everything since tracing started ('peak_scope': 'tracing').
+        """
+        summary = {'mode': 'tracemalloc', 'peak_scope': 'stage' if started else 'tracing'}
+        if not tracemalloc.is_tracing():
+            summary['error'] = "tracemalloc was stopped before the stage ended"
+            return summary
+        summary['current_bytes'], summary['peak_bytes'] = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if started:
+            tracemalloc.stop()
+            summary['top'] = [{'line': str(stat.traceback), 'bytes': stat.size, 'blocks': stat.count}
+                              for stat in snapshot.statistics('lineno')[:top]]
+        else:
+            summary['top'] = [{'line': str(stat.traceback), 'bytes': stat.size_diff, 'blocks': stat.count_diff}
+                              for stat in snapshot.compare_to(baseline, 'lineno')[:top]]
+        return summary
+
+    @contextmanager
+    def stage(self, name, df=None, rows_in=None):
+        """
+        Record an arbitrary block as a stage.
+        The yielded dict can be updated with 'rows_out' (and other fields);
+        memory after is taken from the DataFrame passed as df.
+
+        Example:
+            with tracer.stage('train', df=X) as rec:
+                model.fit(X, y)
+                rec['rows_out'] = len(X)
+        """
+        if not self.enabled:
+            yield {}
+            return
+        record = self._begin(name, rows_in if rows_in is not None else count_rows(df), df)
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = repr(e)
+            raise
+        finally:
+            self._end(record, None, df)
+
+    def report(self) -> dict:
+        """
+        Structured report of this run: every stage call in completion order plus
+        per-stage totals (calls, wall/CPU seconds, rows in/out).
+        """
+        with self._lock:
+            records = list(self.records)
+        totals = {}
+        for rec in records:
+            total = totals.setdefault(rec['stage'], {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                     'rows_in': 0, 'rows_out': 0})
+            total['calls'] += 1
+            total['wall_seconds'] = round(total['wall_seconds'] + rec['wall_seconds'], 6)
+            total['cpu_seconds'] = round(total['cpu_seconds'] + rec['cpu_seconds'], 6)
+            total['rows_in'] += rec['rows_in'] or 0
+            total['rows_out'] += rec['rows_out'] or 0
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at,
+            'python': platform.python_version(),
+            'stages': records,
+            'totals': totals,
+        }
+
+    def save(self, path) -> dict:
+        """Write report() as JSON and return it."""
+        report = self.report()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+        logger.info(f"⏱️ Saved timing report for {len(report['stages'])} stage calls to {path}")
+        return report
+
+
+tracer = StageTracer()
+if os.environ.get("E2EML_TRACE") == "1":
+    tracer.enable(profile_stage=os.environ.get("E2EML_PROFILE_STAGE"),
+                  profile_mode=os.environ.get("E2EML_PROFILE_MODE", "cprofile"),
+                  profile_dir=os.environ.get("E2EML_PROFILE_DIR"))
+
+
+def _inputs(args, kwargs):
+    """The frame a stage method works on: self.df if present, else its first argument."""
+    owner = args[0] if args else None
+    frame = getattr(owner, 'df', None)
+    if frame is None:
+        rest = list(args[1:]) + list(kwargs.values())
+        frame = rest[0] if rest else None
+    return frame
+
+
+def instrument(func=None, *, name=None):
+    """
+    Decorator recording a stage call on the module-level tracer.
+    Works on plain methods, generator methods (timed until exhausted, rows
+    summed over the yielded chunks) and coroutines. The stage name defaults
+    to the qualified name, e.g. 'DataPreprocessor.preprocess_all'.
+    """
+    if func is None:
+        return functools.partial(instrument, name=name)
+    stage_name = name or func.__qualname__
+
+    def after_frame(args):
+        return getattr(args[0], 'df', None) if args else None
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                yield from func(*args, **kwargs)
+                return
+            frame = _inputs(args, kwargs)
+            record = tracer._begin(stage_name, count_rows(frame), frame)
+            rows = 0
+            try:
+                for item in func(*args, **kwargs):
+                    rows += count_rows(item) or 0
+                    yield item
+            except BaseException as e:
+                record['error'] = repr(e)
+                raise
+            finally:
+                record['rows_out'] = rows
+                tracer._end(record, None, None)
+        return wrapper
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return await func(*args, **kwargs)
+            frame = _inputs(args, kwargs)
+            record = tracer._begin(stage_name, count_rows(frame), frame)
+            result = None
+            try:
+                result = await func(*args, **kwargs)
+                return result
+            except BaseException as e:
+                record['error'] = repr(e)
+                raise
+            finally:
+                tracer._end(record, result, None)
+        return wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not tracer.enabled:
+            return func(*args, **kwargs)
+        frame = _inputs(args, kwargs)
+        record = tracer._begin(stage_name, count_rows(frame), frame)
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except BaseException as e:
+            record['error'] = repr(e)
+            raise
+        finally:
+            tracer._end(record, result, after_frame(args))
+    return wrapper
+
+# Example usage:
+# from utils.instrumentation import tracer
+# tracer.enable(profile_stage='DataPreprocessor.preprocess_all', profile_dir='logs/profiles')
+# df = DataIngestor('data').load_data_file()
+# df = DataPreprocessor(df).preprocess_all()
+# tracer.save('logs/timing_report.json')
+# Or set E2EML_TRACE=1 (and optionally E2EML_PROFILE_STAGE / E2EML_PROFILE_MODE /
+# E2EML_PROFILE_DIR) to enable tracing for a whole run.
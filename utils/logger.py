@@ -1,9 +1,77 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from datetime import datetime
 
-def setup_logger(logger_name, log_level=logging.INFO, console_level=logging.ERROR):
+_log_file = None
+_listeners = []
+
+
+class LazyMessage:
+    """
+    Defer building an expensive log payload until the record is formatted.
+    Pass it as a %-style argument, e.g.
+        logger.info("Null percentages:\\n%s", LazyMessage(lambda: df.isnull().mean() * 100))
+    If the record is filtered out by level, the callable is never run. Records
+    that pass are formatted on the calling thread, in queue mode too (see
+    setup_logger), so the payload reflects the data at the time of the call.
+    """
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+
+def lazy(func, *args, **kwargs) -> LazyMessage:
+    """Shorthand for LazyMessage(func, *args, **kwargs)."""
+    return LazyMessage(func, *args, **kwargs)
+
+
+class _DelayedDirMixin:
+    """Create the log folder when the file is first written, not at import."""
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class _FileHandler(_DelayedDirMixin, logging.FileHandler):
+    pass
+
+
+class _RotatingFileHandler(_DelayedDirMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+
+def get_log_file() -> str:
+    """
+    Return this process's log file path. The timestamped name is computed once,
+    so every module that sets up a logger writes to the same file. Neither the
+    folder nor the file is created until the first record is written.
+    """
+    global _log_file
+    if _log_file is None:
+        logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        _log_file = os.path.join(logs_dir, f"E2EML_{timestamp}.log")
+    return _log_file
+
+
+def stop_queue_listeners():
+    """Flush and stop the background logging threads (registered with atexit)."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def setup_logger(logger_name, log_level=logging.INFO, console_level=logging.ERROR,
+                 use_queue=None, max_bytes=None, backup_count=5):
     """
     Set up and return a logger with both file and console handlers.
     All logs go to a single file.
@@ -12,24 +80,34 @@ def setup_logger(logger_name, log_level=logging.INFO, console_level=logging.ERRO
         logger_name (str): Name of the logger (used for log file naming).
         log_level (int): Logging level for the file handler (default: logging.INFO).
         console_level (int): Logging level for the console handler (default: logging.ERROR).
+        use_queue (bool, optional): Write through a QueueHandler so file and console
+            I/O happen on a background QueueListener thread. The message itself is
+            still formatted on the calling thread (QueueHandler.prepare), so only
+            the writes leave the hot path. Defaults to the E2EML_LOG_QUEUE
+            environment variable ("1" enables it).
+        max_bytes (int, optional): Rotate the log file at this size. Defaults to the
+            E2EML_LOG_MAX_BYTES environment variable; unset means no rotation.
+        backup_count (int): Rotated files to keep (default: 5).
 
     Returns:
         logging.Logger: Configured logger instance.
 
     Notes:
-        - Log files are saved in the 'logs' folder at the project root.
+        - Log files are saved in the 'logs' folder at the project root, opened on the first record.
         - If a logger with the same name already exists, it will be reused.
         - Formatter includes stage name, timestamp, log level, logger name, function name, and message.
+        - Use %-style arguments (optionally wrapped in LazyMessage) for expensive payloads
+          so they are skipped entirely when the record is below the logger's level.
     """
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-    os.makedirs(logs_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = os.path.join(logs_dir, f"E2EML_{timestamp}.log")
-
     logger = logging.getLogger(logger_name)
 
     # Avoid adding handlers multiple times if logger already exists
     if not logger.hasHandlers():
+        if use_queue is None:
+            use_queue = os.environ.get("E2EML_LOG_QUEUE") == "1"
+        if max_bytes is None and os.environ.get("E2EML_LOG_MAX_BYTES"):
+            max_bytes = int(os.environ["E2EML_LOG_MAX_BYTES"])
+        log_file = get_log_file()
         logger.setLevel(log_level)
 
         formatter = logging.Formatter(
@@ -38,15 +116,30 @@ def setup_logger(logger_name, log_level=logging.INFO, console_level=logging.ERRO
         )
 
         # File handler
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        if max_bytes:
+            file_handler = _RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        else:
+            file_handler = _FileHandler(log_file, encoding='utf-8', delay=True)
         file_handler.setLevel(log_level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
 
         # Console handler (no emoji, no stream reassignment)
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(console_level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
 
-    return logger
\ No newline at end of file
+        if use_queue:
+            log_queue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(
+                log_queue, file_handler, console_handler, respect_handler_level=True)
+            listener.start()
+            if not _listeners:
+                atexit.register(stop_queue_listeners)
+            _listeners.append(listener)
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        else:
+            logger.addHandler(file_handler)
+            logger.addHandler(console_handler)
+
+    return logger